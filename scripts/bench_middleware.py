@@ -0,0 +1,115 @@
+"""Benchmark /welcome throughput with the legacy and the pure ASGI middleware stacks.
+
+Requests are driven straight through the ASGI callable (no sockets, no HTTP
+parser), so the numbers isolate application plus middleware overhead:
+
+    python scripts/bench_middleware.py --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from src.api.deps.security import _IPRateLimiter  # noqa: E402
+from src.api.metrics import REQUEST_COUNTER, REQUEST_LATENCY  # noqa: E402
+from src.api.middleware import install_middleware  # noqa: E402
+from src.api.routers import welcome  # noqa: E402
+
+IP_LIMIT = 10**9  # exercise the limiter without ever rejecting
+
+
+def legacy_app() -> FastAPI:
+    """The previous two ``@app.middleware("http")`` layers."""
+
+    app = FastAPI()
+    app.include_router(welcome.router)
+
+    @app.middleware("http")
+    async def prometheus_middleware(request: Request, call_next: Callable):  # type: ignore
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration = time.perf_counter() - start
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        REQUEST_COUNTER.labels(path=path, method=request.method, status=response.status_code).inc()
+        REQUEST_LATENCY.labels(path=path, method=request.method).observe(duration)
+        return response
+
+    limiter = _IPRateLimiter(IP_LIMIT)
+
+    @app.middleware("http")
+    async def ip_guard(request: Request, call_next: Callable):  # type: ignore
+        client_ip = request.client.host if request.client else "anonymous"
+        if not await limiter.allow(client_ip):
+            return JSONResponse(status_code=429, content={"detail": "Too many requests"})
+        return await call_next(request)
+
+    return app
+
+
+def asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(welcome.router)
+    install_middleware(app, IP_LIMIT)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/welcome",
+        "raw_path": b"/welcome",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"/welcome returned {message['status']}")
+
+    for _ in range(200):  # warm up route and metric label caches
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3, help="Best of N rounds per stack")
+    args = parser.parse_args()
+
+    results = {}
+    for name, factory in (("legacy @app.middleware", legacy_app), ("pure ASGI", asgi_app)):
+        app = factory()
+        results[name] = max([await run(app, args.requests) for _ in range(args.rounds)])
+        print(f"{name:>24}: {results[name]:10.0f} req/s")
+    before, after = results.values()
+    print(f"{'speedup':>24}: {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,20 +2,42 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
-from .deps.security import install_security_middleware
-from .metrics import instrument_app, router as metrics_router
+from .deps.auth import close_auth_services
+from .metrics import router as metrics_router
+from .middleware import install_middleware
 from .routers import finance, health, ingest, ledger, summary, transcribe, usage, welcome
+from .services.registry import ServiceRegistry
 from .settings import get_settings
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    if settings.whisper_preload and not settings.whisper_use_openai:
+        app.state.services.start_warmup(settings)
+    try:
+        yield
+    finally:
+        await close_auth_services()
+        await app.state.services.aclose()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Symbioza DayMind API", version="1.0.0")
-    instrument_app(app)
+    app = FastAPI(title="Symbioza DayMind API", version="1.0.0", lifespan=_lifespan)
+    app.state.services = ServiceRegistry()
 
     settings = get_settings()
-    install_security_middleware(app, settings.ip_rate_limit_per_minute)
+    install_middleware(
+        app,
+        settings.ip_rate_limit_per_minute,
+        ip_max_entries=settings.ip_rate_limit_max_entries,
+        redis=app.state.services.redis_client(settings) if settings.ip_rate_limit_shared else None,
+    )
 
     app.include_router(health.router)
     app.include_router(metrics_router)
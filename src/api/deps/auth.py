@@ -2,31 +2,83 @@
 
 from __future__ import annotations
 
+import math
 from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List
 
-from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi import Depends, Header, HTTPException, Request, Response, status
 
-from ..services.auth_service import APIKeyRecord, AuthService, RateLimitError, build_auth_service
+from ..services.auth_service import (
+    APIKeyRecord,
+    AuthService,
+    RateLimitDecision,
+    RateLimitError,
+    build_auth_service,
+)
 from ..settings import APISettings, get_settings
 
 
+_SERVICES: List[AuthService] = []
+
+
 @lru_cache()
 def _get_service(
     store_path: str,
     redis_url: str | None,
     api_keys: tuple[str, ...],
     rate_limit: int,
+    usage_flush_sec: float = 5.0,
+    reload_interval: float = 2.0,
+    negative_ttl_sec: float = 30.0,
+    rate_limit_burst: int = 0,
 ) -> AuthService:
-    return build_auth_service(Path(store_path), api_keys, redis_url, rate_limit)
+    service = build_auth_service(
+        Path(store_path),
+        api_keys,
+        redis_url,
+        rate_limit,
+        usage_flush_sec,
+        reload_interval=reload_interval,
+        negative_ttl_sec=negative_ttl_sec,
+        rate_limit_burst=rate_limit_burst,
+    )
+    _SERVICES.append(service)
+    return service
 
 
 def reset_auth_service_cache() -> None:
+    for service in _SERVICES:
+        service.store.flush()
+    _SERVICES.clear()
     _get_service.cache_clear()
 
 
+async def close_auth_services() -> None:
+    """Flush write-behind usage counters; called on application shutdown."""
+
+    for service in list(_SERVICES):
+        await service.aclose()
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> Dict[str, str]:
+    """``X-RateLimit-*`` headers describing ``decision`` (empty when unlimited)."""
+
+    if decision.unlimited:
+        return {}
+    headers = {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining),
+        "X-RateLimit-Reset": str(math.ceil(decision.reset_after)),
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return headers
+
+
 async def get_api_key(
     request: Request,
+    response: Response,
     x_api_key: str | None = Header(default=None, alias="X-API-Key"),
     settings: APISettings = Depends(get_settings),
 ) -> str:
@@ -45,15 +97,25 @@ async def get_api_key(
         settings.redis_url,
         tuple(settings.api_keys),
         settings.api_rate_limit_per_minute,
+        settings.api_usage_flush_sec,
+        settings.api_key_reload_sec,
+        settings.api_key_negative_ttl_sec,
+        settings.api_rate_limit_burst,
     )
     try:
-        record = await service.validate_and_track(x_api_key)
-    except RateLimitError:
-        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Rate limit exceeded") from None
+        record, decision = await service.authenticate(x_api_key)
+    except RateLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=rate_limit_headers(exc.decision) if exc.decision else None,
+        ) from None
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key") from None
 
     request.state.api_key_metadata = record
+    request.state.rate_limit = decision
+    response.headers.update(rate_limit_headers(decision))
     return x_api_key
 
 
@@ -1,45 +1,87 @@
-"""Security helpers: middleware for IP throttling and log anonymization."""
+"""Security helpers: per-IP throttling and log anonymization."""
 
 from __future__ import annotations
 
+import logging
 import re
 import time
-from threading import Lock
-from typing import Callable
+from collections import OrderedDict
+from typing import Optional
 
-from fastapi import Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..metrics import IP_LIMITER_BLOCKED, IP_LIMITER_EVICTIONS, IP_LIMITER_TRACKED
+
+LOGGER = logging.getLogger("daymind.security")
+
+# Count a hit in the current one-minute window and set its expiry in one round-trip.
+_WINDOW_HIT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
 
 
 class _IPRateLimiter:
-    def __init__(self, limit_per_minute: int):
+    """Fixed one-minute window per client IP with bounded memory.
+
+    Windows live in an LRU of at most ``max_entries`` IPs; the least recently
+    seen IP is evicted first, so a flood of distinct addresses cannot grow
+    the table. The table is only touched from the event loop between awaits,
+    which makes a lock unnecessary. With ``redis`` the counts are shared
+    across workers; IPs already over the limit in the current window are
+    rejected locally without a round-trip, and Redis errors fall back to the
+    local count.
+    """
+
+    def __init__(
+        self,
+        limit_per_minute: int,
+        max_entries: int = 100_000,
+        redis: Optional[Redis] = None,
+        key_prefix: str = "daymind:iplimit:",
+    ):
         self.limit = max(0, limit_per_minute)
-        self._hits: dict[str, tuple[int, int]] = {}
-        self._lock = Lock()
+        self.max_entries = max(1, max_entries)
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self._hits: "OrderedDict[str, tuple[int, int]]" = OrderedDict()
+        self._script = redis.register_script(_WINDOW_HIT) if redis is not None else None
 
-    def allow(self, ip: str) -> bool:
+    async def allow(self, ip: str) -> bool:
         if self.limit == 0:
             return True
         bucket = int(time.time() // 60)
-        with self._lock:
-            previous_bucket, count = self._hits.get(ip, (bucket, 0))
-            if previous_bucket != bucket:
-                previous_bucket, count = bucket, 0
+        previous_bucket, count = self._hits.get(ip, (bucket, 0))
+        if previous_bucket != bucket:
+            count = 0
+        if self._script is not None and count <= self.limit:
+            try:
+                count = int(await self._script(keys=[f"{self.key_prefix}{ip}:{bucket}"], args=[61_000]))
+            except RedisError as exc:
+                LOGGER.warning("Shared IP rate limit unavailable, using local counts: %s", exc)
+                count += 1
+        else:
             count += 1
-            self._hits[ip] = (previous_bucket, count)
-            return count <= self.limit
-
-
-def install_security_middleware(app, limit_per_minute: int) -> None:
-    limiter = _IPRateLimiter(limit_per_minute)
+        self._remember(ip, bucket, count)
+        if count > self.limit:
+            IP_LIMITER_BLOCKED.inc()
+            return False
+        return True
 
-    @app.middleware("http")
-    async def _ip_guard(request: Request, call_next: Callable):  # type: ignore
-        client_ip = request.client.host if request.client else "anonymous"
-        if not limiter.allow(client_ip):
-            from fastapi.responses import JSONResponse
+    def _remember(self, ip: str, bucket: int, count: int) -> None:
+        self._hits[ip] = (bucket, count)
+        self._hits.move_to_end(ip)
+        while len(self._hits) > self.max_entries:
+            self._hits.popitem(last=False)
+            IP_LIMITER_EVICTIONS.inc()
+        IP_LIMITER_TRACKED.set(len(self._hits))
 
-            return JSONResponse(status_code=429, content={"detail": "Too many requests"})
-        return await call_next(request)
+    def __len__(self) -> int:
+        return len(self._hits)
 
 
 MASK_PATTERN = re.compile(r"([\d]{4})([\d]{2,})")
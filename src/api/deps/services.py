@@ -0,0 +1,40 @@
+"""Dependencies resolving app-scoped shared services."""
+
+from __future__ import annotations
+
+from fastapi import Depends, Request
+
+from ..services.finance import FinanceLedgerCache
+from ..services.registry import ServiceRegistry
+from ..services.summary_jobs import SummaryJobs
+from ..services.transcript_service import TranscriptService
+from ..settings import APISettings, get_settings
+
+
+def get_registry(request: Request) -> ServiceRegistry:
+    registry = getattr(request.app.state, "services", None)
+    if registry is None:
+        registry = ServiceRegistry()
+        request.app.state.services = registry
+    return registry
+
+
+def get_transcript_service(
+    registry: ServiceRegistry = Depends(get_registry),
+    settings: APISettings = Depends(get_settings),
+) -> TranscriptService:
+    return registry.transcript_service(settings)
+
+
+def get_summary_jobs(
+    registry: ServiceRegistry = Depends(get_registry),
+    settings: APISettings = Depends(get_settings),
+) -> SummaryJobs:
+    return registry.summary_jobs(settings)
+
+
+def get_finance_ledger(
+    registry: ServiceRegistry = Depends(get_registry),
+    settings: APISettings = Depends(get_settings),
+) -> FinanceLedgerCache:
+    return registry.finance_ledger(settings)
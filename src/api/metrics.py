@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-import time
-from typing import Callable
-
 from fastapi import APIRouter, Depends, Response
 from prometheus_client import (
     Counter,
+    Gauge,
     Histogram,
     Summary,
     CONTENT_TYPE_LATEST,
@@ -37,20 +35,6 @@ async def metrics_endpoint(_: str = Depends(get_api_key)) -> Response:
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
 
-def instrument_app(app):
-    @app.middleware("http")
-    async def prometheus_middleware(request, call_next: Callable):  # type: ignore
-        start = time.perf_counter()
-        response = await call_next(request)
-        duration = time.perf_counter() - start
-        route = request.scope.get("route")
-        path = getattr(route, "path", request.url.path)
-        method = request.method
-        REQUEST_COUNTER.labels(path=path, method=method, status=response.status_code).inc()
-        REQUEST_LATENCY.labels(path=path, method=method).observe(duration)
-        return response
-
-    return app
 ARCHIVE_SYNC_COUNTER = Counter(
     "transcribe_archive_uploads_total",
     "Count of /v1/transcribe/batch uploads",
@@ -59,5 +43,50 @@ ARCHIVE_SYNC_COUNTER = Counter(
 
 ARCHIVE_SYNC_DURATION = Summary(
     "transcribe_archive_processing_seconds",
-    "Time spent splitting/transcribing an archive",
+    "Time spent splitting/transcribing an archive, per stage",
+    labelnames=("stage",),
+)
+
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "inference_queue_depth",
+    "Inference jobs admitted but waiting for a worker",
+    labelnames=("executor",),
+)
+
+INFERENCE_IN_FLIGHT = Gauge(
+    "inference_in_flight",
+    "Inference jobs currently running on a worker",
+    labelnames=("executor",),
+)
+
+INFERENCE_REJECTED = Counter(
+    "inference_rejected_total",
+    "Inference jobs rejected because the admission queue was full",
+    labelnames=("executor",),
+)
+
+TRANSCRIPTION_CACHE_HITS = Counter(
+    "transcription_cache_hits_total",
+    "Transcriptions served from the audio-hash cache",
+    labelnames=("layer",),
+)
+
+TRANSCRIPTION_CACHE_MISSES = Counter(
+    "transcription_cache_misses_total",
+    "Transcriptions that had to run the model",
+)
+
+IP_LIMITER_BLOCKED = Counter(
+    "ip_rate_limit_blocked_total",
+    "Requests rejected by the per-IP rate limiter",
+)
+
+IP_LIMITER_EVICTIONS = Counter(
+    "ip_rate_limit_evictions_total",
+    "Client IPs evicted from the per-IP rate limiter table",
+)
+
+IP_LIMITER_TRACKED = Gauge(
+    "ip_rate_limit_tracked_ips",
+    "Client IPs currently tracked by the per-IP rate limiter",
 )
@@ -0,0 +1,87 @@
+"""Pure ASGI middleware for IP throttling and request metrics."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .deps.security import _IPRateLimiter
+from .metrics import REQUEST_COUNTER, REQUEST_LATENCY
+
+UNMATCHED_PATH = "unmatched"
+
+
+class APIMiddleware:
+    """Throttle by client IP, then time and count the request by route template.
+
+    Runs as a plain ASGI wrapper rather than ``@app.middleware("http")``:
+    the response is passed through ``send`` untouched (streaming bodies and
+    large uploads are not buffered or re-wrapped) and no extra task is
+    spawned per request. Requests rejected by the IP guard are not counted
+    in the request metrics; ``ip_rate_limit_blocked_total`` covers them.
+
+    Paths are labelled by route template (``/v1/ledger``, not the raw URL)
+    so label cardinality stays bounded; requests matching no route are
+    labelled ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: _IPRateLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+        self._counters: Dict[Tuple[str, str, int], Any] = {}
+        self._histograms: Dict[Tuple[str, str], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        if not await self.limiter.allow(client[0] if client else "anonymous"):
+            response = JSONResponse(status_code=429, content={"detail": "Too many requests"})
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router records the matched route in the shared scope.
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_PATH)
+            self._observe(path, scope["method"], status_code, time.perf_counter() - start)
+
+    def _observe(self, path: str, method: str, status_code: int, duration: float) -> None:
+        # Cache labelled children; ``labels()`` takes a lock and builds a tuple per call.
+        counter = self._counters.get((path, method, status_code))
+        if counter is None:
+            counter = REQUEST_COUNTER.labels(path=path, method=method, status=status_code)
+            self._counters[(path, method, status_code)] = counter
+        histogram = self._histograms.get((path, method))
+        if histogram is None:
+            histogram = REQUEST_LATENCY.labels(path=path, method=method)
+            self._histograms[(path, method)] = histogram
+        counter.inc()
+        histogram.observe(duration)
+
+
+def install_middleware(
+    app,
+    ip_limit_per_minute: int,
+    ip_max_entries: int = 100_000,
+    redis=None,
+) -> None:
+    """Register :class:`APIMiddleware` on ``app``."""
+
+    limiter = _IPRateLimiter(ip_limit_per_minute, max_entries=ip_max_entries, redis=redis)
+    app.add_middleware(APIMiddleware, limiter=limiter)
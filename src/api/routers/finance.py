@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
 
 from ..deps.auth import get_api_key
 from ..schemas import FinanceSummaryItem, FinanceSummaryResponse
-from ..services.finance import summarize_ledger
+from ..deps.services import get_finance_ledger
+from ..services.finance import FinanceLedgerCache
 from ..settings import APISettings, get_settings
 
 api_router = APIRouter(prefix="/v1", tags=["finance"])
@@ -21,10 +20,10 @@ async def get_finance_summary(
     date: str | None = None,
     _: str = Depends(get_api_key),
     settings: APISettings = Depends(get_settings),
+    ledger: FinanceLedgerCache = Depends(get_finance_ledger),
 ):
-    ledger_path = Path(settings.finance_ledger_path)
     try:
-        rows = summarize_ledger(ledger_path, date=date)
+        rows = await ledger.summaries(date)
     except FileNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Finance ledger not ready") from None
 
@@ -11,7 +11,9 @@ from openai import AsyncOpenAI
 from redis.asyncio import from_url
 
 from ..deps.auth import get_api_key
+from ..deps.services import get_registry
 from ..schemas import HealthResponse
+from ..services.registry import ServiceRegistry
 from ..settings import APISettings, get_settings
 
 router = APIRouter(tags=["health"])
@@ -21,18 +23,21 @@ router = APIRouter(tags=["health"])
 async def healthz(
     _: str = Depends(get_api_key),
     settings: APISettings = Depends(get_settings),
+    registry: ServiceRegistry = Depends(get_registry),
 ) -> HealthResponse:
     disk_state = _check_disk(Path(settings.data_dir))
     redis_state = await _check_redis(settings.redis_url)
     openai_state = await _check_openai(settings.openai_api_key, settings.openai_health_model)
     tls_state = _check_tls(settings)
-    ok = _all_green(disk_state, redis_state, openai_state, tls_state)
+    whisper_state = _check_whisper(settings, registry)
+    ok = _all_green(disk_state, redis_state, openai_state, tls_state) and whisper_state in {"ok", "skip"}
     return HealthResponse(
         ok=ok,
         redis=redis_state,
         disk=disk_state,
         openai=openai_state,
         tls=tls_state,
+        whisper=whisper_state,
         timestamp=datetime.now(timezone.utc),
     )
 
@@ -72,6 +77,12 @@ def _check_disk(path: Path) -> str:
         return "error"
 
 
+def _check_whisper(settings: APISettings, registry: ServiceRegistry) -> str:
+    if settings.whisper_use_openai:
+        return "skip"
+    return registry.whisper_engine(settings).status
+
+
 def _check_tls(settings: APISettings) -> str:
     if not settings.tls_required:
         return "skip"
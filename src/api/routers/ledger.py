@@ -2,70 +2,139 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
 import json
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from ..deps.auth import get_api_key
 from ..schemas import LedgerEntry, LedgerResponse
 from ..settings import APISettings, get_settings
+from src.gpt_postproc.ledger_store import LedgerStore
+from src.stt_core.day_index import iter_ranges
 
 router = APIRouter(prefix="/v1", tags=["ledger"])
 
+# (cursor source tag, file, byte ranges holding the day's records)
+LedgerSource = Tuple[str, Path, List[Tuple[int, int]]]
+
 
 @router.get("/ledger", response_model=LedgerResponse)
 async def get_ledger(
     date: str,
     limit: int = Query(default=100, le=1000),
     offset: int = 0,
+    cursor: Optional[str] = None,
     _: str = Depends(get_api_key),
     settings: APISettings = Depends(get_settings),
 ):
-    entries = _load_entries(date, settings)
-    if entries is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No data for date")
+    """Return one page of the day's ledger.
 
-    sliced = entries[offset : offset + limit]
-    return LedgerResponse(date=date, count=len(entries), entries=[LedgerEntry(**e) for e in sliced])
+    With ``cursor`` (from a previous ``next_cursor``) the page starts right
+    after the last returned entry without re-reading earlier ones, and
+    ``count`` is the page size. Without it, ``offset`` skips entries and
+    ``count`` is the day's total, as before.
+    """
 
+    source = _open_source(date, settings)
+    if source is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No data for date")
+    tag, path, ranges = source
+    start = _decode_cursor(cursor, tag) if cursor else 0
 
-def _load_entries(date: str, settings: APISettings):
-    candidates = [
-        Path(settings.summary_dir) / f"ledger_{date}.jsonl",
-        Path(settings.ledger_path),
-    ]
-    for path in candidates:
-        if not path.exists():
+    page: List[LedgerEntry] = []
+    seen = 0
+    next_offset: Optional[int] = None
+    more = False
+    for record, end in iter_ranges(path, ranges, start):
+        seen += 1
+        if cursor is None and seen <= offset:
             continue
-        entries = []
-        with open(path, "r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if path.name.startswith("ledger_"):
-                    entries.append(data)
-                else:
-                    if _matches_date(data, date):
-                        entries.append(data)
-        if entries:
-            return entries
-    return None
-
-
-def _matches_date(entry, date: str) -> bool:
-    from datetime import datetime
-
-    ts = entry.get("start") or entry.get("ts")
-    if ts is None:
-        return False
+        if len(page) < limit:
+            page.append(LedgerEntry(**record))
+            next_offset = end
+            continue
+        more = True
+        if cursor is not None:
+            break  # the total is not reported in cursor mode, stop reading
+
+    next_cursor = _encode_cursor(tag, next_offset) if more and next_offset is not None else None
+    count = len(page) if cursor is not None else seen
+    return LedgerResponse(date=date, count=count, entries=page, next_cursor=next_cursor)
+
+
+@router.get("/ledger/stream")
+async def stream_ledger(
+    date: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1),
+    _: str = Depends(get_api_key),
+    settings: APISettings = Depends(get_settings),
+):
+    """Stream the day's entries as NDJSON, one JSON object per line.
+
+    Entries are written as they are read, so memory stays flat however large
+    the day is. When ``limit`` cuts the stream short, a final
+    ``{"next_cursor": ...}`` line tells the client where to resume.
+    """
+
+    source = _open_source(date, settings)
+    if source is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No data for date")
+    tag, path, ranges = source
+    start = _decode_cursor(cursor, tag) if cursor else 0
+    return StreamingResponse(
+        _ndjson_lines(tag, path, ranges, start, limit),
+        media_type="application/x-ndjson",
+    )
+
+
+def _ndjson_lines(
+    tag: str, path: Path, ranges: List[Tuple[int, int]], start: int, limit: Optional[int]
+) -> Iterator[bytes]:
+    # Sync generator: Starlette iterates it in a worker thread.
+    sent = 0
+    for record, end in iter_ranges(path, ranges, start):
+        if limit is not None and sent >= limit:
+            yield (json.dumps({"next_cursor": _encode_cursor(tag, start)}) + "\n").encode("utf-8")
+            return
+        yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        sent += 1
+        start = end
+
+
+def _open_source(date: str, settings: APISettings) -> Optional[LedgerSource]:
+    daily_path = Path(settings.summary_dir) / f"ledger_{date}.jsonl"
+    if daily_path.exists():
+        ranges = [(0, daily_path.stat().st_size)]
+        # A daily file without a single valid entry falls back to the main ledger.
+        if next(iter_ranges(daily_path, ranges), None) is not None:
+            return "d", daily_path, ranges
+
+    if not Path(settings.ledger_path).exists():
+        return None
+    ranges = LedgerStore(settings.ledger_path).index.ranges(date)
+    if not ranges:
+        return None
+    return "l", Path(settings.ledger_path), ranges
+
+
+def _encode_cursor(tag: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{tag}:{offset}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, tag: str) -> int:
     try:
-        return datetime.fromtimestamp(float(ts)).strftime("%Y-%m-%d") == date
-    except Exception:
-        return False
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        cursor_tag, offset = raw.split(":", 1)
+        value = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if cursor_tag != tag or value < 0:
+        # The day's source changed (e.g. a daily summary ledger appeared).
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor is no longer valid")
+    return value
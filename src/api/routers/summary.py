@@ -5,9 +5,12 @@ from __future__ import annotations
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 
 from ..deps.auth import get_api_key
-from ..schemas import SummaryResponse
+from ..deps.services import get_summary_jobs
+from ..schemas import SummaryJobResponse, SummaryResponse
+from ..services.summary_jobs import SummaryJobs
 from ..settings import APISettings, get_settings
 from src.gpt_postproc.ledger_store import LedgerStore
 from src.gpt_postproc.daily_summary import summarize_day
@@ -16,25 +19,71 @@ from src.gpt_postproc.config import GPTConfig
 router = APIRouter(prefix="/v1", tags=["summary"])
 
 
-@router.get("/summary", response_model=SummaryResponse)
+@router.get(
+    "/summary",
+    response_model=SummaryResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": SummaryJobResponse}},
+)
 async def get_summary(
     date: str,
     force: bool = False,
+    wait: bool = True,
     _: str = Depends(get_api_key),
     settings: APISettings = Depends(get_settings),
+    jobs: SummaryJobs = Depends(get_summary_jobs),
 ):
+    """Return the day's summary, generating it once for all concurrent callers.
+
+    With ``wait=false`` a missing (or forced) summary is generated in the
+    background and the call returns 202; poll ``/v1/summary/status`` and
+    fetch the summary once it reports ``done``.
+    """
+
     summary_path = Path(settings.summary_dir) / f"summary_{date}.md"
     if summary_path.exists() and not force:
         content = summary_path.read_text(encoding="utf-8")
         return SummaryResponse(date=date, summary_md=content)
 
-    store = LedgerStore(settings.ledger_path)
-    entries = store.group_by_day().get(date)
-    if not entries:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No ledger entries")
+    if not jobs.running(date):
+        store = LedgerStore(settings.ledger_path)
+        entries = store.entries_for_day(date)
+        if not entries:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No ledger entries")
+
+        async def generate() -> None:
+            await summarize_day(date, entries, cfg=GPTConfig(), output_dir=Path(settings.summary_dir))
 
-    cfg = GPTConfig()
-    await summarize_day(date, entries, cfg=cfg, output_dir=Path(settings.summary_dir))
+        jobs.start(date, generate)
+
+    if not wait:
+        state = jobs.status(date)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=SummaryJobResponse(
+                date=date, status=state["status"], detail=state.get("detail")
+            ).model_dump(),
+            headers={"Location": f"/v1/summary/status?date={date}"},
+        )
+
+    try:
+        await jobs.wait(date)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Summary generation failed"
+        ) from exc
     if not summary_path.exists():
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Summary generation failed")
     return SummaryResponse(date=date, summary_md=summary_path.read_text(encoding="utf-8"))
+
+
+@router.get("/summary/status", response_model=SummaryJobResponse)
+async def get_summary_status(
+    date: str,
+    _: str = Depends(get_api_key),
+    settings: APISettings = Depends(get_settings),
+    jobs: SummaryJobs = Depends(get_summary_jobs),
+):
+    state = jobs.status(date)
+    if state["status"] == "idle" and (Path(settings.summary_dir) / f"summary_{date}.md").exists():
+        state = {"status": "done"}
+    return SummaryJobResponse(date=date, status=state["status"], detail=state.get("detail"))
@@ -2,20 +2,17 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 
 from ..deps.auth import get_api_key
+from ..deps.services import get_transcript_service
 from ..schemas import BatchTranscribeResponse, TranscribeResponse
+from ..services.inference import InferenceSaturatedError
 from ..services.transcript_service import TranscriptService
-from ..settings import APISettings, get_settings
 
 router = APIRouter(prefix="/v1", tags=["transcribe"])
 
 
-def get_service(settings: APISettings = Depends(get_settings)) -> TranscriptService:
-    return TranscriptService(settings)
-
-
 @router.post("/transcribe", response_model=TranscribeResponse)
 async def transcribe_audio(
     file: UploadFile = File(...),
@@ -24,9 +21,12 @@ async def transcribe_audio(
     session_end: str | None = Form(None),
     speech_segments: str | None = Form(None),
     _: str = Depends(get_api_key),
-    service: TranscriptService = Depends(get_service),
+    service: TranscriptService = Depends(get_transcript_service),
 ):
-    record = await service.save_audio(file, lang, session_start, session_end, speech_segments)
+    try:
+        record = await service.save_audio(file, lang, session_start, session_end, speech_segments)
+    except InferenceSaturatedError as exc:
+        raise _saturated(exc) from None
     return TranscribeResponse(
         text=record["text"],
         lang=record.get("lang", "auto"),
@@ -46,7 +46,18 @@ async def transcribe_archive(
     archive: UploadFile = File(...),
     manifest: str = Form(...),
     _: str = Depends(get_api_key),
-    service: TranscriptService = Depends(get_service),
+    service: TranscriptService = Depends(get_transcript_service),
 ):
-    result = await service.process_archive(archive, manifest)
+    try:
+        result = await service.process_archive(archive, manifest)
+    except InferenceSaturatedError as exc:
+        raise _saturated(exc) from None
     return BatchTranscribeResponse(**result)
+
+
+def _saturated(exc: InferenceSaturatedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Transcription queue is full",
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))},
+    )
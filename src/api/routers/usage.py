@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from ..deps.auth import get_api_key, get_api_key_metadata
 from ..schemas import UsageResponse
@@ -12,13 +12,24 @@ router = APIRouter(prefix="/v1", tags=["usage"])
 
 @router.get("/usage", response_model=UsageResponse)
 async def usage_endpoint(
+    request: Request,
     _: str = Depends(get_api_key),
     metadata = Depends(get_api_key_metadata),
 ) -> UsageResponse:
+    decision = getattr(request.state, "rate_limit", None)
+    limits = {}
+    if decision is not None and not decision.unlimited:
+        limits = {
+            "rate_limit_per_minute": decision.per_minute,
+            "rate_limit_burst": decision.limit,
+            "rate_limit_remaining": decision.remaining,
+            "rate_limit_reset_sec": round(decision.reset_after, 3),
+        }
     return UsageResponse(
         owner=metadata.owner,
         created_at=metadata.created_at,
         usage_count=metadata.usage_count,
         requests_today=metadata.requests_today,
         last_used=metadata.last_used,
+        **limits,
     )
@@ -48,6 +48,7 @@ class LedgerResponse(BaseModel):
     date: str
     count: int
     entries: list[LedgerEntry]
+    next_cursor: str | None = None
 
 
 class SummaryResponse(BaseModel):
@@ -55,12 +56,19 @@ class SummaryResponse(BaseModel):
     summary_md: str
 
 
+class SummaryJobResponse(BaseModel):
+    date: str
+    status: str
+    detail: str | None = None
+
+
 class HealthResponse(BaseModel):
     ok: bool
     redis: str
     disk: str
     openai: str
     tls: str
+    whisper: str = "skip"
     timestamp: datetime
 
 
@@ -82,6 +90,10 @@ class UsageResponse(BaseModel):
     usage_count: int
     requests_today: int
     last_used: float | None = None
+    rate_limit_per_minute: int | None = None
+    rate_limit_burst: int | None = None
+    rate_limit_remaining: int | None = None
+    rate_limit_reset_sec: float | None = None
 
 
 class SpeechWindow(BaseModel):
@@ -3,17 +3,30 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
+import logging
+import os
 import secrets
 import string
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from redis.asyncio import Redis, from_url
 
+try:  # POSIX advisory locks keep concurrent writers from losing updates
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger("daymind.auth")
+
 
 @dataclass
 class APIKeyRecord:
@@ -25,28 +38,105 @@ class APIKeyRecord:
     revoked: bool = False
     requests_today: int = 0
     requests_day: int = 0  # YYYYMMDD for quick resets
+    rate_limit_per_minute: int | None = None  # None = service default, 0 = unlimited
+    rate_limit_burst: int | None = None
 
 
 class RateLimitError(Exception):
     """Raised when a key exceeds the configured rate limit."""
 
+    def __init__(self, message: str, decision: "RateLimitDecision | None" = None):
+        super().__init__(message)
+        self.decision = decision
+
+
+@dataclass
+class UsageDelta:
+    """Usage recorded for one key since the last flush.
+
+    ``absolute`` deltas carry authoritative totals (from Redis) and are merged
+    with ``max``; relative ones are this process's own counts and are added.
+    """
+
+    count: int = 0
+    today: int = 0
+    day: int = 0
+    last_used: float | None = None
+    absolute: bool = False
+
 
 class APIKeyStore:
-    """Simple JSON-backed key registry following the Text-First Storage rule."""
+    """Simple JSON-backed key registry following the Text-First Storage rule.
+
+    Key metadata (create/revoke) is written through immediately. Usage
+    counters are write-behind: they accumulate in memory and :meth:`flush`
+    merges them into the file under an exclusive lock and replaces it
+    atomically, so several workers (and the CLI) can share one store.
 
-    def __init__(self, path: Path):
+    Lookups go through an in-memory index keyed by a digest of the key. The
+    file's mtime/size is checked at most every ``reload_interval`` seconds and the
+    index is rebuilt when it changed, so keys created or revoked out of band
+    take effect without a restart and without touching disk per request.
+
+    ``_lock`` only guards the in-memory state and is never held across disk
+    I/O, so request handlers counting usage on the event loop do not wait
+    for a flush that is queued behind another worker's file lock.
+    """
+
+    def __init__(self, path: Path, reload_interval: float = 2.0, force_interval: float = 0.5):
         self.path = path
-        self._records: Dict[str, APIKeyRecord] = {}
+        self.reload_interval = reload_interval
+        self.force_interval = force_interval
+        self._index: Dict[bytes, APIKeyRecord] = {}
+        self._pending: Dict[str, UsageDelta] = {}
         self._lock = Lock()
+        self._io_lock = Lock()
+        self._signature: tuple[int, int] | None = None
+        self._checked_at = time.monotonic()
+        self._forced_at = float("-inf")
         self._load()
 
     def _load(self) -> None:
         if not self.path.exists():
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            self._records = {}
             return
+        with self._lock:
+            self._signature = _file_signature(self.path)
+            self._adopt_locked(self._read_file())
+
+    def maybe_reload(self, force: bool = False) -> Optional[Set[bytes]]:
+        """Rebuild the index if the file changed.
+
+        Returns the digests of keys the reload added (empty when nothing was
+        added or the file is unchanged), or ``None`` when the check was
+        skipped: plain checks run at most once per ``reload_interval`` and
+        forced ones at most once per ``force_interval``.
+        """
+
+        now = time.monotonic()
+        if force:
+            if now - self._forced_at < self.force_interval:
+                return None
+            self._forced_at = now
+        elif now - self._checked_at < self.reload_interval:
+            return None
+        self._checked_at = now
+        signature = _file_signature(self.path)
+        if signature is None or signature == self._signature:
+            return set()
+        disk = self._read_file()
+        with self._lock:
+            for key, delta in self._pending.items():
+                if key in disk:
+                    _merge_usage(disk[key], delta)  # keep unflushed usage visible
+            self._signature = signature
+            return self._adopt_locked(disk)
+
+    def _read_file(self) -> Dict[str, APIKeyRecord]:
         try:
             data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
         except json.JSONDecodeError:
             data = []
         if isinstance(data, dict) and "keys" in data:
@@ -63,58 +153,325 @@ class APIKeyStore:
                 revoked=item.get("revoked", False),
                 requests_today=item.get("requests_today", 0),
                 requests_day=item.get("requests_day", 0),
+                rate_limit_per_minute=item.get("rate_limit_per_minute"),
+                rate_limit_burst=item.get("rate_limit_burst"),
             )
             if record.key:
                 records[record.key] = record
-        self._records = records
+        return records
 
     def save(self) -> None:
+        """Persist all records, merging pending usage into the file."""
+
+        self._persist({})
+
+    def flush(self) -> bool:
+        """Write pending usage counters; returns False when there was nothing to do."""
+
         with self._lock:
-            payload = [asdict(record) for record in self._records.values()]
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            if not self._pending:
+                return False
+        self._persist({})
+        return True
 
     def upsert(self, record: APIKeyRecord) -> None:
-        self._records[record.key] = record
-        self.save()
+        with self._lock:
+            self._index[key_digest(record.key)] = record
+        self._persist({record.key: record})
+
+    def record_usage(self, record: APIKeyRecord, now: float) -> None:
+        """Count one request for ``record`` in memory (flushed later)."""
+
+        day = int(time.strftime("%Y%m%d", time.gmtime(now)))
+        with self._lock:
+            if record.requests_day != day:
+                record.requests_day = day
+                record.requests_today = 0
+            record.requests_today += 1
+            record.usage_count += 1
+            record.last_used = now
+            delta = self._pending.setdefault(record.key, UsageDelta())
+            if delta.absolute:
+                self._set_absolute(delta, record)
+                return
+            if delta.day != day:
+                delta.day, delta.today = day, 0
+            delta.count += 1
+            delta.today += 1
+            delta.last_used = now
+
+    def apply_usage(self, record: APIKeyRecord, usage_count: int, requests_today: int, now: float) -> None:
+        """Adopt authoritative totals (e.g. from Redis) for ``record``."""
+
+        with self._lock:
+            record.usage_count = max(record.usage_count, usage_count)
+            record.requests_day = int(time.strftime("%Y%m%d", time.gmtime(now)))
+            record.requests_today = requests_today
+            record.last_used = now
+            self._set_absolute(self._pending.setdefault(record.key, UsageDelta()), record)
 
     def get(self, key: str) -> APIKeyRecord | None:
-        return self._records.get(key)
+        self.maybe_reload()
+        return self._index.get(key_digest(key))
 
     def list(self) -> List[APIKeyRecord]:
-        return sorted(self._records.values(), key=lambda item: item.created_at)
+        return sorted(self._index.values(), key=lambda item: item.created_at)
+
+    @staticmethod
+    def _set_absolute(delta: UsageDelta, record: APIKeyRecord) -> None:
+        delta.absolute = True
+        delta.count = record.usage_count
+        delta.today = record.requests_today
+        delta.day = record.requests_day
+        delta.last_used = record.last_used
+
+    def _persist(self, replace: Dict[str, APIKeyRecord]) -> None:
+        """Merge pending usage and ``replace`` into the file, then adopt it.
+
+        Pending deltas are swapped out under ``_lock``; the locked
+        read-merge-write runs without it, and deltas recorded meanwhile stay
+        pending for the next flush.
+        """
+
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            try:
+                disk = self._write_merged(pending, replace)
+            except BaseException:
+                with self._lock:
+                    _restore_pending(self._pending, pending)
+                raise
+            with self._lock:
+                for key, delta in self._pending.items():
+                    if key in disk:
+                        _merge_usage(disk[key], delta)  # usage counted during the write
+                self._adopt_locked(disk)
+
+    def _write_merged(
+        self,
+        pending: Dict[str, UsageDelta],
+        replace: Dict[str, APIKeyRecord],
+    ) -> Dict[str, APIKeyRecord]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _exclusive_file_lock(self.path):
+            disk = self._read_file()
+            for key, delta in pending.items():
+                current = disk.get(key)
+                if current is None:
+                    continue  # removed out of band: drop its usage, keep it revoked
+                _merge_usage(current, delta)
+            for key, record in replace.items():
+                current = disk.get(key)
+                if current is not None and current is not record:
+                    record.usage_count = max(record.usage_count, current.usage_count)
+                    if current.requests_day == record.requests_day:
+                        record.requests_today = max(record.requests_today, current.requests_today)
+                disk[key] = record
+            payload = [asdict(record) for record in disk.values()]
+            tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._signature = _file_signature(self.path)
+        return disk
+
+    def _adopt_locked(self, disk: Dict[str, APIKeyRecord]) -> Set[bytes]:
+        """Swap in ``disk`` as the index; returns digests of keys that are new."""
+
+        index: Dict[bytes, APIKeyRecord] = {}
+        added: Set[bytes] = set()
+        for key, merged in disk.items():
+            digest = key_digest(key)
+            current = self._index.get(digest)
+            if current is None:
+                added.add(digest)
+            if current is None or current is merged:
+                index[digest] = merged
+                continue
+            # Update in place so records already handed to callers stay live.
+            for name, value in asdict(merged).items():
+                setattr(current, name, value)
+            index[digest] = current
+        self._index = index
+        return added
+
+
+def key_digest(key: str) -> bytes:
+    """Fixed-size digest used to index keys instead of the raw secret."""
+
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _restore_pending(pending: Dict[str, UsageDelta], failed: Dict[str, UsageDelta]) -> None:
+    """Put deltas from a failed write back in front of ones recorded since."""
+
+    for key, old in failed.items():
+        new = pending.get(key)
+        if new is None:
+            pending[key] = old
+        elif not new.absolute and not old.absolute:
+            if old.day == new.day:
+                new.today += old.today
+            new.count += old.count
+        elif not new.absolute:
+            # Absolute totals plus this process's newer relative counts.
+            old.count += new.count
+            old.today = old.today + new.today if old.day == new.day else new.today
+            old.day = max(old.day, new.day)
+            old.last_used = new.last_used or old.last_used
+            pending[key] = old
+
+
+def _merge_usage(record: APIKeyRecord, delta: UsageDelta) -> None:
+    if delta.absolute:
+        record.usage_count = max(record.usage_count, delta.count)
+        if record.requests_day == delta.day:
+            record.requests_today = max(record.requests_today, delta.today)
+        elif delta.day > record.requests_day:
+            record.requests_day, record.requests_today = delta.day, delta.today
+    else:
+        record.usage_count += delta.count
+        if record.requests_day == delta.day:
+            record.requests_today += delta.today
+        elif delta.day > record.requests_day:
+            record.requests_day, record.requests_today = delta.day, delta.today
+    if delta.last_used is not None:
+        record.last_used = max(record.last_used or 0.0, delta.last_used)
+
+
+@contextmanager
+def _exclusive_file_lock(path: Path) -> Iterator[None]:
+    """Serialize read-merge-write cycles across processes (POSIX only)."""
+
+    if fcntl is None:  # pragma: no cover - non-POSIX platforms
+        yield
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+# Refill-and-take on a hash of {tokens, ts} in one atomic round-trip. The clock
+# comes from the server (TIME) so workers with skewed clocks share one bucket;
+# the key expires once the bucket would be full again, which equals no state.
+_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of one rate-limit check, as exposed in ``X-RateLimit-*`` headers.
+
+    ``limit`` is the bucket size (burst), ``remaining`` the whole tokens left,
+    ``reset_after`` the seconds until the bucket is full again and
+    ``retry_after`` the seconds until the next request would be admitted.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    per_minute: int
+    reset_after: float = 0.0
+    retry_after: float = 0.0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute == 0
 
 
 class RateLimiter:
-    """Token bucket backed by Redis when available, in-memory otherwise."""
+    """Token bucket backed by Redis when available, in-memory otherwise.
+
+    Each key refills at ``limit_per_minute`` tokens per minute up to ``burst``
+    tokens (defaulting to one minute's worth). With Redis the check is a
+    single EVALSHA of :data:`_TOKEN_BUCKET`, so all workers share the bucket.
+    """
 
-    def __init__(self, redis_url: str | None, limit_per_minute: int):
+    def __init__(self, redis_url: str | None, limit_per_minute: int, burst: int = 0):
         self.redis_url = redis_url
         self.limit = max(0, limit_per_minute)
+        self.burst = max(0, burst)
         self._client: Redis | None = None
+        self._script = None
         self._lock = Lock()
-        self._buckets: Dict[str, tuple[int, int]] = {}
+        self._buckets: Dict[str, tuple[float, float]] = {}
 
-    async def allow(self, key: str) -> bool:
-        if self.limit == 0:
-            return True
-        bucket = int(time.time() // 60)
+    async def allow(
+        self,
+        key: str,
+        *,
+        limit_per_minute: int | None = None,
+        burst: int | None = None,
+    ) -> RateLimitDecision:
+        """Take one token for ``key``; per-key settings override the defaults."""
+
+        per_minute = self.limit if limit_per_minute is None else max(0, limit_per_minute)
+        if per_minute == 0:
+            return RateLimitDecision(allowed=True, limit=0, remaining=0, per_minute=0)
+        capacity = burst if burst is not None else self.burst
+        capacity = max(1, capacity or per_minute)
+        rate = per_minute / 60.0
         if self.redis_url:
-            client = await self._get_client()
-            counter_key = f"daymind:ratelimit:{key}:{bucket}"
-            count = await client.incr(counter_key)
-            if count == 1:
-                await client.expire(counter_key, 65)
-            return count <= self.limit
-        with self._lock:
-            previous_bucket, previous_count = self._buckets.get(key, (bucket, 0))
-            if previous_bucket != bucket:
-                previous_bucket, previous_count = bucket, 0
-            previous_count += 1
-            self._buckets[key] = (previous_bucket, previous_count)
-            return previous_count <= self.limit
-
-    async def _get_client(self) -> Redis:
+            if self._script is None:
+                client = await self.redis_client()
+                self._script = client.register_script(_TOKEN_BUCKET)
+            allowed, tokens = await self._script(
+                keys=[f"daymind:ratelimit:{key}"], args=[capacity, rate, 1]
+            )
+            allowed, tokens = bool(int(allowed)), float(tokens)
+        else:
+            now = time.monotonic()
+            with self._lock:
+                tokens, updated = self._buckets.get(key, (float(capacity), now))
+                tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+                allowed = tokens >= 1
+                if allowed:
+                    tokens -= 1
+                self._buckets[key] = (tokens, now)
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=int(tokens),
+            per_minute=per_minute,
+            reset_after=(capacity - tokens) / rate,
+            retry_after=0.0 if allowed else (1 - tokens) / rate,
+        )
+
+    async def redis_client(self) -> Redis:
+        """The limiter's Redis connection, shared with usage accounting."""
+
         if self._client is None:
             self._client = from_url(self.redis_url, decode_responses=False)
         return self._client
@@ -129,10 +486,21 @@ class AuthService:
         fallback_keys: Iterable[str],
         redis_url: str | None,
         rate_limit_per_minute: int,
+        usage_flush_sec: float = 5.0,
+        reload_interval: float = 2.0,
+        negative_ttl_sec: float = 30.0,
+        negative_max_entries: int = 10_000,
+        rate_limit_burst: int = 0,
     ):
-        self.store = APIKeyStore(store_path)
+        self.store = APIKeyStore(store_path, reload_interval=reload_interval)
         self.fallback_keys = set(fallback_keys)
-        self.rate_limiter = RateLimiter(redis_url, rate_limit_per_minute)
+        self.negative_ttl_sec = negative_ttl_sec
+        self.negative_max_entries = negative_max_entries
+        self._negative: "OrderedDict[bytes, float]" = OrderedDict()
+        self.rate_limiter = RateLimiter(redis_url, rate_limit_per_minute, rate_limit_burst)
+        self.redis_url = redis_url
+        self.usage_flush_sec = usage_flush_sec
+        self._flusher: asyncio.Task | None = None
 
     def _ensure_record(self, key: str, owner: str = "env") -> APIKeyRecord:
         record = self.store.get(key)
@@ -142,27 +510,100 @@ class AuthService:
         return record
 
     async def validate_and_track(self, key: str) -> APIKeyRecord:
+        record, _ = await self.authenticate(key)
+        return record
+
+    async def authenticate(self, key: str) -> Tuple[APIKeyRecord, RateLimitDecision]:
+        """Validate ``key``, take a rate-limit token and record the usage."""
+
         record = self.store.get(key)
         if record is None and key in self.fallback_keys:
             record = self._ensure_record(key, owner="env")
+        if record is None:
+            record = self._lookup_unknown(key)
         if record is None or record.revoked:
             raise ValueError("unknown_api_key")
-        allowed = await self.rate_limiter.allow(key)
-        if not allowed:
-            raise RateLimitError("rate_limit_exceeded")
-        self._record_usage(record)
-        return record
-
-    def _record_usage(self, record: APIKeyRecord) -> None:
+        decision = await self.rate_limiter.allow(
+            key,
+            limit_per_minute=record.rate_limit_per_minute,
+            burst=record.rate_limit_burst,
+        )
+        if not decision.allowed:
+            raise RateLimitError("rate_limit_exceeded", decision)
+        await self._record_usage(record)
+        return record, decision
+
+    def _lookup_unknown(self, key: str) -> APIKeyRecord | None:
+        """Resolve a key missing from the index, remembering misses briefly.
+
+        A miss forces a reload check in case the key was just created by the
+        CLI; forced checks are throttled by the store's ``force_interval`` so
+        floods of distinct invalid keys cost no more than one ``stat`` per
+        interval. Repeated misses for the same key within ``negative_ttl_sec``
+        are rejected from an LRU negative cache without touching the store.
+        A reload only evicts the digests of keys it actually added.
+        """
+
+        digest = key_digest(key)
+        now = time.monotonic()
+        expires = self._negative.get(digest)
+        if expires is not None:
+            if expires > now:
+                self._negative.move_to_end(digest)
+                return None
+            del self._negative[digest]
+        added = self.store.maybe_reload(force=True)
+        if added is None:
+            return None  # check throttled; do not cache a miss we did not verify
+        for new_digest in added:
+            self._negative.pop(new_digest, None)
+        if digest in added:
+            return self.store.get(key)
+        if self.negative_ttl_sec > 0:
+            self._negative[digest] = now + self.negative_ttl_sec
+            while len(self._negative) > self.negative_max_entries:
+                self._negative.popitem(last=False)
+        return None
+
+    async def _record_usage(self, record: APIKeyRecord) -> None:
         now = time.time()
+        self._ensure_flusher()
+        if not self.redis_url:
+            self.store.record_usage(record, now)
+            return
         today = time.strftime("%Y%m%d", time.gmtime(now))
-        if record.requests_day != int(today):
-            record.requests_day = int(today)
-            record.requests_today = 0
-        record.requests_today += 1
-        record.usage_count += 1
-        record.last_used = now
-        self.store.upsert(record)
+        client = await self.rate_limiter.redis_client()
+        total_key = f"daymind:usage:{record.key}"
+        day_key = f"{total_key}:{today}"
+        pipe = client.pipeline(transaction=False)
+        pipe.hincrby(total_key, "usage_count", 1)
+        pipe.incr(day_key)
+        pipe.expire(day_key, 2 * 86400)
+        usage_count, requests_today, _ = await pipe.execute()
+        self.store.apply_usage(record, int(usage_count), int(requests_today), now)
+
+    def _ensure_flusher(self) -> None:
+        if self.usage_flush_sec <= 0:
+            self.store.flush()
+            return
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.usage_flush_sec)
+            try:
+                await asyncio.to_thread(self.store.flush)
+            except OSError as exc:  # pragma: no cover - disk full / permissions
+                LOGGER.warning("API key usage flush failed: %s", exc)
+
+    async def aclose(self) -> None:
+        """Stop the periodic flusher and write any pending usage."""
+
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await asyncio.to_thread(self.store.flush)
 
     def usage_snapshot(self, key: str) -> Dict[str, float | int | str | None]:
         record = self.store.get(key)
@@ -176,10 +617,23 @@ class AuthService:
             "last_used": record.last_used,
         }
 
-    def create_key(self, owner: str, key: str | None = None) -> APIKeyRecord:
+    def create_key(
+        self,
+        owner: str,
+        key: str | None = None,
+        rate_limit_per_minute: int | None = None,
+        rate_limit_burst: int | None = None,
+    ) -> APIKeyRecord:
         token = key or self._generate_key()
-        record = APIKeyRecord(key=token, owner=owner, created_at=time.time())
+        record = APIKeyRecord(
+            key=token,
+            owner=owner,
+            created_at=time.time(),
+            rate_limit_per_minute=rate_limit_per_minute,
+            rate_limit_burst=rate_limit_burst,
+        )
         self.store.upsert(record)
+        self._negative.pop(key_digest(token), None)
         return record
 
     def revoke_key(self, key: str) -> bool:
@@ -204,8 +658,21 @@ def build_auth_service(
     fallback_keys: Iterable[str],
     redis_url: str | None,
     rate_limit_per_minute: int,
+    usage_flush_sec: float = 5.0,
+    reload_interval: float = 2.0,
+    negative_ttl_sec: float = 30.0,
+    rate_limit_burst: int = 0,
 ) -> AuthService:
-    return AuthService(store_path, fallback_keys, redis_url, rate_limit_per_minute)
+    return AuthService(
+        store_path,
+        fallback_keys,
+        redis_url,
+        rate_limit_per_minute,
+        usage_flush_sec,
+        reload_interval=reload_interval,
+        negative_ttl_sec=negative_ttl_sec,
+        rate_limit_burst=rate_limit_burst,
+    )
 
 
 def _cli() -> None:
@@ -216,6 +683,8 @@ def _cli() -> None:
     create_cmd = sub.add_parser("create", help="Create a new API key")
     create_cmd.add_argument("owner", help="Owner or label for the key")
     create_cmd.add_argument("--key", help="Optional custom key value")
+    create_cmd.add_argument("--rate-limit", type=int, help="Requests per minute (0 = unlimited)")
+    create_cmd.add_argument("--burst", type=int, help="Bucket size (defaults to the per-minute limit)")
 
     revoke_cmd = sub.add_parser("revoke", help="Revoke an API key")
     revoke_cmd.add_argument("key", help="Key to revoke")
@@ -227,7 +696,12 @@ def _cli() -> None:
 
     if args.command == "create":
         service = AuthService(Path(args.store), [], None, 0)
-        record = service.create_key(owner=args.owner, key=args.key)
+        record = service.create_key(
+            owner=args.owner,
+            key=args.key,
+            rate_limit_per_minute=args.rate_limit,
+            rate_limit_burst=args.burst,
+        )
         print(f"created key for {record.owner}: {record.key}")
     elif args.command == "revoke":
         service = AuthService(Path(args.store), [], None, 0)
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from beancount.core import data
 from beancount.loader import load_file
 
+LOGGER = logging.getLogger("daymind.finance")
+
 
 @dataclass(slots=True)
 class FinanceSummary:
@@ -20,22 +25,117 @@ class FinanceSummary:
     currency: str
 
 
+@dataclass(slots=True)
+class LedgerSnapshot:
+    """Aggregates of one parse of the ledger, keyed by date for O(1) filtering."""
+
+    signature: Tuple[int, int]
+    rows: List[FinanceSummary]
+    by_date: Dict[str, List[FinanceSummary]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+
 def summarize_ledger(path: Path, *, date: str | None = None) -> List[FinanceSummary]:
+    """Parse ``path`` and aggregate it (uncached; see :class:`FinanceLedgerCache`)."""
+
     if not path.exists():
         raise FileNotFoundError(path)
+    rows = _aggregate(_load_entries(path))
+    if date:
+        return [row for row in rows if row.date == date]
+    return rows
+
+
+class FinanceLedgerCache:
+    """Process-wide cache of the aggregated Beancount ledger.
+
+    The ledger is parsed once and re-parsed only when its mtime or size
+    changes. Reloads run in a worker thread; while one is in progress,
+    requests keep being served from the previous snapshot, so only the very
+    first request (with nothing cached yet) waits for a parse.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._snapshot: Optional[LedgerSnapshot] = None
+        self._reload: Optional[asyncio.Future] = None
+
+    async def summaries(self, date: str | None = None) -> List[FinanceSummary]:
+        signature = _signature(self.path)
+        if signature is None:
+            raise FileNotFoundError(self.path)
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = await self.reload()
+        elif snapshot.signature != signature:
+            self._start_reload()
+        if date:
+            return snapshot.by_date.get(date, [])
+        return snapshot.rows
 
+    async def reload(self) -> LedgerSnapshot:
+        """Wait for a (possibly already running) reload and return its snapshot."""
+
+        return await asyncio.shield(self._start_reload())
+
+    def _start_reload(self) -> asyncio.Future:
+        if self._reload is None or self._reload.done():
+            loop = asyncio.get_running_loop()
+            self._reload = loop.run_in_executor(None, self._load)
+            self._reload.add_done_callback(self._reload_done)
+        return self._reload
+
+    def _reload_done(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            LOGGER.error("Finance ledger reload failed for %s: %s", self.path, exc)
+
+    def _load(self) -> LedgerSnapshot:
+        # Take the signature before parsing so a write during the parse
+        # leaves the snapshot stale and triggers another reload.
+        signature = _signature(self.path)
+        if signature is None:
+            raise FileNotFoundError(self.path)
+        started = time.perf_counter()
+        rows = _aggregate(_load_entries(self.path))
+        by_date: Dict[str, List[FinanceSummary]] = defaultdict(list)
+        for row in rows:
+            by_date[row.date].append(row)
+        snapshot = LedgerSnapshot(signature, rows, dict(by_date), time.time())
+        self._snapshot = snapshot
+        LOGGER.info(
+            "Loaded finance ledger %s (%d rows) in %.3fs",
+            self.path,
+            len(rows),
+            time.perf_counter() - started,
+        )
+        return snapshot
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_entries(path: Path) -> list:
     entries, errors, _ = load_file(str(path))
     # Ignore validation errors (missing open directives, etc.); the exporter already writes them.
     del errors  # quiet linters
+    return entries
 
+
+def _aggregate(entries: list) -> List[FinanceSummary]:
     buckets: Dict[Tuple[str, str, str], Decimal] = defaultdict(Decimal)
 
     for entry in entries:
         if not isinstance(entry, data.Transaction):
             continue
         entry_date = entry.date.isoformat()
-        if date and entry_date != date:
-            continue
         for posting in entry.postings:
             account = posting.account or ""
             if not account:
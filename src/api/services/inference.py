@@ -0,0 +1,99 @@
+"""Bounded thread-pool executor that keeps model inference off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from ..metrics import INFERENCE_IN_FLIGHT, INFERENCE_QUEUE_DEPTH, INFERENCE_REJECTED
+
+T = TypeVar("T")
+
+
+class InferenceSaturatedError(RuntimeError):
+    """Raised when the admission queue is full; callers should retry later."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("inference_saturated")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """Run blocking inference calls on a dedicated pool with admission control.
+
+    At most ``workers`` jobs run at once and at most ``max_queue`` more wait for
+    a worker; anything beyond that is rejected immediately with
+    :class:`InferenceSaturatedError` instead of piling up behind the model.
+    Threads (not processes) are used because faster-whisper/CTranslate2 release
+    the GIL during decoding and the loaded model cannot be pickled.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        max_queue: int = 8,
+        *,
+        retry_after: float = 5.0,
+        name: str = "whisper",
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{name}-infer")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return max(0, self._admitted - self._running)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._running
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._admitted >= self.capacity:
+                INFERENCE_REJECTED.labels(executor=self.name).inc()
+                raise InferenceSaturatedError(self.retry_after)
+            self._admitted += 1
+            self._publish_locked()
+        # The slot is released when the job itself finishes, not when the
+        # awaiting coroutine does: a cancelled request (client disconnect)
+        # leaves the thread running, and it must keep counting against the cap.
+        future = self._pool.submit(self._invoke, fn, args, kwargs)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._admitted -= 1
+            self._publish_locked()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _invoke(self, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        with self._lock:
+            self._running += 1
+            self._publish_locked()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._publish_locked()
+
+    def _publish_locked(self) -> None:
+        INFERENCE_IN_FLIGHT.labels(executor=self.name).set(self._running)
+        INFERENCE_QUEUE_DEPTH.labels(executor=self.name).set(max(0, self._admitted - self._running))
@@ -0,0 +1,151 @@
+"""App-scoped registry of shared service objects and client pools."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
+
+from ..settings import APISettings
+from .finance import FinanceLedgerCache
+from .summary_jobs import SummaryJobs
+from .transcript_service import TranscriptService
+from .whisper_engine import WhisperEngine
+
+LOGGER = logging.getLogger("daymind.registry")
+
+
+class ServiceRegistry:
+    """Build services once per worker and close their clients on shutdown.
+
+    Services are cached per distinct settings object so dependency overrides
+    (tests, multi-tenant setups) still get isolated instances, while the
+    Redis connection pools and OpenAI HTTP clients are shared by URL/key.
+    """
+
+    def __init__(self) -> None:
+        self._transcript: Dict[int, TranscriptService] = {}
+        self._whisper: Dict[tuple, WhisperEngine] = {}
+        self._redis_pools: Dict[str, ConnectionPool] = {}
+        self._openai: Dict[str, AsyncOpenAI] = {}
+        self._summary_jobs: Dict[str, SummaryJobs] = {}
+        self._finance: Dict[str, FinanceLedgerCache] = {}
+        self._background: List[asyncio.Task] = []
+
+    def start_warmup(self, settings: APISettings) -> None:
+        """Preload and warm the Whisper pool without blocking startup."""
+
+        engine = self.whisper_engine(settings)
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(engine.warmup))
+        task.add_done_callback(_log_warmup_failure)
+        self._background.append(task)
+
+    def transcript_service(self, settings: APISettings) -> TranscriptService:
+        key = id(settings)
+        service = self._transcript.get(key)
+        if service is None or service.settings is not settings:
+            service = TranscriptService(
+                settings,
+                whisper=self.whisper_engine(settings),
+                openai_client=self.openai_client(settings) if settings.whisper_use_openai else None,
+                redis_client=self.redis_client(settings),
+            )
+            self._transcript[key] = service
+        return service
+
+    def summary_jobs(self, settings: APISettings) -> SummaryJobs:
+        key = settings.redis_url or ""
+        jobs = self._summary_jobs.get(key)
+        if jobs is None:
+            jobs = SummaryJobs(
+                self.redis_client(settings),
+                lock_ttl_sec=settings.summary_lock_ttl_sec,
+            )
+            self._summary_jobs[key] = jobs
+        return jobs
+
+    def finance_ledger(self, settings: APISettings) -> FinanceLedgerCache:
+        cache = self._finance.get(settings.finance_ledger_path)
+        if cache is None:
+            cache = FinanceLedgerCache(Path(settings.finance_ledger_path))
+            self._finance[settings.finance_ledger_path] = cache
+        return cache
+
+    def whisper_engine(self, settings: APISettings) -> WhisperEngine:
+        key = (
+            settings.whisper_model,
+            settings.whisper_device,
+            settings.whisper_compute_type,
+            settings.whisper_mock_transcriber,
+        )
+        engine = self._whisper.get(key)
+        if engine is None:
+            engine = WhisperEngine(settings)
+            self._whisper[key] = engine
+        return engine
+
+    def redis_client(self, settings: APISettings) -> Optional[Redis]:
+        if not settings.redis_url:
+            return None
+        pool = self._redis_pools.get(settings.redis_url)
+        if pool is None:
+            # Blocking: callers wait for a free connection instead of getting
+            # MaxConnectionsError (and silently dropped publishes) under load.
+            pool = BlockingConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout_sec,
+                decode_responses=True,
+            )
+            self._redis_pools[settings.redis_url] = pool
+        return Redis(connection_pool=pool)
+
+    def openai_client(self, settings: APISettings) -> AsyncOpenAI:
+        if not settings.openai_api_key:
+            raise RuntimeError("WHISPER_USE_OPENAI=1 but OPENAI_API_KEY is missing")
+        client = self._openai.get(settings.openai_api_key)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_connections,
+            )
+            client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                http_client=httpx.AsyncClient(limits=limits, timeout=60.0),
+            )
+            self._openai[settings.openai_api_key] = client
+        return client
+
+    async def aclose(self) -> None:
+        for task in self._background:
+            task.cancel()
+        self._background.clear()
+        for jobs in self._summary_jobs.values():
+            await jobs.aclose()
+        for service in self._transcript.values():
+            await service.aclose()
+        for engine in self._whisper.values():
+            engine.close()
+        for client in self._openai.values():
+            await client.close()
+        for pool in self._redis_pools.values():
+            await pool.disconnect()
+        self._summary_jobs.clear()
+        self._finance.clear()
+        self._transcript.clear()
+        self._whisper.clear()
+        self._openai.clear()
+        self._redis_pools.clear()
+
+
+def _log_warmup_failure(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        LOGGER.error("Whisper warmup failed: %s", exc)
@@ -0,0 +1,126 @@
+"""Single-flight coordination of on-demand daily summary generation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+LOGGER = logging.getLogger("daymind.summary_jobs")
+
+# Delete the lock only if we still own it (it may have expired and been retaken).
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SummaryJobs:
+    """Run at most one summary generation per day across callers and workers.
+
+    Concurrent requests for the same day inside this process await the same
+    task. With Redis configured, a ``SET NX PX`` lock extends that across
+    workers: a worker that loses the race waits for the lock to be released
+    and then serves the files the winner wrote. When Redis is unreachable the
+    generation falls back to the in-process single-flight alone.
+    """
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        *,
+        lock_ttl_sec: float = 600.0,
+        poll_interval: float = 0.5,
+        lock_prefix: str = "daymind:summary:lock:",
+    ) -> None:
+        self.redis = redis
+        self.lock_ttl_ms = int(lock_ttl_sec * 1000)
+        self.poll_interval = poll_interval
+        self.lock_prefix = lock_prefix
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+
+    def running(self, day: str) -> bool:
+        task = self._tasks.get(day)
+        return task is not None and not task.done()
+
+    def status(self, day: str) -> Dict[str, Any]:
+        if self.running(day):
+            return {"status": "running"}
+        return dict(self._status.get(day, {"status": "idle"}))
+
+    def start(self, day: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Return the in-flight task for ``day``, starting one if none runs."""
+
+        task = self._tasks.get(day)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._execute(day, factory))
+            self._tasks[day] = task
+            task.add_done_callback(lambda t, day=day: self._finished(day, t))
+        return task
+
+    async def wait(self, day: str) -> None:
+        """Wait for the in-flight generation for ``day``, re-raising its error.
+
+        The task is shielded so a disconnecting client does not cancel the
+        generation other callers are waiting on.
+        """
+
+        task = self._tasks.get(day)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def aclose(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def _execute(self, day: str, factory: Callable[[], Awaitable[Any]]) -> None:
+        self._status[day] = {"status": "running", "started": time.time()}
+        if self.redis is None:
+            await factory()
+            return
+        key = self.lock_prefix + day
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(key, token, nx=True, px=self.lock_ttl_ms)
+        except RedisError as exc:
+            LOGGER.warning("Summary lock unavailable (%s); generating %s without it", exc, day)
+            await factory()
+            return
+        if acquired:
+            try:
+                await factory()
+            finally:
+                try:
+                    await self.redis.eval(_RELEASE_LOCK, 1, key, token)
+                except RedisError as exc:  # the lock expires after its TTL
+                    LOGGER.warning("Could not release summary lock for %s: %s", day, exc)
+            return
+        LOGGER.info("Summary for %s is being generated by another worker; waiting", day)
+        try:
+            while await self.redis.exists(key):
+                await asyncio.sleep(self.poll_interval)
+        except RedisError as exc:
+            LOGGER.warning("Lost Redis while waiting for %s (%s); generating locally", day, exc)
+            await factory()
+
+    def _finished(self, day: str, task: asyncio.Task) -> None:
+        if self._tasks.get(day) is task:
+            self._tasks.pop(day, None)
+        if task.cancelled():
+            self._status[day] = {"status": "failed", "detail": "cancelled"}
+            return
+        exc = task.exception()
+        if exc is not None:
+            LOGGER.error("Summary generation for %s failed: %s", day, exc)
+            self._status[day] = {"status": "failed", "detail": str(exc)}
+        else:
+            self._status[day] = {"status": "done", "finished": time.time()}
@@ -2,42 +2,66 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
 import json
+import logging
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import numpy as np
 import soundfile as sf
 from fastapi import UploadFile
 from openai import AsyncOpenAI
+from redis.asyncio import Redis
 
-from src.stt_core.buffer_store import BufferStore
+from src.stt_core.buffer_store import open_buffer_store
 from src.stt_core.redis_io import RedisPublisher
 
 from ..metrics import ARCHIVE_SYNC_COUNTER, ARCHIVE_SYNC_DURATION
 from ..schemas import ArchiveManifestPayload, ManifestChunk
 from ..settings import APISettings
+from .transcription_cache import TranscriptionCache, TranscriptionResult, audio_fingerprint
 from .whisper_engine import WhisperEngine
 
+LOGGER = logging.getLogger("daymind.transcripts")
+
 
 class TranscriptService:
     """Store audio uploads and convert them into transcript records."""
 
-    def __init__(self, settings: APISettings) -> None:
-        self.settings = settings
-        self.buffer = BufferStore(settings.transcript_path)
-        self.whisper = WhisperEngine(settings)
+    def __init__(
+        self,
+        settings: APISettings,
+        *,
+        whisper: Optional[WhisperEngine] = None,
+        openai_client: Optional[AsyncOpenAI] = None,
+        redis_client: Optional[Redis] = None,
+    ) -> None:
         self.settings = settings
+        self.buffer = open_buffer_store(
+            settings.transcript_path,
+            settings.transcript_max_mb,
+            settings.transcript_segment_mb,
+            flush_every=settings.transcript_flush_every,
+        )
+        self.whisper = whisper or WhisperEngine(settings)
         self._openai_client: Optional[AsyncOpenAI] = None
         if settings.whisper_use_openai:
-            if not settings.openai_api_key:
+            if openai_client is None and not settings.openai_api_key:
                 raise RuntimeError("WHISPER_USE_OPENAI=1 but OPENAI_API_KEY is missing")
-            self._openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+            self._openai_client = openai_client or AsyncOpenAI(api_key=settings.openai_api_key)
+        self._openai_limit: Optional[asyncio.Semaphore] = None
+        self.cache = TranscriptionCache(
+            settings.transcription_cache_entries,
+            Path(settings.data_dir) / "transcription_cache" if settings.transcription_cache_disk else None,
+            max_disk_entries=settings.transcription_cache_disk_entries,
+        )
         self._redis: Optional[RedisPublisher] = None
         if settings.redis_url:
-            self._redis = RedisPublisher(settings.redis_url, settings.redis_stream)
+            self._redis = RedisPublisher(settings.redis_url, settings.redis_stream, client=redis_client)
 
     async def save_audio(
         self,
@@ -53,9 +77,23 @@ class TranscriptService:
         tmp_dir = Path(self.settings.data_dir) / "uploads"
         tmp_dir.mkdir(parents=True, exist_ok=True)
         tmp_path = tmp_dir / f"{int(time.time() * 1000)}_{file.filename}"
-        tmp_path.write_bytes(await file.read())
+        await _save_upload(file, tmp_path)
+
+        cache_key = await self._fingerprint_file(tmp_path, lang)
+        # Only uploads the client identifies (session window + filename) are
+        # treated as retries; anonymous uploads of identical audio (e.g.
+        # silence) are distinct chunks and only share the transcription.
+        record_key = None
+        if session_start or session_end:
+            record_key = f"upload:{file.filename}:{session_start or ''}:{session_end or ''}"
+        if cache_key and record_key:
+            existing = self.cache.persisted_record(cache_key, record_key)
+            if existing is not None:
+                return existing
 
-        text, start_offset, end_offset, final_lang, confidence = await self._transcribe_file(tmp_path, lang)
+        text, start_offset, end_offset, final_lang, confidence = await self._transcribe_cached(
+            cache_key, lambda: self._transcribe_file(tmp_path, lang)
+        )
         now = time.time()
         entry = {
             "text": text,
@@ -75,6 +113,8 @@ class TranscriptService:
             entry["speech_segments"] = self._parse_speech_segments(speech_segments_payload)
         self.buffer.append(entry)
         await self._publish(entry)
+        if cache_key and record_key:
+            self.cache.remember_record(cache_key, record_key, entry)
         return entry
 
     async def process_archive(
@@ -86,66 +126,69 @@ class TranscriptService:
         archive_dir = Path(self.settings.data_dir) / "archives" / manifest.archive_id
         archive_dir.mkdir(parents=True, exist_ok=True)
         archive_path = archive_dir / archive_file.filename
-        archive_path.write_bytes(await archive_file.read())
+        with ARCHIVE_SYNC_DURATION.labels(stage="upload").time():
+            await _save_upload(archive_file, archive_path)
         (archive_dir / "manifest.json").write_text(manifest_payload, encoding="utf-8")
 
         start_time = time.perf_counter()
-        entries_out: list[Dict[str, Any]] = []
         try:
-            audio, sample_rate = sf.read(str(archive_path), dtype="float32")
-            if audio.ndim > 1:
-                audio = audio.mean(axis=1)
-            pointer = 0
-            total_samples = len(audio)
-            processed = 0
-
-            for idx, chunk in enumerate(manifest.chunks):
-                samples_needed = self._samples_for_chunk(chunk, sample_rate)
-                end_pointer = pointer + samples_needed
-                if idx == len(manifest.chunks) - 1 or end_pointer > total_samples:
-                    end_pointer = total_samples
-                chunk_audio = audio[pointer:end_pointer]
-                pointer = end_pointer
-                if chunk_audio.size == 0:
-                    continue
-                text, _, _, final_lang, confidence = await self._transcribe_array(chunk_audio, sample_rate)
-                session_label = idx + 1
-                entry = {
-                    "text": text,
-                    "lang": final_lang,
-                    "start": _to_epoch(chunk.session_start),
-                    "end": _to_epoch(chunk.session_end),
-                    "confidence": confidence,
-                    "session_id": session_label,
-                    "archive_id": manifest.archive_id,
-                    "speech_segments": [
-                        {
-                            "start_utc": window.start_utc.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
-                            "end_utc": window.end_utc.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
-                        }
-                        for window in chunk.speech_segments
-                    ],
-                    "source": str(archive_path),
-                    "session_start": chunk.session_start.isoformat().replace("+00:00", "Z"),
-                    "session_end": chunk.session_end.isoformat().replace("+00:00", "Z"),
-                    "chunk_id": chunk.chunk_id,
-                }
-                self.buffer.append(entry)
-                await self._publish(entry)
-                entries_out.append(entry)
-                processed += 1
+            with sf.SoundFile(str(archive_path)) as handle:
+                sample_rate = handle.samplerate
+                total_frames = handle.frames
+            plan = self._plan_chunks(manifest.chunks, total_frames, sample_rate)
+
+            with ARCHIVE_SYNC_DURATION.labels(stage="transcribe").time():
+                semaphore = asyncio.Semaphore(self._batch_concurrency())
+
+                async def _transcribe(start: int, stop: int):
+                    # Decode inside the semaphore so only the chunks being
+                    # transcribed are resident, regardless of archive length.
+                    async with semaphore:
+                        with ARCHIVE_SYNC_DURATION.labels(stage="decode").time():
+                            chunk_audio = await asyncio.to_thread(
+                                _read_frames, archive_path, start, stop
+                            )
+                        cache_key = await self._fingerprint_array(chunk_audio, sample_rate, None)
+                        result = await self._transcribe_cached(
+                            cache_key, lambda: self._transcribe_array(chunk_audio, sample_rate)
+                        )
+                        return result, cache_key
+
+                results = await _gather_or_cancel(
+                    [_transcribe(start, stop) for _, _, start, stop in plan]
+                )
+
+            with ARCHIVE_SYNC_DURATION.labels(stage="persist").time():
+                entries_out: list[Dict[str, Any]] = []
+                fresh: list[tuple[str | None, str, Dict[str, Any]]] = []
+                for (idx, chunk, _, _), (result, cache_key) in zip(plan, results):
+                    record_key = f"{manifest.archive_id}:{chunk.chunk_id}"
+                    existing = (
+                        self.cache.persisted_record(cache_key, record_key) if cache_key else None
+                    )
+                    if existing is not None:
+                        entries_out.append(existing)
+                        continue
+                    entry = self._archive_entry(manifest.archive_id, idx, chunk, archive_path, result)
+                    entries_out.append(entry)
+                    fresh.append((cache_key, record_key, entry))
+                self.buffer.append_many([entry for _, _, entry in fresh])
+                await self._publish_many([entry for _, _, entry in fresh])
+                for cache_key, record_key, entry in fresh:
+                    if cache_key:
+                        self.cache.remember_record(cache_key, record_key, entry)
 
             ARCHIVE_SYNC_COUNTER.labels(status="success").inc()
-            ARCHIVE_SYNC_DURATION.observe(time.perf_counter() - start_time)
+            ARCHIVE_SYNC_DURATION.labels(stage="total").observe(time.perf_counter() - start_time)
             return {
                 "status": "ok",
                 "archive_id": manifest.archive_id,
-                "processed": processed,
+                "processed": len(entries_out),
                 "entries": entries_out,
             }
-        except Exception as exc:
+        except Exception:
             ARCHIVE_SYNC_COUNTER.labels(status="error").inc()
-            ARCHIVE_SYNC_DURATION.observe(time.perf_counter() - start_time)
+            ARCHIVE_SYNC_DURATION.labels(stage="total").observe(time.perf_counter() - start_time)
             raise
 
     async def ingest_text(self, payload: Dict[str, Any]) -> float:
@@ -154,6 +197,65 @@ class TranscriptService:
         await self._publish(payload)
         return payload["ts"]
 
+    async def aclose(self) -> None:
+        """Flush the transcript buffer; shared clients are closed by the registry."""
+
+        self.buffer.close()
+
+    def _batch_concurrency(self) -> int:
+        configured = self.settings.batch_transcribe_concurrency
+        if configured > 0:
+            return configured
+        if self.settings.whisper_use_openai:
+            return max(1, self.settings.openai_transcribe_concurrency)
+        return self.whisper.executor.workers
+
+    def _plan_chunks(
+        self, chunks: list[ManifestChunk], total_frames: int, sample_rate: int
+    ) -> list[tuple[int, ManifestChunk, int, int]]:
+        """Map manifest chunks to ``[start, stop)`` frame ranges, dropping empty ones."""
+
+        plan: list[tuple[int, ManifestChunk, int, int]] = []
+        pointer = 0
+        for idx, chunk in enumerate(chunks):
+            end_pointer = pointer + self._samples_for_chunk(chunk, sample_rate)
+            if idx == len(chunks) - 1 or end_pointer > total_frames:
+                end_pointer = total_frames
+            if end_pointer > pointer:
+                plan.append((idx, chunk, pointer, end_pointer))
+            pointer = max(pointer, end_pointer)
+        return plan
+
+    def _archive_entry(
+        self,
+        archive_id: str,
+        idx: int,
+        chunk: ManifestChunk,
+        archive_path: Path,
+        result: tuple[str, float, float, str, float | None],
+    ) -> Dict[str, Any]:
+        text, _, _, final_lang, confidence = result
+        return {
+            "text": text,
+            "lang": final_lang,
+            "start": _to_epoch(chunk.session_start),
+            "end": _to_epoch(chunk.session_end),
+            "confidence": confidence,
+            "session_id": idx + 1,
+            "archive_id": archive_id,
+            "speech_segments": [
+                {
+                    "start_utc": window.start_utc.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+                    "end_utc": window.end_utc.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+                }
+                for window in chunk.speech_segments
+            ],
+            "source": str(archive_path),
+            "session_start": chunk.session_start.isoformat().replace("+00:00", "Z"),
+            "session_end": chunk.session_end.isoformat().replace("+00:00", "Z"),
+            "chunk_id": chunk.chunk_id,
+        }
+
     def _samples_for_chunk(self, chunk: ManifestChunk, sample_rate: int) -> int:
         duration = (chunk.session_end - chunk.session_start).total_seconds()
         return max(1, int(round(duration * sample_rate)))
@@ -178,38 +280,145 @@ class TranscriptService:
             return
         try:
             await self._redis.publish(payload)
-        except Exception:
+        except Exception as exc:
+            # The record is already in the buffer; only the stream copy is lost.
+            LOGGER.warning("Redis publish failed: %s", exc)
+
+    async def _publish_many(self, payloads: list[Dict[str, Any]]) -> None:
+        if not self._redis or not payloads:
             return
+        try:
+            await self._redis.publish_many(payloads)
+        except Exception as exc:
+            LOGGER.warning("Redis publish of %d records failed: %s", len(payloads), exc)
+
+    async def _transcribe_cached(
+        self,
+        cache_key: str | None,
+        transcribe: Callable[[], Awaitable[TranscriptionResult]],
+    ) -> TranscriptionResult:
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        result = await transcribe()
+        if cache_key:
+            self.cache.put(cache_key, result)
+        return result
+
+    def _engine_id(self) -> str:
+        if self.settings.whisper_use_openai:
+            return f"openai:{self.settings.openai_whisper_model}"
+        if self.settings.whisper_mock_transcriber:
+            return "mock"
+        return (
+            f"whisper:{self.settings.whisper_model}:{self.settings.whisper_device}:"
+            f"{self.settings.whisper_compute_type}"
+        )
+
+    async def _fingerprint_array(
+        self, audio: np.ndarray, sample_rate: int, language: str | None
+    ) -> str | None:
+        if not self.cache.enabled:
+            return None
+        return await asyncio.to_thread(
+            audio_fingerprint, audio, sample_rate, engine=self._engine_id(), language=language
+        )
+
+    async def _fingerprint_file(self, path: Path, language: str | None) -> str | None:
+        if not self.cache.enabled:
+            return None
+        try:
+            audio, sample_rate = await asyncio.to_thread(sf.read, str(path), dtype="float32")
+        except Exception:  # undecodable upload; let the transcriber report it
+            return None
+        return await self._fingerprint_array(audio, sample_rate, language)
 
     async def _transcribe_file(self, path: Path, language: str | None) -> tuple[str, float, float, str, float | None]:
         if self.settings.whisper_use_openai:
-            assert self._openai_client
             with path.open("rb") as handle:
-                transcript = await self._openai_client.audio.transcriptions.create(
-                    model=self.settings.openai_whisper_model,
-                    file=("chunk.wav", handle, "audio/wav"),
-                    response_format="verbose_json",
-                )
-            text = transcript.text or ""
-            segments = transcript.segments or []
-            start = segments[0].get("start", 0.0) if segments else 0.0
-            end = segments[-1].get("end", 0.0) if segments else 0.0
-            lang = transcript.language or language or "auto"
-            return text, float(start), float(end), lang, None
-        return self.whisper.transcribe_path(path, language=language)
+                return await self._transcribe_openai(("chunk.wav", handle, "audio/wav"), language)
+        return await self.whisper.atranscribe_path(path, language=language)
 
     async def _transcribe_array(self, audio: np.ndarray, sample_rate: int) -> tuple[str, float, float, str, float | None]:
         if self.settings.whisper_use_openai:
-            tmp = Path(self.settings.data_dir) / "tmp_array.wav"
-            tmp.parent.mkdir(parents=True, exist_ok=True)
-            sf.write(str(tmp), audio, sample_rate)
-            result = await self._transcribe_file(tmp, None)
-            tmp.unlink(missing_ok=True)
-            return result
-        return self.whisper.transcribe_audio(audio, sample_rate, language=None)
+            payload = await asyncio.to_thread(_encode_flac, audio, sample_rate)
+            return await self._transcribe_openai(("chunk.flac", payload, "audio/flac"), None)
+        return await self.whisper.atranscribe_audio(audio, sample_rate, language=None)
+
+    async def _transcribe_openai(
+        self, upload: tuple[str, Any, str], language: str | None
+    ) -> tuple[str, float, float, str, float | None]:
+        assert self._openai_client
+        async with self._openai_semaphore():
+            transcript = await self._openai_client.audio.transcriptions.create(
+                model=self.settings.openai_whisper_model,
+                file=upload,
+                response_format="verbose_json",
+            )
+        text = transcript.text or ""
+        segments = transcript.segments or []
+        start = segments[0].get("start", 0.0) if segments else 0.0
+        end = segments[-1].get("end", 0.0) if segments else 0.0
+        lang = transcript.language or language or "auto"
+        return text, float(start), float(end), lang, None
+
+    def _openai_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the serving event loop, not import time.
+        if self._openai_limit is None:
+            self._openai_limit = asyncio.Semaphore(max(1, self.settings.openai_transcribe_concurrency))
+        return self._openai_limit
 
 
 def _to_epoch(value: datetime) -> float:
     if value.tzinfo is None:
         value = value.replace(tzinfo=timezone.utc)
     return value.timestamp()
+
+
+async def _save_upload(upload: UploadFile, target: Path, chunk_size: int = 1024 * 1024) -> None:
+    """Stream an upload to disk without holding the whole body in memory."""
+
+    with target.open("wb") as fh:
+        while True:
+            block = await upload.read(chunk_size)
+            if not block:
+                break
+            fh.write(block)
+
+
+async def _gather_or_cancel(coros: List[Awaitable[Any]]) -> List[Any]:
+    """Like ``asyncio.gather`` but cancel the remaining tasks on the first failure.
+
+    Plain ``gather`` leaves the other chunks decoding and calling Whisper or
+    OpenAI after one has failed and the request has already errored out.
+    """
+
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _read_frames(path: Path, start: int, stop: int) -> np.ndarray:
+    """Decode ``[start, stop)`` frames of an audio file as mono float32."""
+
+    with sf.SoundFile(str(path)) as handle:
+        handle.seek(start)
+        audio = handle.read(stop - start, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio
+
+
+def _encode_flac(audio: np.ndarray, sample_rate: int) -> io.BytesIO:
+    """Encode a mono chunk as an in-memory FLAC upload body."""
+
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format="FLAC", subtype="PCM_16")
+    buffer.seek(0)
+    return buffer
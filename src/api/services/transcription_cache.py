@@ -0,0 +1,188 @@
+"""Content-addressed cache of transcription results keyed by decoded audio."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..metrics import TRANSCRIPTION_CACHE_HITS, TRANSCRIPTION_CACHE_MISSES
+
+LOGGER = logging.getLogger("daymind.transcription_cache")
+
+TranscriptionResult = tuple[str, float, float, str, float | None]
+
+
+def audio_fingerprint(audio: np.ndarray, sample_rate: int, *, engine: str, language: str | None) -> str:
+    """Hash PCM samples together with everything that changes the output."""
+
+    pcm = np.ascontiguousarray(audio, dtype=np.float32)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{engine}|{language or 'auto'}|{sample_rate}|{pcm.shape}".encode("utf-8"))
+    digest.update(pcm.tobytes())
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """LRU of transcription results with an optional JSON-on-disk layer.
+
+    Besides the decoded result, each entry remembers the transcript records
+    already persisted for that audio (keyed by upload/chunk identity), so a
+    retried upload returns the stored record instead of writing a duplicate.
+    Only the newest ``max_records`` records are kept per entry (identical
+    audio such as silence recurs under many sessions), and the disk layer
+    holds at most ``max_disk_entries`` files, evicting the least recently
+    used.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        disk_dir: Optional[Path] = None,
+        *,
+        max_records: int = 16,
+        max_disk_entries: int = 16384,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.disk_dir = disk_dir
+        self.max_records = max(1, max_records)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._on_disk: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir is not None:
+            disk_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(disk_dir.glob("*/*.json"), key=_mtime)
+            self._on_disk.update((path.stem, None) for path in files)
+            self._evict_disk_locked()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        text, start, end, lang, confidence = entry["result"]
+        return text, float(start), float(end), lang, confidence
+
+    def put(self, key: str, result: TranscriptionResult) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._entries.get(key) or {"result": list(result), "records": {}}
+            entry["result"] = list(result)
+            self._store_locked(key, entry)
+
+    def persisted_record(self, key: str, record_key: str) -> Optional[Dict[str, Any]]:
+        """Return the record already written for ``record_key``, if any."""
+
+        entry = self._lookup(key, count=False)
+        if entry is None:
+            return None
+        record = entry["records"].get(record_key)
+        if record is not None:
+            TRANSCRIPTION_CACHE_HITS.labels(layer="record").inc()
+        return record
+
+    def remember_record(self, key: str, record_key: str, record: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            records = entry["records"]
+            records.pop(record_key, None)
+            records[record_key] = record
+            while len(records) > self.max_records:
+                del records[next(iter(records))]  # oldest first
+            self._store_locked(key, entry)
+
+    def _lookup(self, key: str, count: bool = True) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if count:
+                    TRANSCRIPTION_CACHE_HITS.labels(layer="memory").inc()
+                return entry
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._on_disk[key] = None
+                self._on_disk.move_to_end(key)
+                self._entries[key] = entry
+                self._evict_locked()
+                if count:
+                    TRANSCRIPTION_CACHE_HITS.labels(layer="disk").inc()
+                return entry
+        if count:
+            TRANSCRIPTION_CACHE_MISSES.inc()
+        return None
+
+    def _store_locked(self, key: str, entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict_locked()
+        self._write_disk(key, entry)
+
+    def _evict_locked(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict_disk_locked(self) -> None:
+        while len(self._on_disk) > self.max_disk_entries:
+            key, _ = self._on_disk.popitem(last=False)
+            path = self._disk_path(key)
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "result" not in entry:
+            return None
+        entry.setdefault("records", {})
+        return entry
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as exc:  # pragma: no cover - disk full / permissions
+            LOGGER.warning("Failed to persist transcription cache entry %s: %s", key, exc)
+            return
+        self._on_disk[key] = None
+        self._on_disk.move_to_end(key)
+        self._evict_disk_locked()
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
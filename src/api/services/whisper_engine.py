@@ -1,11 +1,14 @@
-"""Lazy Whisper (faster-whisper) loader + mock fallback."""
+"""Whisper (faster-whisper) replica pool with optional preload + mock fallback."""
 
 from __future__ import annotations
 
 import logging
+import os
+import queue
 import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, Tuple
 
 import numpy as np
 
@@ -15,44 +18,125 @@ except Exception:  # pragma: no cover
     WhisperModel = None  # type: ignore
 
 from ..settings import APISettings
+from .inference import InferenceExecutor
 
 LOGGER = logging.getLogger("daymind.whisper")
 
 
 class WhisperEngine:
-    """Thin wrapper that loads Whisper on demand and falls back to mock mode."""
+    """Thin wrapper that loads Whisper on demand and falls back to mock mode.
+
+    ``WHISPER_REPLICAS`` model instances are kept in a pool; each inference
+    job checks one out for the duration of the decode, so replicas can run in
+    parallel on the inference executor. The executor runs one worker per
+    replica, so no worker waits on the pool while counted as running and no
+    replica sits idle. With ``WHISPER_PRELOAD`` the pool is loaded and warmed
+    up at startup and :attr:`status` reports ``warming`` until that finishes.
+    """
 
     def __init__(self, settings: APISettings) -> None:
         self.settings = settings
         self._lock = threading.Lock()
-        self._model = None
+        self._replicas = max(1, settings.whisper_replicas)
+        self._pool: "queue.Queue[WhisperModel]" = queue.Queue()
+        self._loaded = False
         self._mock = settings.whisper_mock_transcriber or WhisperModel is None
+        self._status = "skip" if self._mock else ("warming" if settings.whisper_preload else "ok")
+        self.executor = InferenceExecutor(
+            self._executor_workers(),
+            settings.whisper_inference_queue,
+            retry_after=settings.whisper_retry_after_sec,
+        )
         if self._mock:
             LOGGER.warning(
                 "Whisper mock mode enabled (set WHISPER_USE_MOCK=0 and configure "
                 "WHISPER_MODEL to enable real transcription)."
             )
 
-    def _load_model(self) -> WhisperModel:
+    def _executor_workers(self) -> int:
+        workers = self.settings.whisper_inference_workers
+        if self._mock:
+            return workers if workers > 0 else self._replicas
+        if workers > 0 and workers != self._replicas:
+            LOGGER.warning(
+                "WHISPER_INFERENCE_WORKERS=%d ignored: running one inference worker "
+                "per replica (WHISPER_REPLICAS=%d).",
+                workers,
+                self._replicas,
+            )
+        return self._replicas
+
+    @property
+    def status(self) -> str:
+        """``ok`` when serving, ``warming`` during preload, ``skip`` in mock mode."""
+
+        return self._status
+
+    @property
+    def ready(self) -> bool:
+        return self._status in {"ok", "skip"}
+
+    def warmup(self) -> None:
+        """Load every replica and run a short synthetic decode on each."""
+
+        if self._mock:
+            return
+        try:
+            self._ensure_loaded()
+            silence = np.zeros(16000, dtype=np.float32)
+            for _ in range(self._replicas):
+                model = self._pool.get()
+                try:
+                    segments, _ = model.transcribe(audio=silence, beam_size=1)
+                    list(segments)
+                finally:
+                    self._pool.put(model)
+        except Exception:  # pragma: no cover - hardware/env dep
+            self._status = "error"
+            raise
+        self._status = "ok"
+        LOGGER.info("Whisper warmup finished (%d replica(s))", self._replicas)
+
+    def _ensure_loaded(self) -> None:
         if self._mock:
             raise RuntimeError("Mock mode does not load real Whisper models")
-        if self._model is None:
-            with self._lock:
-                if self._model is None:
-                    try:
-                        self._model = WhisperModel(
-                            self.settings.whisper_model,
-                            device=self.settings.whisper_device,
-                            compute_type=self.settings.whisper_compute_type,
-                        )
-                    except Exception as exc:  # pragma: no cover - hardware/env dep
-                        LOGGER.error(
-                            "Failed to load Whisper model '%s': %s",
-                            self.settings.whisper_model,
-                            exc,
-                        )
-                        raise
-        return self._model
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for _ in range(self._replicas):
+                self._pool.put(self._build_model())
+            self._loaded = True
+
+    def _build_model(self) -> WhisperModel:
+        cpu_threads = self.settings.whisper_cpu_threads
+        if cpu_threads <= 0 and self.settings.whisper_device == "cpu":
+            cpu_threads = max(1, (os.cpu_count() or 1) // self._replicas)
+        try:
+            return WhisperModel(
+                self.settings.whisper_model,
+                device=self.settings.whisper_device,
+                compute_type=self.settings.whisper_compute_type,
+                cpu_threads=max(0, cpu_threads),
+                num_workers=max(1, self.settings.whisper_num_workers),
+            )
+        except Exception as exc:  # pragma: no cover - hardware/env dep
+            LOGGER.error(
+                "Failed to load Whisper model '%s': %s",
+                self.settings.whisper_model,
+                exc,
+            )
+            raise
+
+    @contextmanager
+    def _checkout(self) -> Iterator[WhisperModel]:
+        self._ensure_loaded()
+        model = self._pool.get()
+        try:
+            yield model
+        finally:
+            self._pool.put(model)
 
     def transcribe_path(
         self, path: Path, language: str | None = None
@@ -61,9 +145,9 @@ class WhisperEngine:
             text = f"[mock transcript for {path.name}]"
             duration = 0.0
             return text, 0.0, duration, language or "auto", None
-        model = self._load_model()
-        segments, info = model.transcribe(str(path), language=language, beam_size=5)
-        return _summarize_segments(segments, info)
+        with self._checkout() as model:
+            segments, info = model.transcribe(str(path), language=language, beam_size=5)
+            return _summarize_segments(segments, info)
 
     def transcribe_audio(
         self, audio: np.ndarray, sample_rate: int, language: str | None = None
@@ -72,11 +156,28 @@ class WhisperEngine:
             duration = len(audio) / float(sample_rate)
             text = f"[mock transcript {len(audio)} samples]"
             return text, 0.0, duration, language or "auto", None
-        model = self._load_model()
-        segments, info = model.transcribe(
-            audio=audio, language=language, beam_size=5, vad_filter=True
-        )
-        return _summarize_segments(segments, info)
+        with self._checkout() as model:
+            segments, info = model.transcribe(
+                audio=audio, language=language, beam_size=5, vad_filter=True
+            )
+            return _summarize_segments(segments, info)
+
+    async def atranscribe_path(
+        self, path: Path, language: str | None = None
+    ) -> Tuple[str, float, float, str, float | None]:
+        """Run :meth:`transcribe_path` on the inference executor."""
+
+        return await self.executor.run(self.transcribe_path, path, language=language)
+
+    async def atranscribe_audio(
+        self, audio: np.ndarray, sample_rate: int, language: str | None = None
+    ) -> Tuple[str, float, float, str, float | None]:
+        """Run :meth:`transcribe_audio` on the inference executor."""
+
+        return await self.executor.run(self.transcribe_audio, audio, sample_rate, language=language)
+
+    def close(self) -> None:
+        self.executor.shutdown()
 
 
 def _summarize_segments(segments: Iterable, info) -> Tuple[str, float, float, str, float | None]:
@@ -16,6 +16,9 @@ class APISettings(BaseModel):
     transcript_path: str = Field(
         default=os.getenv("TRANSCRIPT_PATH", "data/transcripts.jsonl")
     )
+    transcript_max_mb: int = Field(default=int(os.getenv("BUFFER_MAX_MB", "32")))
+    transcript_segment_mb: int = Field(default=int(os.getenv("BUFFER_SEGMENT_MB", "0")))
+    transcript_flush_every: int = Field(default=int(os.getenv("BUFFER_FLUSH_EVERY", "32")))
     ledger_path: str = Field(default=os.getenv("LEDGER_PATH", "data/ledger.jsonl"))
     api_keys: List[str] = Field(default_factory=lambda: _split_keys())
     api_key_store_path: str = Field(
@@ -24,12 +27,25 @@ class APISettings(BaseModel):
     api_rate_limit_per_minute: int = Field(
         default=int(os.getenv("API_RATE_LIMIT_PER_MINUTE", "120"))
     )
+    api_rate_limit_burst: int = Field(default=int(os.getenv("API_RATE_LIMIT_BURST", "0")))
+    api_usage_flush_sec: float = Field(default=float(os.getenv("API_USAGE_FLUSH_SEC", "5")))
+    api_key_reload_sec: float = Field(default=float(os.getenv("API_KEY_RELOAD_SEC", "2")))
+    api_key_negative_ttl_sec: float = Field(default=float(os.getenv("API_KEY_NEGATIVE_TTL_SEC", "30")))
     ip_rate_limit_per_minute: int = Field(
         default=int(os.getenv("IP_RATE_LIMIT_PER_MINUTE", "240"))
     )
+    ip_rate_limit_max_entries: int = Field(
+        default=int(os.getenv("IP_RATE_LIMIT_MAX_ENTRIES", "100000"))
+    )
+    ip_rate_limit_shared: bool = Field(
+        default=os.getenv("IP_RATE_LIMIT_SHARED", "false").lower() in {"1", "true", "yes"}
+    )
     redis_url: str | None = Field(default=os.getenv("REDIS_URL"))
     redis_stream: str = Field(default=os.getenv("REDIS_STREAM", "daymind:transcripts"))
+    redis_max_connections: int = Field(default=int(os.getenv("REDIS_MAX_CONNECTIONS", "20")))
+    redis_pool_timeout_sec: float = Field(default=float(os.getenv("REDIS_POOL_TIMEOUT_SEC", "5")))
     summary_dir: str = Field(default=os.getenv("SUMMARY_DIR", "data"))
+    summary_lock_ttl_sec: float = Field(default=float(os.getenv("SUMMARY_LOCK_TTL_SEC", "600")))
     session_gap_sec: float = Field(float(os.getenv("SESSION_GAP_SEC", "45")))
     finance_ledger_path: str = Field(default=os.getenv("FINANCE_LEDGER_PATH", "finance/ledger.beancount"))
     finance_default_currency: str = Field(default=os.getenv("FINANCE_DEFAULT_CURRENCY", "CZK"))
@@ -37,6 +53,7 @@ class APISettings(BaseModel):
     fava_port: int = Field(default=int(os.getenv("FAVA_PORT", "5000")))
     fava_base_url: str | None = Field(default=os.getenv("FAVA_BASE_URL"))
     openai_api_key: str | None = Field(default=os.getenv("OPENAI_API_KEY"))
+    openai_max_connections: int = Field(default=int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")))
     openai_health_model: str | None = Field(default=os.getenv("OPENAI_HEALTH_MODEL", "gpt-4o-mini"))
     billing_mode: str = Field(default=os.getenv("BILLING_MODE", "local"))
     stripe_secret_key: str | None = Field(default=os.getenv("STRIPE_SECRET_KEY"))
@@ -52,12 +69,42 @@ class APISettings(BaseModel):
     whisper_mock_transcriber: bool = Field(
         default=os.getenv("WHISPER_USE_MOCK", "false").lower() in {"1", "true", "yes"}
     )
+    whisper_preload: bool = Field(
+        default=os.getenv("WHISPER_PRELOAD", "false").lower() in {"1", "true", "yes"}
+    )
+    whisper_replicas: int = Field(default=int(os.getenv("WHISPER_REPLICAS", "1")))
+    whisper_cpu_threads: int = Field(default=int(os.getenv("WHISPER_CPU_THREADS", "0")))
+    whisper_num_workers: int = Field(default=int(os.getenv("WHISPER_NUM_WORKERS", "1")))
+    whisper_inference_workers: int = Field(
+        default=int(os.getenv("WHISPER_INFERENCE_WORKERS", "0"))
+    )
+    whisper_inference_queue: int = Field(
+        default=int(os.getenv("WHISPER_INFERENCE_QUEUE", "8"))
+    )
+    whisper_retry_after_sec: int = Field(
+        default=int(os.getenv("WHISPER_RETRY_AFTER_SEC", "5"))
+    )
+    batch_transcribe_concurrency: int = Field(
+        default=int(os.getenv("BATCH_TRANSCRIBE_CONCURRENCY", "0"))
+    )
+    transcription_cache_entries: int = Field(
+        default=int(os.getenv("TRANSCRIPTION_CACHE_ENTRIES", "1024"))
+    )
+    transcription_cache_disk: bool = Field(
+        default=os.getenv("TRANSCRIPTION_CACHE_DISK", "false").lower() in {"1", "true", "yes"}
+    )
+    transcription_cache_disk_entries: int = Field(
+        default=int(os.getenv("TRANSCRIPTION_CACHE_DISK_ENTRIES", "16384"))
+    )
     whisper_use_openai: bool = Field(
         default=os.getenv("WHISPER_USE_OPENAI", "false").lower() in {"1", "true", "yes"}
     )
     openai_whisper_model: str = Field(
         default=os.getenv("OPENAI_WHISPER_MODEL", "gpt-4o-mini-transcribe")
     )
+    openai_transcribe_concurrency: int = Field(
+        default=int(os.getenv("OPENAI_TRANSCRIBE_CONCURRENCY", "4"))
+    )
 
 
 def _split_keys() -> List[str]:
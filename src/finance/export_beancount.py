@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import argparse
 import glob
+import hashlib
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 from .config import FinanceConfig
 
@@ -19,20 +21,7 @@ class ExportStats:
     total: int = 0
     written: int = 0
     skipped: int = 0
-
-
-def _load_jsonl(path: Path) -> Iterable[dict]:
-    if not path.exists():
-        return []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    mode: str = "full"
 
 
 def _iter_input_paths(input_args: Sequence[str]) -> List[Path]:
@@ -144,14 +133,46 @@ def export_beancount(
     output: str,
     config: FinanceConfig,
     since: str | None = None,
+    full_rebuild: bool = False,
 ) -> ExportStats:
+    """Export ``inputs`` into ``output``, appending only entries added since the last run.
+
+    Progress is kept in ``<output>.state.json``: the byte offset consumed in
+    each input (with a digest of the bytes just before it), the accounts seen
+    so far, and a fingerprint of the export settings. ``open`` directives live
+    in ``<stem>.accounts.beancount``, which the main file includes and which
+    is rewritten (it is small) whenever a new account shows up. The whole
+    ledger is regenerated when ``full_rebuild`` is set, when there is no
+    usable state, when the settings changed, when an input was truncated,
+    replaced or rewritten in place, or when the output was edited since the
+    last export.
+    """
+
     stats = ExportStats()
-    input_paths = _iter_input_paths(inputs)
+    out_path = Path(output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path = _state_path(out_path)
+    accounts_path = _accounts_path(out_path)
+    fingerprint = _config_fingerprint(config, since)
+
+    paths = _iter_input_paths(inputs)
+    state = None if full_rebuild else _load_state(state_path)
+    if state is not None and not _state_matches(state, out_path, fingerprint):
+        state = None
+    if state is not None and not _inputs_unchanged(state, paths):
+        state = None  # an input was truncated/rewritten: earlier transactions may be gone
+    stats.mode = "incremental" if state is not None else "full"
+    offsets: Dict[str, dict] = dict(state["inputs"]) if state else {}
+    accounts: set[str] = set(state["accounts"]) if state else set()
+    known_accounts = set(accounts)
     transactions: list[str] = []
-    accounts: set[str] = set()
 
-    for path in input_paths:
-        for entry in _load_jsonl(path):
+    for path in paths:
+        previous = offsets.get(str(path.resolve()))
+        start = int(previous["offset"]) if previous else 0
+        end = start
+        # A full export takes a complete final line even without its newline.
+        for entry, end in _load_jsonl_from(path, start, include_partial=stats.mode == "full"):
             stats.total += 1
             if not _since_filter(entry, since):
                 continue
@@ -163,22 +184,153 @@ def export_beancount(
             transactions.append(txn_text)
             accounts.update(used_accounts)
             stats.written += 1
+        if path.exists():
+            offsets[str(path.resolve())] = {
+                "offset": end,
+                "inode": path.stat().st_ino,
+                "tail": _tail_digest(path, end),
+            }
+
+    if stats.mode == "full" or accounts != known_accounts:
+        open_lines = [f"1970-01-01 open {acc}" for acc in sorted(accounts)]
+        _atomic_write(accounts_path, "\n".join(open_lines) + "\n" if open_lines else "")
+
+    if stats.mode == "full":
+        header = [
+            "; Generated by DayMind finance exporter",
+            f'option "title" "DayMind Finance Ledger"',
+            f'option "operating_currency" "{config.default_currency}"',
+            f'include "{accounts_path.name}"',
+            "",
+        ]
+        body = "\n\n".join(transactions)
+        _atomic_write(out_path, "\n".join(header + [body, ""]).strip() + "\n")
+    elif transactions:
+        with out_path.open("a", encoding="utf-8") as handle:
+            handle.write("\n" + "\n\n".join(transactions) + "\n")
+
+    _atomic_write(
+        state_path,
+        json.dumps(
+            {
+                "version": _STATE_VERSION,
+                "fingerprint": fingerprint,
+                "inputs": offsets,
+                "accounts": sorted(accounts),
+                "output_size": out_path.stat().st_size,
+            },
+            ensure_ascii=False,
+        ),
+    )
+    return stats
 
-    out_path = Path(output)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    header = [
-        "; Generated by DayMind finance exporter",
-        f'option "title" "DayMind Finance Ledger"',
-        f'option "operating_currency" "{config.default_currency}"',
-        "",
-    ]
+_STATE_VERSION = 2
+_TAIL_BYTES = 4096
 
-    open_lines = [f"1970-01-01 open {acc}" for acc in sorted(accounts)]
 
-    body = "\n\n".join(transactions)
-    out_path.write_text("\n".join(header + open_lines + ["", body, ""]).strip() + "\n", encoding="utf-8")
-    return stats
+def _state_path(out_path: Path) -> Path:
+    return out_path.with_name(out_path.name + ".state.json")
+
+
+def _accounts_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}.accounts{out_path.suffix}")
+
+
+def _config_fingerprint(config: FinanceConfig, since: str | None) -> str:
+    payload = json.dumps({"config": asdict(config), "since": since}, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_state(path: Path) -> Optional[dict]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != _STATE_VERSION:
+        return None
+    return state
+
+
+def _state_matches(state: dict, out_path: Path, fingerprint: str) -> bool:
+    if state.get("fingerprint") != fingerprint:
+        return False
+    try:
+        return out_path.stat().st_size == state.get("output_size")
+    except FileNotFoundError:
+        return False
+
+
+def _inputs_unchanged(state: dict, paths: Sequence[Path]) -> bool:
+    for path in paths:
+        previous = state["inputs"].get(str(path.resolve()))
+        if previous and not _same_file(path, previous):
+            return False
+    return True
+
+
+def _same_file(path: Path, previous: dict) -> bool:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return False
+    offset = int(previous.get("offset", 0))
+    if stat.st_ino != previous.get("inode") or stat.st_size < offset:
+        return False
+    # Rewritten in place (same inode, e.g. open(..., "w")): the bytes just
+    # before the consumed offset no longer match.
+    return _tail_digest(path, offset) == previous.get("tail")
+
+
+def _tail_digest(path: Path, offset: int) -> str:
+    """Digest of the last ``_TAIL_BYTES`` consumed bytes of ``path``."""
+
+    start = max(0, offset - _TAIL_BYTES)
+    with path.open("rb") as handle:
+        handle.seek(start)
+        data = handle.read(offset - start)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _load_jsonl_from(
+    path: Path, start: int, include_partial: bool = False
+) -> Iterator[Tuple[dict, int]]:
+    """Yield ``(entry, end_offset)`` for complete lines after byte ``start``.
+
+    A final line without ``\\n`` is normally left for the next run, as it may
+    still be being written. With ``include_partial`` it is taken when it
+    already parses as a JSON object (hand-written or truncated inputs).
+    """
+
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        handle.seek(start)
+        offset = start
+        for raw in handle:
+            entry = _parse_entry(raw)
+            if not raw.endswith(b"\n") and not (include_partial and entry is not None):
+                break  # partial line still being written; pick it up next run
+            offset += len(raw)
+            if entry is not None:
+                yield entry, offset
+
+
+def _parse_entry(raw: bytes) -> Optional[dict]:
+    line = raw.strip()
+    if not line:
+        return None
+    try:
+        entry = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
 
 
 def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -189,6 +341,11 @@ def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--account-cash", default=None, help="Override cash/balancing account.")
     parser.add_argument("--map-file", default=None, help="Optional YAML mapping category->account.")
     parser.add_argument("--since", default=None, help="Filter entries on/after YYYY-MM-DD.")
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Ignore the incremental state and regenerate the whole ledger.",
+    )
     return parser.parse_args(argv)
 
 
@@ -199,10 +356,16 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         cash_account=args.account_cash,
         map_file=args.map_file,
     )
-    stats = export_beancount(inputs=args.input, output=args.out, config=config, since=args.since)
+    stats = export_beancount(
+        inputs=args.input,
+        output=args.out,
+        config=config,
+        since=args.since,
+        full_rebuild=args.full_rebuild,
+    )
     print(
         f"[Finance] Processed {stats.total} entries → {stats.written} transactions "
-        f"(skipped: {stats.skipped}). Output: {args.out}"
+        f"(skipped: {stats.skipped}, {stats.mode}). Output: {args.out}"
     )
     return 0
 
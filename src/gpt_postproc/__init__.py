@@ -3,5 +3,12 @@
 from .config import GPTConfig
 from .processor import process_transcripts
 from .daily_summary import run_daily_summaries, summarize_day
+from .stream_worker import run_stream_worker
 
-__all__ = ["GPTConfig", "process_transcripts", "run_daily_summaries", "summarize_day"]
+__all__ = [
+    "GPTConfig",
+    "process_transcripts",
+    "run_daily_summaries",
+    "run_stream_worker",
+    "summarize_day",
+]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import socket
 from pydantic import BaseModel
 
 
@@ -15,3 +16,27 @@ class GPTConfig(BaseModel):
     ledger_path: str = os.getenv("LEDGER_PATH", "data/ledger.jsonl")
     temperature: float = float(os.getenv("GPT_TEMP", "0.2"))
     session_gap_sec: float = float(os.getenv("SESSION_GAP_SEC", "45"))
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    redis_stream: str = os.getenv("REDIS_STREAM", "daymind:transcripts")
+    consumer_group: str = os.getenv("GPT_CONSUMER_GROUP", "daymind:gpt")
+    # Stable across restarts so a restarted worker re-reads its own pending entries.
+    consumer_name: str = os.getenv("GPT_CONSUMER_NAME") or socket.gethostname()
+    stream_batch_size: int = int(os.getenv("GPT_STREAM_BATCH", "20"))
+    stream_block_ms: int = int(os.getenv("GPT_STREAM_BLOCK_MS", "5000"))
+    stream_claim_idle_ms: int = int(os.getenv("GPT_STREAM_CLAIM_IDLE_MS", "60000"))
+    stream_claim_interval_sec: float = float(os.getenv("GPT_STREAM_CLAIM_INTERVAL_SEC", "30"))
+    max_concurrency: int = int(os.getenv("GPT_CONCURRENCY", "4"))
+    requests_per_min: float = float(os.getenv("GPT_RPM", "500"))
+    tokens_per_min: float = float(os.getenv("GPT_TPM", "200000"))
+    max_retries: int = int(os.getenv("GPT_MAX_RETRIES", "5"))
+    retry_base_sec: float = float(os.getenv("GPT_RETRY_BASE_SEC", "1.0"))
+    retry_max_sec: float = float(os.getenv("GPT_RETRY_MAX_SEC", "30"))
+    batch_mode: str = os.getenv("GPT_BATCH_MODE", "off")
+    batch_max_tokens: int = int(os.getenv("GPT_BATCH_MAX_TOKENS", "4000"))
+    batch_max_segments: int = int(os.getenv("GPT_BATCH_MAX_SEGMENTS", "40"))
+    cache_mode: str = os.getenv("GPT_CACHE_MODE", "off")
+    cache_path: str = os.getenv("GPT_CACHE_PATH", "data/gpt_cache.sqlite3")
+    cache_ttl_sec: float = float(os.getenv("GPT_CACHE_TTL_SEC", "0"))
+    cache_max_entries: int = int(os.getenv("GPT_CACHE_MAX_ENTRIES", "50000"))
+    summary_concurrency: int = int(os.getenv("SUMMARY_CONCURRENCY", "3"))
+    summary_chunk_tokens: int = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
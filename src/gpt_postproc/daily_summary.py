@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
 import re
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -13,6 +15,8 @@ from openai import AsyncOpenAI
 
 from .config import GPTConfig
 from .ledger_store import LedgerStore
+from .rate_limit import RateLimiter, call_with_retry, estimate_tokens, truncate_to_tokens
+from .response_cache import get_response_cache, prompt_key
 
 SUMMARY_PROMPT = (
     "Z těchto transkriptů vytvoř:\n"
@@ -20,6 +24,26 @@ SUMMARY_PROMPT = (
     "2. Textové shrnutí dne (v češtině).\n"
     "Výstup: nejdříve JSON blok, pak --- a text shrnutí.\n"
 )
+PARTIAL_PROMPT = (
+    "Toto je část transkriptů jednoho dne. Vypiš:\n"
+    "1. JSON seznam výdajů, úkolů a poznámek z této části.\n"
+    "2. Stručné textové shrnutí této části (v češtině).\n"
+    "Výstup: nejdříve JSON blok, pak --- a text shrnutí.\n"
+)
+REDUCE_PROMPT = (
+    "Z těchto dílčích shrnutí jednoho dne vytvoř:\n"
+    "1. Sloučený strukturovaný JSON (výdaje, úkoly, poznámky) – každý záznam jako objekt.\n"
+    "2. Textové shrnutí celého dne (v češtině).\n"
+    "Výstup: nejdříve JSON blok, pak --- a text shrnutí.\n"
+)
+MERGE_PROMPT = (
+    "Toto je několik dílčích shrnutí jedné části dne. Slouč je do:\n"
+    "1. Sloučeného JSON seznamu výdajů, úkolů a poznámek (bez duplicit).\n"
+    "2. Stručného textového shrnutí této části (v češtině).\n"
+    "Výstup: nejdříve JSON blok, pak --- a text shrnutí.\n"
+)
+SUMMARY_TEMPERATURE = 0.2
+SUMMARY_STATE_FILE = "summary_state.json"
 
 
 async def summarize_day(
@@ -29,19 +53,30 @@ async def summarize_day(
     cfg: Optional[GPTConfig] = None,
     client: Optional[AsyncOpenAI] = None,
     output_dir: Optional[Path] = None,
+    limiter: Optional[RateLimiter] = None,
+    partials: Optional[List[Dict[str, Any]]] = None,
 ) -> Tuple[Path, Path]:
+    """Summarize one day's ledger entries into ``ledger_<day>.jsonl`` and ``summary_<day>.md``.
+
+    Days whose transcript exceeds ``cfg.summary_chunk_tokens`` are summarized
+    map-reduce style: each chunk gets a partial summary, and the partials are
+    merged (hierarchically, if they are still too long) into the final one.
+    ``partials`` holds map results from a previous run; chunks that are
+    unchanged reuse them and the list is updated in place.
+    """
+
     cfg = cfg or GPTConfig()
     client = client or AsyncOpenAI(api_key=cfg.api_key)
     out_dir = output_dir or Path("data")
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    content = "\n".join(f"[{e.get('session_id', '?')}] {e.get('input', '')}" for e in entries)
-    response = await client.chat.completions.create(
-        model=cfg.model,
-        messages=[{"role": "user", "content": SUMMARY_PROMPT + content}],
-        temperature=0.2,
-    )
-    text = response.choices[0].message.content or ""
+    lines = [f"[{e.get('session_id', '?')}] {e.get('input', '')}" for e in entries]
+    chunks = _chunk_lines(lines, cfg.summary_chunk_tokens)
+    if len(chunks) <= 1:
+        text = await _complete(client, cfg, SUMMARY_PROMPT + "\n".join(lines), limiter)
+    else:
+        texts = await _map_chunks(client, cfg, chunks, limiter, partials)
+        text = await _reduce_partials(client, cfg, texts, limiter)
     json_part, separator, summary_part = text.partition("---")
 
     parsed = safe_json_parse(json_part)
@@ -61,17 +96,217 @@ async def summarize_day(
 
 
 async def run_daily_summaries(
-    *, cfg: Optional[GPTConfig] = None, client: Optional[AsyncOpenAI] = None
-) -> None:
+    *,
+    cfg: Optional[GPTConfig] = None,
+    client: Optional[AsyncOpenAI] = None,
+    output_dir: Optional[Path] = None,
+    full_rebuild: bool = False,
+) -> List[str]:
+    """Summarize every day that gained ledger entries since the last run.
+
+    A per-day watermark (bytes of the day's ledger ranges and where they end)
+    is kept in ``summary_state.json`` next to the outputs; days whose
+    watermark is unchanged and whose summary still exists are skipped unless
+    ``full_rebuild`` is set. Changed days run concurrently, up to
+    ``cfg.summary_concurrency`` at once, sharing one RPM/TPM limiter.
+
+    Returns the days that were (re)summarized.
+    """
+
     cfg = cfg or GPTConfig()
+    client = client or AsyncOpenAI(api_key=cfg.api_key)
+    out_dir = output_dir or Path("data")
+    out_dir.mkdir(parents=True, exist_ok=True)
     store = LedgerStore(cfg.ledger_path)
-    groups = store.group_by_day()
-    if not groups:
+    days = store.days()
+    if not days:
         print("[Summary] No ledger entries to summarize.")
-        return
+        return []
+
+    state_path = out_dir / SUMMARY_STATE_FILE
+    state = {} if full_rebuild else _load_state(state_path)
+    pending = []
+    for day in days:
+        watermark = _watermark(store.index.ranges(day))
+        previous = state.get(day, {})
+        if previous.get("watermark") == watermark and (out_dir / f"summary_{day}.md").exists():
+            continue
+        pending.append((day, watermark, previous.get("partials", [])))
+    if not pending:
+        print("[Summary] All daily summaries are up to date.")
+        return []
+
+    limiter = RateLimiter(cfg.requests_per_min, cfg.tokens_per_min)
+    semaphore = asyncio.Semaphore(max(1, cfg.summary_concurrency))
+
+    async def run(day: str, watermark: List[int], partials: List[Dict[str, Any]]) -> None:
+        async with semaphore:
+            entries = store.entries_for_day(day)
+            await summarize_day(
+                day,
+                entries,
+                cfg=cfg,
+                client=client,
+                output_dir=out_dir,
+                limiter=limiter,
+                partials=partials,
+            )
+            state[day] = {"watermark": watermark, "partials": partials}
+            _save_state(state_path, state)
+
+    await asyncio.gather(*(run(*item) for item in pending))
+    print(f"[Summary] Updated {len(pending)} of {len(days)} days.")
+    return [day for day, _, _ in pending]
+
+
+async def _map_chunks(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    chunks: List[List[str]],
+    limiter: Optional[RateLimiter],
+    partials: Optional[List[Dict[str, Any]]],
+) -> List[str]:
+    """Partial-summarize each chunk, reusing stored results for unchanged ones."""
 
-    for day in sorted(groups.keys()):
-        await summarize_day(day, groups[day], cfg=cfg, client=client)
+    previous = list(partials or [])
+
+    async def summarize_chunk(index: int, chunk: List[str]) -> Dict[str, Any]:
+        digest = _chunk_digest(chunk)
+        if index < len(previous) and previous[index].get("digest") == digest:
+            return previous[index]
+        text = await _complete(client, cfg, PARTIAL_PROMPT + "\n".join(chunk), limiter)
+        return {"digest": digest, "text": text}
+
+    results = await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+    if partials is not None:
+        partials[:] = results
+    return [result["text"] for result in results]
+
+
+async def _reduce_partials(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    texts: List[str],
+    limiter: Optional[RateLimiter],
+) -> str:
+    """Merge partial summaries, adding reduce levels until they fit one prompt.
+
+    Intermediate levels merge summaries with ``MERGE_PROMPT`` (``PARTIAL_PROMPT``
+    describes raw transcripts); the last one uses ``REDUCE_PROMPT``.
+
+    Partials that do not shrink would stall the levels, so a level that
+    cannot pack at least two texts per group first cuts every text to half
+    the chunk budget. Each level therefore at least halves the number of
+    texts, and the final prompt stays within ``summary_chunk_tokens``.
+    """
+
+    budget = max(2, cfg.summary_chunk_tokens)  # two halved texts must fit one group
+    texts = [truncate_to_tokens(text, budget) for text in texts]
+    groups = _chunk_lines(texts, budget)
+    while len(groups) > 1:
+        if len(groups) >= len(texts):
+            texts = [truncate_to_tokens(text, budget // 2) for text in texts]
+            groups = _chunk_lines(texts, budget)
+        texts = list(
+            await asyncio.gather(
+                *(_complete(client, cfg, MERGE_PROMPT + "\n\n".join(g), limiter) for g in groups)
+            )
+        )
+        texts = [truncate_to_tokens(text, budget) for text in texts]
+        groups = _chunk_lines(texts, budget)
+    return await _complete(client, cfg, REDUCE_PROMPT + "\n\n".join(texts), limiter)
+
+
+def _chunk_lines(lines: List[str], max_tokens: int) -> List[List[str]]:
+    """Split ``lines`` greedily into chunks of at most ``max_tokens`` each.
+
+    Chunks are cut from the start of the day, so appending entries only ever
+    changes the last chunk and earlier partial summaries stay reusable.
+    """
+
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    budget = 0
+    for line in lines:
+        cost = estimate_tokens(line, completion_tokens=0)
+        if current and budget + cost > max_tokens:
+            chunks.append(current)
+            current, budget = [], 0
+        current.append(line)
+        budget += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _chunk_digest(chunk: List[str]) -> str:
+    return hashlib.blake2b("\n".join(chunk).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _watermark(ranges: List[Tuple[int, int]]) -> List[int]:
+    return [sum(end - start for start, end in ranges), ranges[-1][1] if ranges else 0]
+
+
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _save_state(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def _complete(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    prompt: str,
+    limiter: Optional[RateLimiter] = None,
+) -> str:
+    """Run a summary prompt, going through the response cache when enabled."""
+
+    cache = get_response_cache(cfg)
+    key = prompt_key(cfg.model, SUMMARY_TEMPERATURE, prompt)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    reserved = estimate_tokens(prompt, completion_tokens=1024)
+    used: Optional[int] = None
+
+    async def attempt() -> Any:
+        if limiter is not None:
+            await limiter.acquire(reserved)
+        try:
+            return await client.chat.completions.create(
+                model=cfg.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=SUMMARY_TEMPERATURE,
+            )
+        except BaseException:
+            if limiter is not None:
+                limiter.settle(reserved, 0)  # refund the failed attempt's reservation
+            raise
+
+    try:
+        response = await call_with_retry(
+            attempt,
+            max_retries=cfg.max_retries,
+            base_delay=cfg.retry_base_sec,
+            max_delay=cfg.retry_max_sec,
+        )
+        used = getattr(getattr(response, "usage", None), "total_tokens", None)
+    finally:
+        if limiter is not None:
+            limiter.settle(reserved, used)
+    text = response.choices[0].message.content or ""
+    if cache is not None:
+        cache.put(key, text, used)
+    return text
 
 
 def safe_json_parse(payload: str) -> List[Dict[str, Any]]:
@@ -6,44 +6,58 @@ import json
 import os
 import time
 from collections import defaultdict
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.stt_core.day_index import DayIndex, record_day
 
 from .config import GPTConfig
 
 
 class LedgerStore:
-    """Persist GPT outputs in a JSONL ledger."""
+    """Persist GPT outputs in a JSONL ledger with a day -> byte-range index."""
 
     def __init__(self, path: Optional[str] = None) -> None:
         cfg = GPTConfig() if path is None else None
         self.path = path or cfg.ledger_path  # type: ignore[assignment]
         directory = os.path.dirname(self.path) or "."
         os.makedirs(directory, exist_ok=True)
+        self._index: DayIndex | None = None
+
+    @property
+    def index(self) -> DayIndex:
+        if self._index is None:
+            self._index = DayIndex(self.path)
+        return self._index
 
     def append(self, record: Dict[str, Any]) -> None:
         record.setdefault("ts", time.time())
-        with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.path, "ab") as fh:
+            start = fh.tell()
+            fh.write(line)
+        self.index.add(record_day(record), start, start + len(line))
+
+    def close(self) -> None:
+        """Persist the day index; appends only save it every few hundred records."""
+
+        if self._index is not None:
+            self._index.flush()
+
+    def days(self) -> List[str]:
+        if not os.path.exists(self.path):
+            return []
+        return self.index.days()
+
+    def iter_day(self, day: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return iter(())
+        return self.index.iter_day(day)
+
+    def entries_for_day(self, day: str) -> List[Dict[str, Any]]:
+        return list(self.iter_day(day))
 
     def group_by_day(self) -> Dict[str, List[Dict[str, Any]]]:
         groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        if not os.path.exists(self.path):
-            return groups
-
-        with open(self.path, "r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                ts = data.get("start") or data.get("ts") or time.time()
-                try:
-                    day = datetime.fromtimestamp(float(ts)).strftime("%Y-%m-%d")
-                except (ValueError, TypeError):
-                    day = datetime.fromtimestamp(time.time()).strftime("%Y-%m-%d")
-                groups[day].append(data)
+        for day in self.days():
+            groups[day].extend(self.iter_day(day))
         return groups
@@ -4,18 +4,34 @@ from __future__ import annotations
 
 import asyncio
 import json
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from openai import AsyncOpenAI
 
+from src.stt_core.buffer_store import tail_records
+
 from .config import GPTConfig
 from .ledger_store import LedgerStore
+from .response_cache import ReplayCacheMiss, get_response_cache, prompt_key
+from .rate_limit import RateLimiter, call_with_retry, estimate_tokens
 
 PROMPT_TEMPLATE = (
     "Z textu extrahuj všechny výdaje, poznámky, nebo úkoly ve formátu JSON. Text:\n{body}"
 )
 
+BATCH_PROMPT_TEMPLATE = (
+    "Session {session_id}: Pro každý očíslovaný segment níže vyhledej příkazy, "
+    "poznámky, úkoly nebo výdaje. Odpověz pouze JSON objektem "
+    '{{"segments": [{{"index": <číslo segmentu>, "output": {{...}}}}]}} '
+    "s jedním záznamem pro každý segment.\n"
+)
+
+# Completion budget reserved per segment when sizing batches.
+_BATCH_COMPLETION_TOKENS = 128
+
 
 async def process_transcripts(
     *,
@@ -23,10 +39,16 @@ async def process_transcripts(
     cfg: Optional[GPTConfig] = None,
     client: Optional[AsyncOpenAI] = None,
     ledger: Optional[LedgerStore] = None,
-    sleep_between: float = 0.5,
+    sleep_between: float = 0.0,
+    limiter: Optional[RateLimiter] = None,
 ) -> int:
     """Process the most recent transcript segments and log GPT outputs.
 
+    Up to ``cfg.max_concurrency`` requests are in flight at once, paced by the
+    RPM/TPM limiter; ledger records are still committed in segment order.
+    ``sleep_between`` adds a fixed pause after each request for callers that
+    relied on the old serial pacing.
+
     Returns the number of segments successfully processed.
     """
 
@@ -40,86 +62,341 @@ async def process_transcripts(
         return 0
 
     enriched_segments = _assign_sessions(segments, cfg.session_gap_sec)
-    processed = 0
-    for data, session_id, gap in enriched_segments:
-        prompt_header = (
-            f"Session {session_id} (gap {gap:.1f}s): Analyzuj text a vyhledej "
-            "příkazy, poznámky, úkoly nebo výdaje.\n"
+    started = time.monotonic()
+
+    def commit(record: Dict[str, Any]) -> None:
+        ledger.append(record)
+        print(f"[GPT] processed segment -> {cfg.ledger_path} (session {record['session_id']})")
+
+    try:
+        stats = await extract_records(
+            client,
+            cfg,
+            enriched_segments,
+            commit,
+            limiter=limiter,
+            sleep_between=sleep_between,
+        )
+    finally:
+        ledger.close()
+    _report_throughput(stats, time.monotonic() - started)
+    return stats.records
+
+
+@dataclass
+class ExtractionStats:
+    records: int = 0
+    errors: int = 0
+    tokens: int = 0
+    requests: int = 0
+    cache_hits: int = 0
+
+
+Item = Tuple[Dict[str, Any], int, float]
+
+
+async def extract_records(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    items: Sequence[Item],
+    commit: Callable[[Dict[str, Any]], None],
+    *,
+    limiter: Optional[RateLimiter] = None,
+    sleep_between: float = 0.0,
+) -> ExtractionStats:
+    """Extract ``(segment, session_id, gap)`` items concurrently, committing in order.
+
+    With ``cfg.batch_mode == "session"`` consecutive segments of a session are
+    packed into token-budgeted batches that cost one request each. Finished
+    records are handed to ``commit`` only once every earlier item has been
+    committed, so the ledger order matches the transcript order even though
+    requests complete out of order.
+    """
+
+    limiter = limiter or RateLimiter(cfg.requests_per_min, cfg.tokens_per_min)
+    semaphore = asyncio.Semaphore(max(1, cfg.max_concurrency))
+    stats = ExtractionStats()
+    if cfg.batch_mode == "session":
+        groups = plan_batches(items, cfg.batch_max_tokens, cfg.batch_max_segments)
+    else:
+        groups = [[item] for item in items]
+
+    async def run(group: List[Item]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            if len(group) == 1:
+                records = [
+                    await extract_record(client, cfg, *group[0], limiter=limiter, stats=stats)
+                ]
+            else:
+                records = await extract_batch(client, cfg, group, limiter=limiter, stats=stats)
+            if sleep_between:
+                await asyncio.sleep(sleep_between)
+            return records
+
+    tasks = [asyncio.create_task(run(group)) for group in groups]
+    try:
+        for task in tasks:
+            for record in await task:
+                commit(record)
+                stats.records += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+    return stats
+
+
+async def extract_record(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    data: Dict[str, Any],
+    session_id: int,
+    gap: float,
+    *,
+    limiter: Optional[RateLimiter] = None,
+    stats: Optional[ExtractionStats] = None,
+) -> Dict[str, Any]:
+    """Run the extraction prompt for one segment and build its ledger record.
+
+    Transient failures (429, 5xx, timeouts) are retried with jittered backoff;
+    once retries are exhausted the error text is recorded as the output. A
+    replay-mode cache miss is re-raised so deterministic runs fail loudly.
+    """
+
+    prompt_header = (
+        f"Session {session_id} (gap {gap:.1f}s): Analyzuj text a vyhledej "
+        "příkazy, poznámky, úkoly nebo výdaje.\n"
+    )
+    prompt = prompt_header + data.get("text", "")
+    try:
+        result, _ = await _chat(client, cfg, prompt, limiter=limiter, stats=stats)
+    except ReplayCacheMiss:
+        raise
+    except Exception as exc:  # pragma: no cover - network edge
+        result = f"[Error: {exc}]"
+        if stats is not None:
+            stats.errors += 1
+    return _build_record(data, session_id, gap, result)
+
+
+async def extract_batch(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    batch: Sequence[Item],
+    *,
+    limiter: Optional[RateLimiter] = None,
+    stats: Optional[ExtractionStats] = None,
+) -> List[Dict[str, Any]]:
+    """Extract a batch of segments with one structured-output request.
+
+    The reply is split back into one ledger record per segment. Segments the
+    model skipped (or the whole batch, if the reply is not valid JSON) fall
+    back to individual ``extract_record`` calls. If the request itself fails
+    after its retries, every segment records the error instead: retrying
+    each one separately would multiply the calls made during an outage.
+    """
+
+    session_id = batch[0][1]
+    lines = [f"[{index}] {data.get('text', '')}" for index, (data, _, _) in enumerate(batch, 1)]
+    prompt = BATCH_PROMPT_TEMPLATE.format(session_id=session_id) + "\n".join(lines)
+    outputs: Dict[int, Any] = {}
+    try:
+        text, used = await _chat(
+            client,
+            cfg,
+            prompt,
+            limiter=limiter,
+            stats=stats,
+            completion_tokens=_BATCH_COMPLETION_TOKENS * len(batch),
+            response_format={"type": "json_object"},
+        )
+        outputs = _split_batch_output(text, len(batch))
+        print(
+            f"[GPT] batch session {session_id}: {len(batch)} segments in 1 request "
+            f"({used if used is not None else '?'} tokens)"
         )
-        prompt = prompt_header + data.get("text", "")
+    except ReplayCacheMiss:
+        raise
+    except Exception as exc:  # pragma: no cover - network edge
+        print(f"[GPT] batch session {session_id} failed: {exc}")
+        if stats is not None:
+            stats.errors += 1
+        return [_build_record(data, sid, gap, f"[Error: {exc}]") for data, sid, gap in batch]
 
+    records: List[Dict[str, Any]] = []
+    for index, (data, sid, gap) in enumerate(batch):
+        if index in outputs:
+            output = json.dumps(outputs[index], ensure_ascii=False)
+            records.append(_build_record(data, sid, gap, output))
+        else:
+            records.append(await extract_record(client, cfg, data, sid, gap, limiter=limiter, stats=stats))
+    return records
+
+
+def plan_batches(items: Sequence[Item], max_tokens: int, max_segments: int) -> List[List[Item]]:
+    """Group consecutive same-session items into batches within a token budget."""
+
+    batches: List[List[Item]] = []
+    current: List[Item] = []
+    budget = 0
+    for item in items:
+        cost = estimate_tokens(item[0].get("text", ""), completion_tokens=_BATCH_COMPLETION_TOKENS)
+        if current and (
+            item[1] != current[-1][1]
+            or len(current) >= max_segments
+            or budget + cost > max_tokens
+        ):
+            batches.append(current)
+            current, budget = [], 0
+        current.append(item)
+        budget += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _chat(
+    client: AsyncOpenAI,
+    cfg: GPTConfig,
+    prompt: str,
+    *,
+    limiter: Optional[RateLimiter] = None,
+    stats: Optional[ExtractionStats] = None,
+    completion_tokens: int = 256,
+    **kwargs: Any,
+) -> Tuple[str, Optional[int]]:
+    """Send one rate-limited, retried completion; return ``(text, total_tokens)``.
+
+    Served from the persistent response cache when enabled (``total_tokens``
+    is ``None`` for hits, which cost no quota).
+    """
+
+    cache = get_response_cache(cfg)
+    key = prompt_key(cfg.model, cfg.temperature, prompt, **kwargs)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            if stats is not None:
+                stats.cache_hits += 1
+            return cached, None
+
+    reserved = estimate_tokens(prompt, completion_tokens)
+    used: Optional[int] = None
+
+    async def attempt() -> Any:
+        if limiter is not None:
+            await limiter.acquire(reserved)
+        if stats is not None:
+            stats.requests += 1
         try:
-            response = await client.chat.completions.create(
+            return await client.chat.completions.create(
                 model=cfg.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=cfg.temperature,
+                **kwargs,
             )
-            result = response.choices[0].message.content.strip()
-        except Exception as exc:  # pragma: no cover - network edge
-            result = f"[Error: {exc}]"
-
-        ledger.append(
-            {
-                "session_id": session_id,
-                "gap": gap,
-                "start": data.get("start"),
-                "end": data.get("end"),
-                "input": data.get("text", ""),
-                "gpt_output": result,
-            }
-        )
-        print(f"[GPT] processed segment -> {cfg.ledger_path} (session {session_id})")
-        processed += 1
-        if sleep_between:
-            await asyncio.sleep(sleep_between)
-
-    return processed
+        except BaseException:
+            # A failed attempt consumed no completion tokens; refund its
+            # reservation so retries do not ratchet the TPM budget down.
+            if limiter is not None:
+                limiter.settle(reserved, 0)
+            raise
 
+    try:
+        response = await call_with_retry(
+            attempt,
+            max_retries=cfg.max_retries,
+            base_delay=cfg.retry_base_sec,
+            max_delay=cfg.retry_max_sec,
+        )
+        used = getattr(getattr(response, "usage", None), "total_tokens", None)
+        text = (response.choices[0].message.content or "").strip()
+        if cache is not None:
+            cache.put(key, text, used)
+        return text, used
+    finally:
+        if limiter is not None:
+            limiter.settle(reserved, used)
+        if stats is not None and used is not None:
+            stats.tokens += used
 
-def _load_segments(path: str, max_segments: int) -> List[Dict[str, Any]]:
-    file_path = Path(path)
-    if not file_path.exists():
-        return []
 
-    with open(file_path, "r", encoding="utf-8") as fh:
-        lines = fh.readlines()[-max_segments:]
+def _split_batch_output(text: str, count: int) -> Dict[int, Any]:
+    """Map 0-based segment positions to their outputs from a batch reply."""
 
-    segments: List[Dict[str, Any]] = []
-    for line in lines:
-        line = line.strip()
-        if not line:
+    cleaned = re.sub(r"```(?:json)?", "", text, flags=re.IGNORECASE).strip()
+    try:
+        parsed = json.loads(cleaned)
+    except ValueError:
+        return {}
+    segments = parsed.get("segments") if isinstance(parsed, dict) else parsed
+    if not isinstance(segments, list):
+        return {}
+    outputs: Dict[int, Any] = {}
+    for item in segments:
+        if not isinstance(item, dict):
             continue
         try:
-            segments.append(json.loads(line))
-        except json.JSONDecodeError:
+            index = int(item.get("index")) - 1
+        except (TypeError, ValueError):
             continue
-    return segments
+        if 0 <= index < count and "output" in item:
+            outputs[index] = item["output"]
+    return outputs
 
 
-def _assign_sessions(
-    segments: List[Dict[str, Any]],
-    gap_threshold: float,
-) -> List[Tuple[Dict[str, Any], int, float]]:
-    session_id = 1
-    prev_end: Optional[float] = None
-    enriched: List[Tuple[Dict[str, Any], int, float]] = []
+def _build_record(data: Dict[str, Any], session_id: int, gap: float, output: str) -> Dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "gap": gap,
+        "start": data.get("start"),
+        "end": data.get("end"),
+        "input": data.get("text", ""),
+        "gpt_output": output,
+    }
+
+
+def _report_throughput(stats: ExtractionStats, elapsed: float) -> None:
+    elapsed = max(elapsed, 1e-6)
+    print(
+        f"[GPT] {stats.records} segments / {stats.requests} requests in {elapsed:.1f}s "
+        f"({stats.records / elapsed:.2f} seg/s, {stats.tokens * 60 / elapsed:.0f} tok/min, "
+        f"{stats.cache_hits} cache hits, {stats.errors} errors)"
+    )
+
+
+def _load_segments(path: str, max_segments: int) -> List[Dict[str, Any]]:
+    return tail_records(path, max_segments)
+
 
-    for segment in segments:
+class SessionTracker:
+    """Assign session ids by the gap between consecutive segments."""
+
+    def __init__(self, gap_threshold: float, session_id: int = 1) -> None:
+        self.gap_threshold = gap_threshold
+        self.session_id = session_id
+        self.prev_end: Optional[float] = None
+
+    def assign(self, segment: Dict[str, Any]) -> Tuple[int, float]:
         start = segment.get("start")
         end = segment.get("end")
         gap = 0.0
-        if prev_end is not None and isinstance(start, (int, float)):
-            gap = float(start) - float(prev_end)
-        if gap > gap_threshold:
-            session_id += 1
-            print(f"[Session] Gap {gap:.1f}s → new session {session_id}")
-
-        enriched.append((segment, session_id, max(gap, 0.0)))
+        if self.prev_end is not None and isinstance(start, (int, float)):
+            gap = float(start) - float(self.prev_end)
+        if gap > self.gap_threshold:
+            self.session_id += 1
+            print(f"[Session] Gap {gap:.1f}s → new session {self.session_id}")
 
         if isinstance(end, (int, float)):
-            prev_end = float(end)
+            self.prev_end = float(end)
+        return self.session_id, max(gap, 0.0)
+
 
-    return enriched
+def _assign_sessions(
+    segments: List[Dict[str, Any]],
+    gap_threshold: float,
+) -> List[Tuple[Dict[str, Any], int, float]]:
+    tracker = SessionTracker(gap_threshold)
+    return [(segment, *tracker.assign(segment)) for segment in segments]
 
 
 if __name__ == "__main__":
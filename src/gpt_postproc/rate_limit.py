@@ -0,0 +1,165 @@
+"""Client-side rate limiting and retry policy for OpenAI chat calls."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from openai import APIConnectionError, APITimeoutError
+
+T = TypeVar("T")
+
+# Rough chars-per-token ratio for budgeting before the real usage is known.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str, completion_tokens: int = 256) -> int:
+    """Cheap upper-bound guess of prompt + completion tokens for ``text``."""
+
+    return len(text) // _CHARS_PER_TOKEN + 1 + completion_tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` so ``estimate_tokens(text, 0)`` stays within ``max_tokens``."""
+
+    limit = max(0, max_tokens - 1) * _CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[:limit]
+
+
+class TokenBucket:
+    """Continuous-refill bucket holding up to one minute of ``per_minute`` budget."""
+
+    def __init__(
+        self,
+        per_minute: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self._rate = per_minute / 60.0
+        self._clock = clock
+        self._updated = clock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_minute > 0
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 when they are now)."""
+
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self._rate
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` tokens; may go negative to absorb under-estimates."""
+
+        if self.enabled:
+            self._refill()
+            self.tokens -= amount
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Requests-per-minute plus tokens-per-minute limiter shared by concurrent calls.
+
+    Waiters are served in arrival order. Callers reserve an estimated token
+    cost up front and ``settle`` the difference once the response reports the
+    real usage, so sustained throughput converges on the TPM quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_min: float = 0,
+        tokens_per_min: float = 0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_min, clock=clock)
+        self.tokens = TokenBucket(tokens_per_min, clock=clock)
+        self._sleep = sleep
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        async with self._lock:
+            while True:
+                wait = max(self.requests.delay_for(1), self.tokens.delay_for(tokens))
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    return
+                await self._sleep(wait)
+
+    def settle(self, reserved: int, actual: Optional[int]) -> None:
+        """Charge (or refund) the gap between the estimate and real usage."""
+
+        if actual is None:
+            return
+        self.tokens.consume(actual - reserved)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for 429s, 5xx responses, timeouts and dropped connections."""
+
+    if isinstance(exc, (APIConnectionError, APITimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+
+def backoff_delay(
+    attempt: int,
+    exc: BaseException,
+    *,
+    base: float,
+    cap: float,
+) -> float:
+    """Full-jitter exponential backoff, honouring ``Retry-After`` when sent."""
+
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        retry_after = headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def call_with_retry(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> T:
+    """Await ``fn()``, retrying retryable failures up to ``max_retries`` times."""
+
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as exc:
+            if attempt >= max_retries or not is_retryable(exc):
+                raise
+            delay = backoff_delay(attempt, exc, base=base_delay, cap=max_delay)
+            status = getattr(exc, "status_code", type(exc).__name__)
+            print(f"[GPT] retry {attempt + 1}/{max_retries} after {status} in {delay:.1f}s")
+            attempt += 1
+            await sleep(delay)
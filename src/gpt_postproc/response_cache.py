@@ -0,0 +1,147 @@
+"""Persistent prompt/response cache for GPT calls backed by SQLite."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import GPTConfig
+
+CACHE_MODES = ("off", "readwrite", "replay")
+
+
+class ReplayCacheMiss(LookupError):
+    """Raised in replay mode when a prompt has no cached response."""
+
+
+def prompt_key(model: str, temperature: float, prompt: str, **options: Any) -> str:
+    """Content hash of everything that determines a completion."""
+
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "prompt": prompt, "options": options},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class ResponseCache:
+    """Bounded on-disk cache of completion texts keyed by ``prompt_key``.
+
+    Entries older than ``ttl_sec`` (0 = never) are treated as misses and
+    dropped. Once the table grows about 10% past ``max_entries`` the least
+    recently used rows are evicted in one batch, so an insert does not pay
+    for an eviction scan.
+    In ``replay`` mode a miss raises :class:`ReplayCacheMiss` instead of
+    letting the caller reach the network, so runs can be benchmarked offline.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        mode: str = "readwrite",
+        ttl_sec: float = 0,
+        max_entries: int = 50_000,
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown GPT cache mode {mode!r}; expected one of {CACHE_MODES}")
+        self.path = path
+        self.mode = mode
+        self.ttl_sec = ttl_sec
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, created REAL NOT NULL, accessed REAL NOT NULL,"
+            " content TEXT NOT NULL, tokens INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        # Upper bound on the row count (replacements and TTL deletes are not
+        # subtracted); recounted before evicting.
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_sec and now - row[1] > self.ttl_sec:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+        if self.replay:
+            raise ReplayCacheMiss(f"No cached GPT response for {key} (GPT_CACHE_MODE=replay)")
+        return None
+
+    def put(self, key: str, content: str, tokens: Optional[int] = None) -> None:
+        if self.replay:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created, accessed, content, tokens)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, content, tokens),
+            )
+            self._rows += 1
+            if self._rows > self.max_entries + self.max_entries // 10:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = self._rows - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+                (excess,),
+            )
+            self._rows = self.max_entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_CACHES: Dict[str, ResponseCache] = {}
+
+
+def get_response_cache(cfg: GPTConfig) -> Optional[ResponseCache]:
+    """Return the process-wide cache for ``cfg`` or ``None`` when disabled."""
+
+    if cfg.cache_mode == "off":
+        return None
+    cache = _CACHES.get(cfg.cache_path)
+    if cache is None or cache.mode != cfg.cache_mode:
+        cache = ResponseCache(
+            cfg.cache_path,
+            mode=cfg.cache_mode,
+            ttl_sec=cfg.cache_ttl_sec,
+            max_entries=cfg.cache_max_entries,
+        )
+        _CACHES[cfg.cache_path] = cache
+    return cache
@@ -0,0 +1,173 @@
+"""Redis Streams consumer-group worker feeding transcripts to GPT post-processing."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+from redis.asyncio import Redis, from_url
+from redis.exceptions import ResponseError
+
+from src.stt_core.redis_io import decode_fields
+
+from .config import GPTConfig
+from .ledger_store import LedgerStore
+from .processor import SessionTracker, extract_records
+from .rate_limit import RateLimiter
+
+StreamEntry = Tuple[str, Dict[str, Any]]
+
+
+async def run_stream_worker(
+    *,
+    cfg: Optional[GPTConfig] = None,
+    client: Optional[AsyncOpenAI] = None,
+    redis: Optional[Redis] = None,
+    ledger: Optional[LedgerStore] = None,
+    max_polls: Optional[int] = None,
+) -> int:
+    """Consume ``cfg.redis_stream`` as ``cfg.consumer_name`` in ``cfg.consumer_group``.
+
+    On start the worker first re-reads its own pending entries (delivered but
+    never acked, e.g. after a crash), then reads new entries in batches. Each
+    batch is acked only after its ledger records are written, so a restart
+    resumes from the last processed ID. The consumer name defaults to the
+    hostname so a restart picks up where the previous process left off; run
+    several processes on one host with distinct ``GPT_CONSUMER_NAME`` values.
+    Every ``stream_claim_interval_sec`` (and whenever the stream is idle)
+    entries left pending by a dead consumer for ``stream_claim_idle_ms`` are
+    claimed, so they are not starved by steady traffic.
+
+    Returns the number of entries processed (``max_polls`` bounds the loop for
+    tests and one-shot runs).
+    """
+
+    cfg = cfg or GPTConfig()
+    client = client or AsyncOpenAI(api_key=cfg.api_key)
+    redis = redis or from_url(cfg.redis_url, decode_responses=True)
+    ledger = ledger or LedgerStore(cfg.ledger_path)
+    tracker = SessionTracker(cfg.session_gap_sec)
+    limiter = RateLimiter(cfg.requests_per_min, cfg.tokens_per_min)
+
+    await _ensure_group(redis, cfg)
+    print(
+        f"[GPT][Stream] consuming {cfg.redis_stream} as "
+        f"{cfg.consumer_group}/{cfg.consumer_name}"
+    )
+
+    try:
+        return await _consume(redis, cfg, client, ledger, tracker, limiter, max_polls)
+    finally:
+        ledger.close()
+
+
+async def _consume(
+    redis: Redis,
+    cfg: GPTConfig,
+    client: AsyncOpenAI,
+    ledger: LedgerStore,
+    tracker: SessionTracker,
+    limiter: RateLimiter,
+    max_polls: Optional[int],
+) -> int:
+    processed = 0
+    polls = 0
+    draining_pending = True
+    next_claim = time.monotonic() + cfg.stream_claim_interval_sec
+    while max_polls is None or polls < max_polls:
+        polls += 1
+        if draining_pending:
+            entries = await _read(redis, cfg, "0", block=None)
+            if not entries:
+                draining_pending = False
+                continue
+        else:
+            entries = []
+            if time.monotonic() >= next_claim:
+                next_claim = time.monotonic() + cfg.stream_claim_interval_sec
+                entries = await _claim_stale(redis, cfg)
+            if not entries:
+                entries = await _read(redis, cfg, ">", block=cfg.stream_block_ms)
+            if not entries:
+                next_claim = time.monotonic() + cfg.stream_claim_interval_sec
+                entries = await _claim_stale(redis, cfg)
+                if not entries:
+                    continue
+
+        # Entries trimmed from the stream before we got to them have no fields.
+        live = [(entry_id, decode_fields(fields)) for entry_id, fields in entries if fields]
+        items = [(data, *tracker.assign(data)) for _, data in live]
+        stream_ids = iter(entry_id for entry_id, _ in live)
+
+        def commit(record: Dict[str, Any]) -> None:
+            record["stream_id"] = next(stream_ids)
+            ledger.append(record)
+
+        await extract_records(client, cfg, items, commit, limiter=limiter)
+        await redis.xack(cfg.redis_stream, cfg.consumer_group, *[entry_id for entry_id, _ in entries])
+        processed += len(entries)
+        print(f"[GPT][Stream] processed {len(entries)} entries -> {cfg.ledger_path}")
+
+    return processed
+
+
+async def _ensure_group(redis: Redis, cfg: GPTConfig) -> None:
+    try:
+        await redis.xgroup_create(cfg.redis_stream, cfg.consumer_group, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def _read(redis: Redis, cfg: GPTConfig, cursor: str, block: Optional[int]) -> List[StreamEntry]:
+    response = await redis.xreadgroup(
+        cfg.consumer_group,
+        cfg.consumer_name,
+        streams={cfg.redis_stream: cursor},
+        count=cfg.stream_batch_size,
+        block=block,
+    )
+    return _entries_from_response(response)
+
+
+async def _claim_stale(redis: Redis, cfg: GPTConfig) -> List[StreamEntry]:
+    try:
+        response = await redis.xautoclaim(
+            cfg.redis_stream,
+            cfg.consumer_group,
+            cfg.consumer_name,
+            min_idle_time=cfg.stream_claim_idle_ms,
+            start_id="0-0",
+            count=cfg.stream_batch_size,
+        )
+    except ResponseError:  # Redis < 6.2 has no XAUTOCLAIM
+        return []
+    if not response or len(response) < 2:
+        return []
+    return [(entry_id, fields) for entry_id, fields in response[1]]
+
+
+def _entries_from_response(response: Any) -> List[StreamEntry]:
+    """Normalize RESP2 (list of pairs) and RESP3 (dict) XREADGROUP replies."""
+
+    if not response:
+        return []
+    streams = response.items() if isinstance(response, dict) else response
+    entries: List[StreamEntry] = []
+    for _, stream_entries in streams:
+        if (
+            len(stream_entries) == 1
+            and isinstance(stream_entries[0], list)
+            and stream_entries[0]
+            and isinstance(stream_entries[0][0], (list, tuple))
+        ):
+            stream_entries = stream_entries[0]  # RESP3 wraps entries once more
+        for entry_id, fields in stream_entries:
+            entries.append((entry_id, fields))
+    return entries
+
+
+if __name__ == "__main__":
+    asyncio.run(run_stream_worker())
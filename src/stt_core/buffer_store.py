@@ -1,11 +1,25 @@
-"""Append-only JSONL buffer with rolling truncation."""
+"""Append-only JSONL buffer with rolling truncation or segmented rotation."""
 
 from __future__ import annotations
 
 import json
 import os
+import re
+import struct
+import threading
 import time
-from typing import Any, Dict
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:  # POSIX advisory locks let several processes append to one log
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Sidecar index entry: (record timestamp, byte offset inside the segment).
+_INDEX_ENTRY = struct.Struct("<dQ")
 
 
 class BufferStore:
@@ -20,11 +34,26 @@ class BufferStore:
     def append(self, record: Dict[str, Any]) -> None:
         """Append a record to the JSONL buffer and enforce size limits."""
 
-        record.setdefault("ts", time.time())
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> None:
+        """Append several records with one open/write and one size check."""
+
+        if not records:
+            return
+        now = time.time()
+        for record in records:
+            record.setdefault("ts", now)
         with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+            fh.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
         self._truncate_if_needed()
 
+    def flush(self) -> None:
+        """No-op: every append is written through immediately."""
+
+    def close(self) -> None:
+        """No-op: the single-file buffer holds no open handles."""
+
     def _truncate_if_needed(self) -> None:
         """Drop the oldest lines if the buffer exceeds the allowed size."""
 
@@ -41,3 +70,345 @@ class BufferStore:
         except FileNotFoundError:
             return
 
+
+class SegmentedBufferStore:
+    """Segmented JSONL log with a timestamp index per segment.
+
+    Records are buffered in memory and written to ``<stem>.<seq>.jsonl`` in
+    groups (every ``flush_every`` records, and at least every
+    ``flush_interval`` seconds from a background timer). When the active
+    segment reaches ``segment_mb`` a new one is opened; once the total size
+    passes ``max_mb`` the oldest segments are deleted whole, so retention
+    never rewrites data. Each segment has a ``.idx`` sidecar of fixed-size
+    ``(ts, offset)`` entries that lets readers seek to a time range without
+    parsing JSON.
+
+    Several processes may append to the same log (e.g. the API and the
+    LiveKit runner): each flush holds an exclusive ``flock`` on
+    ``<path>.lock``, follows rotations made by other writers and takes the
+    index offsets from the real end of the segment.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_mb: int = 32,
+        segment_mb: int = 4,
+        *,
+        flush_every: int = 32,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024
+        self.segment_bytes = max(1, segment_mb) * 1024 * 1024
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._lines: List[Tuple[float, bytes]] = []
+        self._data_fh = None
+        self._index_fh = None
+        self._lock_fh = open(path + ".lock", "a")
+        segments = segment_paths(path)
+        self._seq = _segment_seq(segments[-1]) if segments else 1
+        self._open_segment(self._seq)
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="buffer-store-flush", daemon=True
+            )
+            self._flusher.start()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a record to the active segment, rotating when it is full."""
+
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> None:
+        """Append records under one lock acquisition and at most one flush."""
+
+        if not records:
+            return
+        now = time.time()
+        with self._lock:
+            for record in records:
+                record.setdefault("ts", now)
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                self._lines.append((_record_ts(record), line))
+            if len(self._lines) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Push buffered records to the OS so readers can see them."""
+
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._data_fh is None:
+                return
+            self._flush_locked()
+            self._data_fh.close()
+            self._index_fh.close()
+            self._lock_fh.close()
+            self._data_fh = None
+            self._index_fh = None
+
+    def iter_records(
+        self, since: float | None = None, until: float | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield records with ``since <= ts <= until`` in append order."""
+
+        self.flush()
+        return iter_segment_records(self.path, since=since, until=until)
+
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        self.flush()
+        return tail_records(self.path, limit)
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._data_fh is None or not self._lines:
+            return
+        with _exclusive_lock(self._lock_fh):
+            self._follow_rotation()
+            offset = self._data_fh.seek(0, os.SEEK_END)
+            data, index = bytearray(), bytearray()
+            for ts, line in self._lines:
+                if offset and offset + len(line) > self.segment_bytes:
+                    self._write(data, index)
+                    data, index = bytearray(), bytearray()
+                    self._rotate()
+                    offset = self._data_fh.seek(0, os.SEEK_END)
+                index += _INDEX_ENTRY.pack(ts, offset)
+                data += line
+                offset += len(line)
+            self._write(data, index)
+        self._lines.clear()
+
+    def _write(self, data: bytearray, index: bytearray) -> None:
+        # Data before index, so an indexed offset always points at a full line.
+        self._data_fh.write(data)
+        self._data_fh.flush()
+        self._index_fh.write(index)
+        self._index_fh.flush()
+
+    def _open_segment(self, seq: int) -> None:
+        data_path = _segment_path(self.path, seq)
+        self._data_fh = open(data_path, "ab")
+        self._index_fh = open(_index_path(data_path), "ab")
+        self._seq = seq
+
+    def _follow_rotation(self) -> None:
+        """Switch to the newest segment if another writer rotated."""
+
+        next_seq = self._seq
+        while _segment_path(self.path, next_seq + 1).exists():
+            next_seq += 1
+        if next_seq != self._seq:
+            self._data_fh.close()
+            self._index_fh.close()
+            self._open_segment(next_seq)
+
+    def _rotate(self) -> None:
+        self._data_fh.close()
+        self._index_fh.close()
+        self._open_segment(self._seq + 1)
+        self._enforce_retention()
+
+    def _enforce_retention(self) -> None:
+        """Delete whole segments, oldest first, until under ``max_bytes``."""
+
+        segments = segment_paths(self.path)
+        sizes = [_safe_size(p) for p in segments]
+        total = sum(sizes)
+        for seg, size in zip(segments[:-1], sizes[:-1]):
+            if total <= self.max_bytes:
+                break
+            seg.unlink(missing_ok=True)
+            _index_path(seg).unlink(missing_ok=True)
+            total -= size
+
+
+@contextmanager
+def _exclusive_lock(handle: Any) -> Iterator[None]:
+    """Serialize segment writes across processes (POSIX only)."""
+
+    if fcntl is None:  # pragma: no cover - non-POSIX platforms
+        yield
+        return
+    fcntl.flock(handle, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def open_buffer_store(
+    path: str,
+    max_mb: int = 32,
+    segment_mb: int = 0,
+    *,
+    flush_every: int = 32,
+    flush_interval: float = 1.0,
+) -> BufferStore | SegmentedBufferStore:
+    """Return a segmented store when ``segment_mb`` > 0, else the single-file buffer."""
+
+    if segment_mb > 0:
+        return SegmentedBufferStore(
+            path,
+            max_mb,
+            segment_mb,
+            flush_every=flush_every,
+            flush_interval=flush_interval,
+        )
+    return BufferStore(path, max_mb)
+
+
+def segment_paths(path: str) -> List[Path]:
+    """Return the segment files belonging to ``path`` ordered by sequence."""
+
+    base = Path(path)
+    pattern = re.compile(rf"^{re.escape(base.stem)}\.(\d+){re.escape(base.suffix)}$")
+    directory = base.parent if str(base.parent) else Path(".")
+    if not directory.exists():
+        return []
+    found = [p for p in directory.iterdir() if pattern.match(p.name)]
+    return sorted(found, key=_segment_seq)
+
+
+def iter_segment_records(
+    path: str, since: float | None = None, until: float | None = None
+) -> Iterator[Dict[str, Any]]:
+    """Read records from segment files, using the sidecar index to seek.
+
+    Timestamps are not monotonic: records wait up to ``flush_interval`` in
+    memory and several writers interleave their flushes. Each segment is
+    therefore scanned from its first indexed record inside the range to its
+    end, filtering every record, and skipped only when no indexed record
+    falls inside the range.
+    """
+
+    for segment in segment_paths(path):
+        index = _read_index(_index_path(segment))
+        start = 0
+        if index and (since is not None or until is not None):
+            first = next(
+                (
+                    offset
+                    for ts, offset in index
+                    if (since is None or ts >= since) and (until is None or ts <= until)
+                ),
+                None,
+            )
+            if first is None:
+                continue
+            start = first
+        try:
+            with open(segment, "rb") as fh:
+                fh.seek(start)
+                for raw in fh:
+                    data = _parse_line(raw)
+                    if data is None:
+                        continue
+                    ts = _record_ts(data)
+                    if since is not None and ts < since:
+                        continue
+                    if until is not None and ts > until:
+                        continue
+                    yield data
+        except FileNotFoundError:  # rotated away mid-read
+            continue
+
+
+def tail_records(path: str, limit: int) -> List[Dict[str, Any]]:
+    """Return the last ``limit`` records from either buffer layout."""
+
+    if limit <= 0:
+        return []
+    segments = segment_paths(path)
+    if not segments:
+        return _tail_file(Path(path), limit)
+
+    collected: deque[Dict[str, Any]] = deque()
+    for segment in reversed(segments):
+        chunk = _tail_file(segment, limit - len(collected))
+        collected.extendleft(reversed(chunk))
+        if len(collected) >= limit:
+            break
+    return list(collected)
+
+
+def _tail_file(path: Path, limit: int) -> List[Dict[str, Any]]:
+    if limit <= 0 or not path.exists():
+        return []
+    lines: deque[bytes] = deque(maxlen=limit)
+    with open(path, "rb") as fh:
+        for raw in fh:
+            if raw.strip():
+                lines.append(raw)
+    records = []
+    for raw in lines:
+        data = _parse_line(raw)
+        if data is not None:
+            records.append(data)
+    return records
+
+
+def _parse_line(raw: bytes) -> Optional[Dict[str, Any]]:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _read_index(path: Path) -> List[Tuple[float, int]]:
+    try:
+        payload = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    usable = len(payload) - len(payload) % _INDEX_ENTRY.size
+    return [entry for entry in _INDEX_ENTRY.iter_unpack(payload[:usable])]
+
+
+def _record_ts(record: Dict[str, Any]) -> float:
+    try:
+        return float(record.get("ts"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _segment_path(path: str, seq: int) -> Path:
+    base = Path(path)
+    return base.with_name(f"{base.stem}.{seq:08d}{base.suffix}")
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_suffix(".idx")
+
+
+def _segment_seq(segment: Path) -> int:
+    return int(segment.stem.rsplit(".", 1)[-1])
+
+
+def _safe_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
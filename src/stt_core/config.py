@@ -14,5 +14,14 @@ class STTConfig(BaseModel):
     sample_rate: int = 16000
     redis_url: str = Field(default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
     redis_stream: str = Field(default=os.getenv("REDIS_STREAM", "daymind:transcripts"))
+    redis_batch_size: int = Field(default=int(os.getenv("REDIS_BATCH_SIZE", "100")))
+    redis_flush_ms: int = Field(default=int(os.getenv("REDIS_FLUSH_MS", "50")))
+    redis_spill_path: str = Field(default=os.getenv("REDIS_SPILL_PATH", "data/redis_spill.jsonl"))
+    sink_queue_size: int = Field(default=int(os.getenv("SINK_QUEUE_SIZE", "1000")))
+    sink_overflow_policy: str = Field(default=os.getenv("SINK_OVERFLOW_POLICY", "drop_oldest"))
+    buffer_sink_overflow_policy: str = Field(default=os.getenv("BUFFER_SINK_OVERFLOW_POLICY", "block"))
+    sink_spill_dir: str = Field(default=os.getenv("SINK_SPILL_DIR", "data/sink_spill"))
     buffer_path: str = Field(default=os.getenv("BUFFER_PATH", "data/transcripts.jsonl"))
     buffer_max_mb: int = Field(default=int(os.getenv("BUFFER_MAX_MB", "32")))
+    buffer_segment_mb: int = Field(default=int(os.getenv("BUFFER_SEGMENT_MB", "0")))
+    buffer_flush_every: int = Field(default=int(os.getenv("BUFFER_FLUSH_EVERY", "32")))
@@ -0,0 +1,180 @@
+"""Incrementally maintained day -> byte-range index for JSONL logs."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def record_day(record: Dict[str, Any]) -> str:
+    """Bucket a record by local calendar day of its ``start``/``ts`` field."""
+
+    ts = record.get("start") or record.get("ts") or time.time()
+    try:
+        return datetime.fromtimestamp(float(ts)).strftime("%Y-%m-%d")
+    except (ValueError, TypeError, OverflowError, OSError):
+        return datetime.fromtimestamp(time.time()).strftime("%Y-%m-%d")
+
+
+class DayIndex:
+    """Map each day to the byte ranges of a JSONL file holding its records.
+
+    The index lives next to the log as ``<name>.days.json`` and remembers how
+    many bytes it has covered. Writers call :meth:`add` after appending a line;
+    readers call :meth:`refresh`, which only parses the unindexed tail of the
+    file (or rebuilds from scratch if the file shrank or was replaced).
+
+    Adds are persisted in batches (every ``save_every`` adds and on
+    :meth:`flush`), so an append costs O(1) rather than a rewrite of the
+    sidecar. A sidecar that lags behind the log is still correct: it records
+    how many bytes it covers, and the next reader indexes the rest.
+    """
+
+    def __init__(self, path: str | Path, save_every: int = 256) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".days.json")
+        self.save_every = max(1, save_every)
+        self._lock = threading.Lock()
+        self._size = 0
+        self._days: Dict[str, List[List[int]]] = {}
+        self._unsaved = 0
+        self._load()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def days(self) -> List[str]:
+        self.refresh()
+        return sorted(self._days)
+
+    def ranges(self, day: str) -> List[tuple[int, int]]:
+        self.refresh()
+        return [(start, end) for start, end in self._days.get(day, [])]
+
+    def add(self, day: str, start: int, end: int) -> None:
+        """Record that ``[start, end)`` holds a line for ``day``."""
+
+        with self._lock:
+            if start != self._size:
+                self._scan_locked()
+                return
+            self._add_locked(day, start, end)
+            self._size = end
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save_locked()
+
+    def flush(self) -> None:
+        """Persist adds not yet written to the sidecar."""
+
+        with self._lock:
+            if self._unsaved:
+                self._save_locked()
+
+    def refresh(self) -> None:
+        """Index any bytes appended since the last refresh."""
+
+        with self._lock:
+            self._scan_locked()
+
+    def iter_day(self, day: str) -> Iterator[Dict[str, Any]]:
+        """Yield parsed records for ``day`` reading only its byte ranges."""
+
+        for data, _ in iter_ranges(self.path, self.ranges(day)):
+            yield data
+
+    def _scan_locked(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._size or self._days:
+                self._size, self._days = 0, {}
+                self._save_locked()
+            return
+        if stat.st_size == self._size:
+            return
+        if stat.st_size < self._size:
+            self._size, self._days = 0, {}
+
+        with open(self.path, "rb") as fh:
+            fh.seek(self._size)
+            offset = self._size
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    break  # partial line from a concurrent writer
+                end = offset + len(raw)
+                data = _parse_line(raw)
+                if data is not None:
+                    self._add_locked(record_day(data), offset, end)
+                offset = end
+        self._size = offset
+        self._save_locked()
+
+    def _add_locked(self, day: str, start: int, end: int) -> None:
+        ranges = self._days.setdefault(day, [])
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+
+    def _load(self) -> None:
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+            self._size = int(payload.get("size", 0))
+            self._days = {
+                str(day): [[int(s), int(e)] for s, e in ranges]
+                for day, ranges in (payload.get("days") or {}).items()
+            }
+        except (FileNotFoundError, ValueError, TypeError, AttributeError):
+            self._size, self._days = 0, {}
+
+    def _save_locked(self) -> None:
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path = self.index_path.with_name(self.index_path.name + suffix)
+        tmp_path.write_text(json.dumps({"size": self._size, "days": self._days}), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+        self._unsaved = 0
+
+
+def iter_ranges(
+    path: str | Path, ranges: List[Tuple[int, int]], start: int = 0
+) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """Yield ``(record, end_offset)`` for lines in ``ranges`` at or after ``start``.
+
+    ``end_offset`` is the file position just past the record's line, which is
+    a stable resume point for cursor pagination.
+    """
+
+    if not ranges:
+        return
+    with open(path, "rb") as fh:
+        for range_start, range_end in ranges:
+            if range_end <= start:
+                continue
+            offset = max(range_start, start)
+            fh.seek(offset)
+            while offset < range_end:
+                raw = fh.readline()
+                if not raw:
+                    return
+                offset += len(raw)
+                data = _parse_line(raw)
+                if data is not None:
+                    yield data, offset
+
+
+def _parse_line(raw: bytes) -> Optional[Dict[str, Any]]:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
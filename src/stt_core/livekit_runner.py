@@ -3,26 +3,36 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Any, Dict
 
-from redis.exceptions import RedisError
-
 try:  # pragma: no cover - optional dependency during tests
     from whisper_livekit import LiveKit  # type: ignore
 except ImportError:  # pragma: no cover
     LiveKit = None  # patched in tests
 
-from .buffer_store import BufferStore
+from .buffer_store import open_buffer_store
 from .config import STTConfig
-from .redis_io import RedisPublisher
+from .redis_io import BatchingRedisPublisher, RedisPublisher
+from .sinks import Sink, SinkPipeline
 
 
 async def run_realtime_stt() -> None:
     """Boot the LiveKit engine, stream mic audio, and log transcripts."""
 
     cfg = STTConfig()
-    buffer_store = BufferStore(cfg.buffer_path, cfg.buffer_max_mb)
-    redis_publisher = RedisPublisher(cfg.redis_url, cfg.redis_stream)
+    buffer_store = open_buffer_store(
+        cfg.buffer_path,
+        cfg.buffer_max_mb,
+        cfg.buffer_segment_mb,
+        flush_every=cfg.buffer_flush_every,
+    )
+    redis_publisher = BatchingRedisPublisher(
+        RedisPublisher(cfg.redis_url, cfg.redis_stream),
+        max_batch=cfg.redis_batch_size,
+        max_delay=cfg.redis_flush_ms / 1000.0,
+        spill_path=cfg.redis_spill_path or None,
+    )
 
     print(
         f"[DayMind] Starting STT with backend={cfg.model_backend}, "
@@ -42,12 +52,39 @@ async def run_realtime_stt() -> None:
         language=cfg.language,
     )
 
-    async for segment in live.listen():
-        payload = _segment_payload(segment, cfg)
-        await _publish_with_retry(redis_publisher, payload)
+    async def _publish(payload: Dict[str, Any]) -> None:
+        redis_publisher.submit(payload)  # already non-blocking; stays on the loop
+
+    def _append_buffer(payload: Dict[str, Any]) -> None:
         buffer_store.append(payload)
         print(f"[Sink][Buffer] appended {cfg.buffer_path}")
-        print(f"[Transcript] {payload['text']}")
+
+    sink_options = dict(
+        maxsize=cfg.sink_queue_size,
+        overflow=cfg.sink_overflow_policy,
+        spill_dir=cfg.sink_spill_dir or None,
+    )
+    # The buffer is the primary text store, so it never drops by default.
+    buffer_options = dict(sink_options, overflow=cfg.buffer_sink_overflow_policy)
+    pipeline = SinkPipeline(
+        [
+            Sink("redis", _publish, **sink_options),
+            Sink("buffer", _append_buffer, **buffer_options),
+            Sink("log", lambda payload: print(f"[Transcript] {payload['text']}"), **sink_options),
+        ]
+    )
+
+    redis_publisher.start()
+    pipeline.start()
+    try:
+        async for segment in live.listen():
+            payload = _segment_payload(segment, cfg)
+            payload["ts"] = time.time()
+            await pipeline.submit(payload)
+    finally:
+        await pipeline.close()
+        await redis_publisher.close()
+        buffer_store.close()
 
 
 def _segment_payload(segment: Any, cfg: STTConfig) -> Dict[str, Any]:
@@ -62,26 +99,5 @@ def _segment_payload(segment: Any, cfg: STTConfig) -> Dict[str, Any]:
     }
 
 
-async def _publish_with_retry(
-    publisher: RedisPublisher, payload: Dict[str, Any], attempts: int = 3
-) -> None:
-    """Attempt to publish with exponential backoff on failures."""
-
-    for attempt in range(1, attempts + 1):
-        try:
-            entry_id = await publisher.publish(payload)
-            print(f"[Sink][Redis] published id={entry_id}")
-            return
-        except RedisError as exc:
-            delay = min(2 ** (attempt - 1) * 0.5, 5)
-            print(
-                f"[Sink][Redis] publish failed (attempt {attempt}/{attempts}): {exc}"
-            )
-            if attempt == attempts:
-                print("[Sink][Redis] giving up for this segment; continuing")
-                return
-            await asyncio.sleep(delay)
-
-
 if __name__ == "__main__":
     asyncio.run(run_realtime_stt())
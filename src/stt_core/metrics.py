@@ -0,0 +1,44 @@
+"""Prometheus metrics for the realtime STT sinks."""
+
+from __future__ import annotations
+
+from prometheus_client import Counter, Gauge, Histogram
+
+REDIS_FLUSH_SIZE = Histogram(
+    "stt_redis_flush_size",
+    "Payloads written per pipelined Redis flush",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+REDIS_PUBLISH_LAG = Histogram(
+    "stt_redis_publish_lag_seconds",
+    "Delay between enqueueing a payload and Redis acknowledging it",
+)
+
+REDIS_PENDING = Gauge(
+    "stt_redis_pending",
+    "Payloads buffered in memory waiting for a Redis flush",
+)
+
+REDIS_SPILLED = Counter(
+    "stt_redis_spilled_total",
+    "Payloads written to the spill file because Redis was unavailable or the ring overflowed",
+)
+
+SINK_QUEUE_DEPTH = Gauge(
+    "stt_sink_queue_depth",
+    "Segments waiting in a sink's queue",
+    labelnames=("sink",),
+)
+
+SINK_LAG = Histogram(
+    "stt_sink_lag_seconds",
+    "Delay between a segment being produced and a sink finishing with it",
+    labelnames=("sink",),
+)
+
+SINK_OVERFLOW = Counter(
+    "stt_sink_overflow_total",
+    "Segments dropped or spilled because a sink's queue was full or its handler failed",
+    labelnames=("sink", "policy"),
+)
@@ -1,27 +1,235 @@
-"""Async Redis publisher for transcript payloads."""
+"""Async Redis publishers for transcript payloads."""
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 from redis.asyncio import Redis, from_url
+from redis.exceptions import RedisError
+
+from .metrics import REDIS_FLUSH_SIZE, REDIS_PENDING, REDIS_PUBLISH_LAG, REDIS_SPILLED
 
 
 class RedisPublisher:
     """Publish transcript payloads to a Redis stream."""
 
-    def __init__(self, url: str, stream: str) -> None:
+    def __init__(self, url: str, stream: str, client: Optional[Redis] = None) -> None:
         self.url = url
         self.stream = stream
-        self._client: Redis = from_url(url, decode_responses=True)
+        self._client: Redis = client or from_url(url, decode_responses=True)
 
     async def publish(self, payload: Dict[str, Any]) -> str:
         """Write payload to the configured Redis stream via XADD."""
 
         return await self._client.xadd(
             self.stream,
-            payload,
+            encode_fields(payload),
             maxlen=10000,
             approximate=True,
         )
 
+    async def publish_many(self, payloads: Sequence[Dict[str, Any]]) -> List[str]:
+        """Write several payloads in one pipelined round-trip."""
+
+        if not payloads:
+            return []
+        pipe = self._client.pipeline(transaction=False)
+        for payload in payloads:
+            pipe.xadd(self.stream, encode_fields(payload), maxlen=10000, approximate=True)
+        return await pipe.execute()
+
+
+class BatchingRedisPublisher:
+    """Non-blocking front for :class:`RedisPublisher` that flushes in batches.
+
+    :meth:`submit` only appends to a bounded in-memory ring. A background task
+    flushes the ring through one pipelined round-trip whenever ``max_batch``
+    payloads are waiting or ``max_delay`` seconds have passed. Failed flushes
+    are retried with backoff; after ``max_retries`` the batch (and anything
+    pushed out of a full ring) is appended to ``spill_path`` as JSONL and
+    replayed after the next successful flush.
+    """
+
+    def __init__(
+        self,
+        publisher: RedisPublisher,
+        *,
+        max_batch: int = 100,
+        max_delay: float = 0.05,
+        capacity: int = 10000,
+        max_retries: int = 3,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self.publisher = publisher
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self.capacity = max(self.max_batch, capacity)
+        self.max_retries = max(1, max_retries)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._ring: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._ring)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, payload: Dict[str, Any]) -> None:
+        """Queue a payload without awaiting Redis."""
+
+        if len(self._ring) >= self.capacity:
+            _, dropped = self._ring.popleft()
+            self._spill([dropped])
+        self._ring.append((time.monotonic(), payload))
+        REDIS_PENDING.set(len(self._ring))
+        if len(self._ring) >= self.max_batch:
+            self._wakeup.set()
+
+    async def close(self) -> None:
+        """Flush everything still buffered and stop the background task."""
+
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        while self._ring:
+            await self._flush_once()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._ring:
+                await self._flush_once()
+            while len(self._ring) >= self.max_batch:
+                await self._flush_once()
+
+    async def _flush_once(self) -> None:
+        batch = [self._ring.popleft() for _ in range(min(self.max_batch, len(self._ring)))]
+        REDIS_PENDING.set(len(self._ring))
+        if not batch:
+            return
+        payloads = [payload for _, payload in batch]
+        if await self._publish_with_retry(payloads):
+            now = time.monotonic()
+            REDIS_FLUSH_SIZE.observe(len(batch))
+            for enqueued, _ in batch:
+                REDIS_PUBLISH_LAG.observe(now - enqueued)
+            await self._replay_spill()
+        else:
+            self._spill(payloads)
+
+    async def _publish_with_retry(self, payloads: List[Dict[str, Any]]) -> bool:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self.publisher.publish_many(payloads)
+                return True
+            except (RedisError, OSError) as exc:
+                print(
+                    f"[Sink][Redis] flush of {len(payloads)} failed "
+                    f"(attempt {attempt}/{self.max_retries}): {exc}"
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(2 ** (attempt - 1) * 0.5, 5))
+        return False
+
+    def _spill(self, payloads: List[Dict[str, Any]]) -> None:
+        REDIS_SPILLED.inc(len(payloads))
+        if self.spill_path is None:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as fh:
+            for payload in payloads:
+                fh.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+    async def _replay_spill(self) -> None:
+        """Republish spilled payloads after Redis recovered.
+
+        A ``.replay`` file left by a run that crashed mid-replay is finished
+        first; only then is the current spill file claimed, so neither
+        overwrites the other. Batches that fail again are spilled anew.
+        """
+
+        if self.spill_path is None:
+            return
+        replay_path = self.spill_path.with_name(self.spill_path.name + ".replay")
+        if replay_path.exists():
+            await self._replay_file(replay_path)
+        if self.spill_path.exists():
+            os.replace(self.spill_path, replay_path)
+            await self._replay_file(replay_path)
+
+    async def _replay_file(self, replay_path: Path) -> None:
+        batch: List[Dict[str, Any]] = []
+        with open(replay_path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    batch.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+                if len(batch) >= self.max_batch:
+                    if not await self._publish_with_retry(batch):
+                        self._spill(batch)
+                    batch = []
+        if batch and not await self._publish_with_retry(batch):
+            self._spill(batch)
+        replay_path.unlink(missing_ok=True)
+
+def encode_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce payload values into types XADD accepts (nested values as JSON)."""
+
+    encoded: Dict[str, Any] = {}
+    for key, value in payload.items():
+        if value is None:
+            encoded[key] = ""
+        elif isinstance(value, bool):
+            encoded[key] = int(value)
+        elif isinstance(value, (str, int, float, bytes)):
+            encoded[key] = value
+        else:
+            encoded[key] = json.dumps(value, ensure_ascii=False)
+    return encoded
+
+
+def decode_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of :func:`encode_fields` for entries read back from a stream."""
+
+    decoded: Dict[str, Any] = {}
+    for key, value in (fields or {}).items():
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        if value == "":
+            decoded[key] = None
+        elif key in _NUMERIC_FIELDS:
+            try:
+                decoded[key] = float(value)
+            except (TypeError, ValueError):
+                decoded[key] = value
+        elif isinstance(value, str) and value[:1] in {"[", "{"}:
+            try:
+                decoded[key] = json.loads(value)
+            except json.JSONDecodeError:
+                decoded[key] = value
+        else:
+            decoded[key] = value
+    return decoded
+
+
+_NUMERIC_FIELDS = {"start", "end", "confidence", "ts"}
@@ -0,0 +1,175 @@
+"""Fan-out of transcript segments to independent, bounded sink workers."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .metrics import SINK_LAG, SINK_OVERFLOW, SINK_QUEUE_DEPTH
+
+Handler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+OVERFLOW_POLICIES = {"block", "drop_oldest", "drop_newest", "spill"}
+
+
+class Sink:
+    """One consumer with its own queue and worker task.
+
+    Async handlers run on the event loop; plain functions (file appends) run in
+    a worker thread so they cannot stall segment consumption. When the queue
+    is full the ``overflow`` policy decides: ``block`` waits for room,
+    ``drop_oldest``/``drop_newest`` discard a segment, and ``spill`` appends
+    the new segment to ``spill_dir/<name>.jsonl`` instead. Spilled segments
+    are replayed through the handler when the worker next starts, before any
+    new segment. The default is ``block`` so no sink loses data unless a
+    lossy policy is chosen explicitly. A segment whose handler raises is
+    spilled too (when ``spill_dir`` is set) and counted with the ``error``
+    policy label.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        maxsize: int = 1000,
+        overflow: str = "block",
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        self.name = name
+        self.handler = handler
+        self.overflow = overflow
+        self.spill_path = Path(spill_dir) / f"{name}.jsonl" if spill_dir else None
+        self._is_async = inspect.iscoroutinefunction(handler)
+        self._queue: "asyncio.Queue[Optional[Tuple[float, Dict[str, Any]]]]" = asyncio.Queue(max(1, maxsize))
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._claim_spill()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, payload: Dict[str, Any], produced_at: float) -> None:
+        item = (produced_at, payload)
+        if self.overflow == "block":
+            await self._queue.put(item)
+        elif self._queue.full():
+            SINK_OVERFLOW.labels(sink=self.name, policy=self.overflow).inc()
+            if self.overflow == "drop_oldest":
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._queue.put_nowait(item)
+            elif self.overflow == "spill":
+                self._spill(payload)
+        else:
+            self._queue.put_nowait(item)
+        SINK_QUEUE_DEPTH.labels(sink=self.name).set(self._queue.qsize())
+
+    async def close(self) -> None:
+        """Process everything already queued, then stop the worker."""
+
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        await self._replay_spill()
+        while True:
+            item = await self._queue.get()
+            try:
+                if item is None:
+                    return
+                produced_at, payload = item
+                await self._handle(payload)
+                SINK_LAG.labels(sink=self.name).observe(time.monotonic() - produced_at)
+            finally:
+                self._queue.task_done()
+                SINK_QUEUE_DEPTH.labels(sink=self.name).set(self._queue.qsize())
+
+    async def _handle(self, payload: Dict[str, Any]) -> None:
+        try:
+            if self._is_async:
+                await self.handler(payload)
+            else:
+                await asyncio.to_thread(self.handler, payload)
+        except Exception as exc:  # keep the sink alive on handler errors
+            print(f"[Sink][{self.name}] handler failed: {exc}")
+            SINK_OVERFLOW.labels(sink=self.name, policy="error").inc()
+            self._spill(payload)  # retried on the next start
+
+    def _replay_path(self) -> Optional[Path]:
+        if self.spill_path is None:
+            return None
+        return self.spill_path.with_name(self.spill_path.name + ".replay")
+
+    def _claim_spill(self) -> None:
+        """Set aside segments spilled by a previous run for replay.
+
+        Renaming makes later spills start a fresh file; a replay file left by
+        an interrupted run is kept and replayed first.
+        """
+
+        replaying = self._replay_path()
+        if replaying is None or replaying.exists() or not self.spill_path.exists():
+            return
+        os.replace(self.spill_path, replaying)
+
+    async def _replay_spill(self) -> None:
+        """Feed claimed spilled segments back through the handler, oldest first."""
+
+        replaying = self._replay_path()
+        if replaying is None or not replaying.exists():
+            return
+        replayed = 0
+        with open(replaying, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    payload = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(payload, dict):
+                    await self._handle(payload)
+                    replayed += 1
+        replaying.unlink()
+        print(f"[Sink][{self.name}] replayed {replayed} spilled segments")
+
+    def _spill(self, payload: Dict[str, Any]) -> None:
+        if self.spill_path is None:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+class SinkPipeline:
+    """Hand each segment to every sink without waiting for any of them."""
+
+    def __init__(self, sinks: List[Sink]) -> None:
+        self.sinks = sinks
+
+    def start(self) -> None:
+        for sink in self.sinks:
+            sink.start()
+
+    async def submit(self, payload: Dict[str, Any]) -> None:
+        produced_at = time.monotonic()
+        for sink in self.sinks:
+            # Each sink gets its own copy so thread-run handlers never share a dict.
+            await sink.put(dict(payload), produced_at)
+
+    async def close(self) -> None:
+        for sink in self.sinks:
+            await sink.close()
@@ -71,6 +71,41 @@ def test_ingest_transcript_appends(api_client):
     assert data["text"] == "hello"
 
 
+def test_transcript_service_shared_across_requests(api_client):
+    client, *_ = api_client
+    from src.api.settings import get_settings
+
+    settings = client.app.dependency_overrides[get_settings]()
+    registry = client.app.state.services
+    for text in ("one", "two"):
+        resp = client.post("/v1/ingest-transcript", json={"text": text}, headers=_auth_headers())
+        assert resp.status_code == 200
+    service = registry.transcript_service(settings)
+    assert service is registry.transcript_service(settings)
+    assert service.whisper is registry.whisper_engine(settings)
+    assert len(registry._transcript) == 1
+
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_waits_for_a_free_connection(tmp_path):
+    from redis.asyncio import BlockingConnectionPool
+
+    from src.api.services.registry import ServiceRegistry
+    from src.api.settings import APISettings
+
+    settings = APISettings(
+        data_dir=str(tmp_path),
+        redis_url="redis://localhost:6379/0",
+        redis_max_connections=3,
+        redis_pool_timeout_sec=2.5,
+    )
+    client = ServiceRegistry().redis_client(settings)
+    pool = client.connection_pool
+    assert isinstance(pool, BlockingConnectionPool)
+    assert (pool.max_connections, pool.timeout) == (3, 2.5)
+    await client.aclose()
+
 def test_ledger_endpoint(api_client):
     client, _, ledger, _ = api_client
     ts = datetime(2024, 11, 1).timestamp()
@@ -144,6 +179,38 @@ def test_transcribe_with_metadata(api_client):
     assert data["speech_segments"][0]["start_utc"] == "2024-01-01T00:00:00Z"
 
 
+def test_transcribe_retry_is_deduplicated(api_client):
+    client, transcripts, *_ = api_client
+    audio_path = Path("tests/assets/sample_cs.wav")
+    bodies = []
+    for _ in range(2):
+        resp = client.post(
+            "/v1/transcribe",
+            headers=_auth_headers(),
+            files={"file": (audio_path.name, audio_path.read_bytes(), "audio/wav")},
+            data={"session_start": "2024-01-01T00:00:00Z"},
+        )
+        assert resp.status_code == 200
+        bodies.append(resp.json())
+    assert bodies[0]["chunk_id"] == bodies[1]["chunk_id"]
+    lines = [line for line in transcripts.read_text().splitlines() if line]
+    assert len(lines) == 1
+
+
+def test_identical_anonymous_uploads_are_both_recorded(api_client):
+    client, transcripts, *_ = api_client
+    audio_path = Path("tests/assets/sample_cs.wav")
+    for _ in range(2):
+        resp = client.post(
+            "/v1/transcribe",
+            headers=_auth_headers(),
+            files={"file": (audio_path.name, audio_path.read_bytes(), "audio/wav")},
+        )
+        assert resp.status_code == 200
+    lines = [line for line in transcripts.read_text().splitlines() if line]
+    assert len(lines) == 2
+
+
 def test_batch_transcribe_endpoint(api_client, tmp_path):
     client, transcripts, *_ = api_client
     audio_path = Path("tests/assets/sample_cs.wav")
@@ -260,6 +327,103 @@ def test_rate_limit_enforced(tmp_path):
     client = TestClient(app)
     headers = {"X-API-Key": "test-key"}
 
-    assert client.get("/healthz", headers=headers).status_code == 200
+    first = client.get("/healthz", headers=headers)
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Limit"] == "1"
+    assert first.headers["X-RateLimit-Remaining"] == "0"
     resp = client.get("/healthz", headers=headers)
     assert resp.status_code == 429
+    assert resp.headers["X-RateLimit-Remaining"] == "0"
+    assert int(resp.headers["Retry-After"]) >= 1
+
+
+def test_usage_reports_remaining_quota(api_client):
+    client, *_ = api_client
+    client.get("/healthz", headers=_auth_headers())
+    resp = client.get("/v1/usage", headers=_auth_headers())
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["rate_limit_per_minute"] == 120
+    assert body["rate_limit_burst"] == 120
+    assert body["rate_limit_remaining"] == 118
+    assert resp.headers["X-RateLimit-Remaining"] == "118"
+
+
+def test_summary_async_mode_returns_202_then_done(api_client, monkeypatch):
+    client, _, ledger, summary_dir = api_client
+    ledger.write_text(
+        json.dumps({"start": 1730462400.0, "ts": 1730462400.0, "input": "ahoj"}) + "\n",
+        encoding="utf-8",
+    )
+    calls = []
+
+    async def fake_summarize_day(day, entries, *, cfg=None, output_dir=None, **_):
+        calls.append(day)
+        (output_dir / f"summary_{day}.md").write_text("## async", encoding="utf-8")
+
+    monkeypatch.setattr("src.api.routers.summary.summarize_day", fake_summarize_day)
+    with client:
+        resp = client.get("/v1/summary?date=2024-11-01&wait=false", headers=_auth_headers())
+        assert resp.status_code == 202
+        assert resp.headers["location"] == "/v1/summary/status?date=2024-11-01"
+
+        status_resp = client.get("/v1/summary/status?date=2024-11-01", headers=_auth_headers())
+        assert status_resp.json()["status"] in {"running", "done"}
+
+        resp = client.get("/v1/summary?date=2024-11-01", headers=_auth_headers())
+        assert resp.status_code == 200
+        assert resp.json()["summary_md"] == "## async"
+    assert calls == ["2024-11-01"]
+
+
+def _write_ledger_day(ledger, count):
+    ts = datetime(2024, 11, 1).timestamp()
+    with open(ledger, "w", encoding="utf-8") as fh:
+        for i in range(count):
+            fh.write(json.dumps({"input": f"e{i}", "start": ts + i, "session_id": 1}) + "\n")
+
+
+def test_ledger_cursor_pagination(api_client):
+    client, _, ledger, _ = api_client
+    _write_ledger_day(ledger, 5)
+
+    seen = []
+    resp = client.get("/v1/ledger?date=2024-11-01&limit=2", headers=_auth_headers())
+    body = resp.json()
+    assert body["count"] == 5
+    seen += [e["input"] for e in body["entries"]]
+    while body["next_cursor"]:
+        resp = client.get(
+            f"/v1/ledger?date=2024-11-01&limit=2&cursor={body['next_cursor']}", headers=_auth_headers()
+        )
+        body = resp.json()
+        seen += [e["input"] for e in body["entries"]]
+    assert seen == ["e0", "e1", "e2", "e3", "e4"]
+
+    bad = client.get("/v1/ledger?date=2024-11-01&cursor=%%%", headers=_auth_headers())
+    assert bad.status_code == 400
+
+
+def test_ledger_stream_ndjson(api_client):
+    client, _, ledger, _ = api_client
+    _write_ledger_day(ledger, 3)
+
+    resp = client.get("/v1/ledger/stream?date=2024-11-01&limit=2", headers=_auth_headers())
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line.get("input") for line in lines[:2]] == ["e0", "e1"]
+    cursor = lines[2]["next_cursor"]
+
+    rest = client.get(f"/v1/ledger/stream?date=2024-11-01&cursor={cursor}", headers=_auth_headers())
+    assert [json.loads(line)["input"] for line in rest.text.splitlines()] == ["e2"]
+
+
+def test_ledger_falls_back_when_daily_file_has_no_entries(api_client):
+    client, _, ledger, summary_dir = api_client
+    _write_ledger_day(ledger, 2)
+    (summary_dir / "ledger_2024-11-01.jsonl").write_text("\n{broken\n", encoding="utf-8")
+
+    resp = client.get("/v1/ledger?date=2024-11-01", headers=_auth_headers())
+    assert resp.status_code == 200
+    assert [e["input"] for e in resp.json()["entries"]] == ["e0", "e1"]
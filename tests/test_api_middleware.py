@@ -0,0 +1,66 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.api.metrics import REQUEST_COUNTER, REQUEST_LATENCY
+from src.api.middleware import install_middleware
+
+
+def _app(ip_limit: int = 0) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    install_middleware(app, ip_limit)
+    return app
+
+
+def _count(path: str, status: int) -> float:
+    return REQUEST_COUNTER.labels(path=path, method="GET", status=status)._value.get()
+
+
+def test_metrics_are_labelled_by_route_template() -> None:
+    client = TestClient(_app())
+    before = _count("/items/{item_id}", 200)
+    unmatched_before = _count("unmatched", 404)
+    latency_before = REQUEST_LATENCY.labels(path="/items/{item_id}", method="GET")._sum.get()
+
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+    assert client.get("/nope/123").status_code == 404
+
+    assert _count("/items/{item_id}", 200) == before + 2
+    assert _count("unmatched", 404) == unmatched_before + 1
+    assert REQUEST_LATENCY.labels(path="/items/{item_id}", method="GET")._sum.get() > latency_before
+
+
+def test_streaming_responses_pass_through() -> None:
+    client = TestClient(_app())
+    before = _count("/stream", 200)
+
+    resp = client.get("/stream")
+
+    assert resp.text == "0\n1\n2\n"
+    assert _count("/stream", 200) == before + 1
+
+
+def test_ip_guard_rejects_before_routing() -> None:
+    client = TestClient(_app(ip_limit=1))
+    before = _count("/items/{item_id}", 200)
+
+    assert client.get("/items/1").status_code == 200
+    resp = client.get("/items/1")
+
+    assert resp.status_code == 429
+    assert resp.json() == {"detail": "Too many requests"}
+    assert _count("/items/{item_id}", 200) == before + 1
@@ -0,0 +1,195 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.api.services.auth_service import APIKeyStore, AuthService, RateLimiter, RateLimitError
+
+
+def _usage(path: Path) -> dict:
+    return {item["key"]: item["usage_count"] for item in json.loads(path.read_text(encoding="utf-8"))}
+
+
+@pytest.mark.asyncio
+async def test_usage_is_write_behind_and_flushed_on_close(tmp_path) -> None:
+    store_path = tmp_path / "keys.json"
+    service = AuthService(store_path, [], None, 0, usage_flush_sec=3600)
+    record = service.create_key(owner="team")
+    assert _usage(store_path) == {record.key: 0}  # metadata writes are synchronous
+
+    for _ in range(3):
+        await service.validate_and_track(record.key)
+    assert _usage(store_path) == {record.key: 0}
+    assert service.usage_snapshot(record.key)["usage_count"] == 3
+
+    await service.aclose()
+    assert _usage(store_path) == {record.key: 3}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_flush_merges_counts_from_other_writers(tmp_path) -> None:
+    store_path = tmp_path / "keys.json"
+    key = AuthService(store_path, [], None, 0).create_key(owner="team").key
+    worker_a = APIKeyStore(store_path)
+    worker_b = APIKeyStore(store_path)
+
+    worker_a.record_usage(worker_a.get(key), 1731300000.0)
+    worker_b.record_usage(worker_b.get(key), 1731300001.0)
+    worker_b.record_usage(worker_b.get(key), 1731300002.0)
+    assert worker_a.flush() and worker_b.flush()
+    assert not worker_a.flush()
+
+    assert _usage(store_path) == {key: 3}
+    stored = json.loads(store_path.read_text(encoding="utf-8"))[0]
+    assert stored["requests_today"] == 3
+    assert stored["last_used"] == 1731300002.0
+
+
+def test_revoke_from_cli_survives_usage_flush(tmp_path) -> None:
+    store_path = tmp_path / "keys.json"
+    cli = AuthService(store_path, [], None, 0)
+    key = cli.create_key(owner="team").key
+    server = APIKeyStore(store_path)
+
+    server.record_usage(server.get(key), 1731300000.0)
+    cli.revoke_key(key)
+    server.flush()
+
+    assert server.get(key).revoked is True
+    assert server.get(key).usage_count == 1
+
+
+@pytest.mark.asyncio
+async def test_key_deleted_from_file_stays_deleted_after_flush(tmp_path) -> None:
+    store_path = tmp_path / "keys.json"
+    cli = AuthService(store_path, [], None, 0)
+    keep, drop = cli.create_key(owner="a").key, cli.create_key(owner="b").key
+    server = AuthService(store_path, [], None, 0, usage_flush_sec=3600)
+    await server.validate_and_track(keep)
+    await server.validate_and_track(drop)
+
+    items = json.loads(store_path.read_text(encoding="utf-8"))
+    store_path.write_text(json.dumps([i for i in items if i["key"] != drop]), encoding="utf-8")
+    assert server.store.flush()
+
+    assert _usage(store_path) == {keep: 1}
+    assert server.store.get(drop) is None
+    server.store._forced_at -= 3600
+    with pytest.raises(ValueError):
+        await server.validate_and_track(drop)
+    await server.aclose()
+
+
+@pytest.mark.asyncio
+async def test_out_of_band_keys_are_picked_up_and_misses_are_cached(tmp_path, monkeypatch) -> None:
+    store_path = tmp_path / "keys.json"
+    server = AuthService(store_path, [], None, 0, usage_flush_sec=3600, reload_interval=3600)
+    reloads = []
+    original = server.store.maybe_reload
+    monkeypatch.setattr(server.store, "maybe_reload", lambda force=False: reloads.append(force) or original(force))
+
+    for _ in range(50):
+        with pytest.raises(ValueError):
+            await server.validate_and_track("dm_guess")
+    assert reloads.count(True) == 1  # later misses come from the negative cache
+
+    cli = AuthService(store_path, [], None, 0)
+    created = cli.create_key(owner="team")
+    server.store._forced_at -= 3600  # past the forced-reload throttle
+    record = await server.validate_and_track(created.key)
+    assert record.owner == "team"
+
+    cli.revoke_key(created.key)
+    server.store._checked_at -= 3600  # let the periodic mtime check run
+    with pytest.raises(ValueError):
+        await server.validate_and_track(created.key)
+    await server.aclose()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_refills(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr("src.api.services.auth_service.time.monotonic", lambda: clock[0])
+    limiter = RateLimiter(None, limit_per_minute=60, burst=3)
+
+    decisions = [await limiter.allow("k") for _ in range(4)]
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions] == [2, 1, 0, 0]
+    assert decisions[-1].retry_after == pytest.approx(1.0)
+    assert decisions[-1].reset_after == pytest.approx(3.0)
+
+    clock[0] += 1.0
+    assert (await limiter.allow("k")).allowed
+    assert not (await limiter.allow("k")).allowed
+
+
+@pytest.mark.asyncio
+async def test_per_key_limits_override_service_default(tmp_path) -> None:
+    service = AuthService(tmp_path / "keys.json", [], None, 1000, usage_flush_sec=3600)
+    strict = service.create_key(owner="strict", rate_limit_per_minute=1)
+    open_key = service.create_key(owner="open", rate_limit_per_minute=0)
+
+    _, decision = await service.authenticate(strict.key)
+    assert (decision.limit, decision.remaining) == (1, 0)
+    with pytest.raises(RateLimitError) as excinfo:
+        await service.authenticate(strict.key)
+    assert excinfo.value.decision.retry_after > 0
+
+    for _ in range(5):
+        _, decision = await service.authenticate(open_key.key)
+    assert decision.unlimited
+
+    reloaded = APIKeyStore(tmp_path / "keys.json")
+    assert reloaded.get(strict.key).rate_limit_per_minute == 1
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_survives_unrelated_reloads_and_throttles_floods(tmp_path) -> None:
+    store_path = tmp_path / "keys.json"
+    server = AuthService(store_path, [], None, 0, usage_flush_sec=3600, reload_interval=3600)
+    other_worker = AuthService(store_path, [], None, 0, usage_flush_sec=3600)
+    known = other_worker.create_key(owner="team")
+
+    with pytest.raises(ValueError):
+        await server.validate_and_track("dm_guess")
+    assert len(server._negative) == 1
+
+    # Another worker's usage flush changes the file without adding keys.
+    await other_worker.validate_and_track(known.key)
+    await other_worker.aclose()
+    server.store._forced_at -= 3600
+    with pytest.raises(ValueError):
+        await server.validate_and_track("dm_other")
+    assert len(server._negative) == 2
+
+    # Distinct invalid keys within the throttle window neither reload nor get cached.
+    for i in range(20):
+        with pytest.raises(ValueError):
+            await server.validate_and_track(f"dm_flood_{i}")
+    assert len(server._negative) == 2
+    await server.aclose()
+
+
+def test_flush_does_not_hold_the_record_lock_during_file_io(tmp_path, monkeypatch) -> None:
+    store_path = tmp_path / "keys.json"
+    key = AuthService(store_path, [], None, 0).create_key(owner="team").key
+    store = APIKeyStore(store_path)
+    store.record_usage(store.get(key), 1731300000.0)
+    original = store._write_merged
+    observed = []
+
+    def _write(*args):
+        observed.append(store._lock.acquire(blocking=False))
+        store._lock.release()
+        store.record_usage(store.get(key), 1731300001.0)  # counted mid-flush
+        return original(*args)
+
+    monkeypatch.setattr(store, "_write_merged", _write)
+    assert store.flush()
+    assert observed == [True]
+    assert _usage(store_path) == {key: 1}
+    assert store.get(key).usage_count == 2
+    monkeypatch.undo()
+    assert store.flush()
+    assert _usage(store_path) == {key: 2}
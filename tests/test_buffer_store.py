@@ -1,6 +1,15 @@
 import json
+import time
 
-from src.stt_core.buffer_store import BufferStore
+from src.stt_core.buffer_store import (
+    BufferStore,
+    SegmentedBufferStore,
+    _read_index,
+    iter_segment_records,
+    open_buffer_store,
+    segment_paths,
+    tail_records,
+)
 
 
 def test_buffer_store_append_and_truncate(tmp_path) -> None:
@@ -20,3 +29,89 @@ def test_buffer_store_append_and_truncate(tmp_path) -> None:
     assert "line-0" not in texts  # oldest entries trimmed
     assert texts[-1] == "line-4"
     assert all("ts" in entry for entry in entries)
+
+
+def test_segmented_store_rotates_and_drops_oldest(tmp_path) -> None:
+    path = tmp_path / "transcripts.jsonl"
+    store = SegmentedBufferStore(str(path), max_mb=1, segment_mb=1, flush_every=4)
+    store.segment_bytes = 300
+    store.max_bytes = 700
+
+    for idx in range(20):
+        store.append({"text": f"line-{idx}", "blob": "x" * 60, "ts": 1000.0 + idx})
+    store.flush()
+
+    segments = segment_paths(str(path))
+    assert len(segments) >= 2
+    assert all(seg.with_suffix(".idx").exists() for seg in segments)
+    assert not path.exists()  # legacy single file is never written
+
+    texts = [entry["text"] for entry in store.iter_records()]
+    assert "line-0" not in texts  # oldest segment deleted whole
+    assert texts[-1] == "line-19"
+    assert [e["text"] for e in store.tail(2)] == ["line-18", "line-19"]
+    store.close()
+
+
+def test_segmented_store_seeks_by_time_and_resumes(tmp_path) -> None:
+    path = tmp_path / "transcripts.jsonl"
+    store = SegmentedBufferStore(str(path), max_mb=4, segment_mb=1, flush_every=100)
+    for idx in range(10):
+        store.append({"text": f"line-{idx}", "ts": 2000.0 + idx})
+    store.close()
+
+    reopened = open_buffer_store(str(path), max_mb=4, segment_mb=1)
+    reopened.append({"text": "line-10", "ts": 2010.0})
+
+    window = [entry["text"] for entry in reopened.iter_records(since=2003.0, until=2005.0)]
+    assert window == ["line-3", "line-4", "line-5"]
+    assert tail_records(str(path), 1)[0]["text"] == "line-10"
+    reopened.close()
+
+
+def test_segmented_store_two_writers_keep_index_offsets_valid(tmp_path) -> None:
+    path = tmp_path / "transcripts.jsonl"
+    api = SegmentedBufferStore(str(path), segment_mb=1, flush_every=2, flush_interval=0)
+    runner = SegmentedBufferStore(str(path), segment_mb=1, flush_every=2, flush_interval=0)
+    api.segment_bytes = runner.segment_bytes = 400
+
+    for idx in range(12):
+        writer = api if idx % 3 else runner
+        writer.append({"text": f"line-{idx}", "ts": 3000.0 + idx})
+        writer.flush()
+    api.close()
+    runner.close()
+
+    for segment in segment_paths(str(path)):
+        payload = segment.read_bytes()
+        for _, offset in _read_index(segment.with_suffix(".idx")):
+            assert offset == 0 or payload[offset - 1 : offset] == b"\n"
+    window = [e["text"] for e in iter_segment_records(str(path), since=3004.0, until=3006.0)]
+    assert window == ["line-4", "line-5", "line-6"]
+
+
+
+def test_segmented_store_filters_out_of_order_timestamps(tmp_path) -> None:
+    path = tmp_path / "transcripts.jsonl"
+    store = SegmentedBufferStore(str(path), segment_mb=1, flush_every=2, flush_interval=0)
+    store.segment_bytes = 60  # a few records per segment
+    for ts in (100, 300, 200, 400, 150, 500):
+        store.append({"text": f"t{ts}", "ts": float(ts)})
+    store.close()
+
+    assert len(segment_paths(str(path))) > 1
+    window = [e["text"] for e in iter_segment_records(str(path), until=250.0)]
+    assert window == ["t100", "t200", "t150"]
+    window = [e["text"] for e in iter_segment_records(str(path), since=180.0, until=450.0)]
+    assert window == ["t300", "t200", "t400"]
+
+def test_segmented_store_flushes_on_a_timer(tmp_path) -> None:
+    path = tmp_path / "transcripts.jsonl"
+    store = SegmentedBufferStore(str(path), segment_mb=1, flush_every=100, flush_interval=0.05)
+    store.append({"text": "last", "ts": 4000.0})
+
+    deadline = time.monotonic() + 2.0
+    while not tail_records(str(path), 1) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert tail_records(str(path), 1)[0]["text"] == "last"
+    store.close()
@@ -4,8 +4,15 @@ from types import SimpleNamespace
 import pytest
 
 from src.gpt_postproc.config import GPTConfig
-from src.gpt_postproc.daily_summary import summarize_day
+from src.gpt_postproc.daily_summary import (
+    MERGE_PROMPT,
+    PARTIAL_PROMPT,
+    REDUCE_PROMPT,
+    run_daily_summaries,
+    summarize_day,
+)
 from src.gpt_postproc.ledger_store import LedgerStore
+from src.gpt_postproc.rate_limit import estimate_tokens
 
 
 def test_group_by_day(tmp_path) -> None:
@@ -61,3 +68,86 @@ async def test_summarize_day_outputs(tmp_path) -> None:
 
     with open(summary_out, "r", encoding="utf-8") as fh:
         assert "Souhrn dne" in fh.read()
+
+
+class _CountingCompletions:
+    def __init__(self) -> None:
+        self.prompts = []
+
+    async def create(self, *, messages, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="[]---Souhrn"))]
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_daily_summaries_only_touches_changed_days(tmp_path) -> None:
+    ledger = LedgerStore(str(tmp_path / "ledger.jsonl"))
+    ledger.append({"start": 1731300000.0, "ts": 1731300000.0, "input": "den 1"})
+    ledger.append({"start": 1731386400.0, "ts": 1731386400.0, "input": "den 2"})
+    cfg = GPTConfig(api_key="k", model="mock", ledger_path=ledger.path)
+    completions = _CountingCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    out_dir = tmp_path / "summaries"
+
+    first = await run_daily_summaries(cfg=cfg, client=client, output_dir=out_dir)
+    assert len(first) == 2
+    assert await run_daily_summaries(cfg=cfg, client=client, output_dir=out_dir) == []
+
+    ledger.append({"start": 1731300100.0, "ts": 1731300100.0, "input": "den 1 znovu"})
+    third = await run_daily_summaries(cfg=cfg, client=client, output_dir=out_dir)
+    assert third == [first[0]]
+    assert len(completions.prompts) == 3
+
+    rebuilt = await run_daily_summaries(cfg=cfg, client=client, output_dir=out_dir, full_rebuild=True)
+    assert rebuilt == first
+
+
+@pytest.mark.asyncio
+async def test_long_day_is_map_reduced_and_reuses_partials(tmp_path) -> None:
+    ledger = LedgerStore(str(tmp_path / "ledger.jsonl"))
+    for i in range(6):
+        ledger.append({"start": 1731300000.0 + i, "ts": 1731300000.0 + i, "input": "x" * 40})
+    cfg = GPTConfig(api_key="k", model="mock", ledger_path=ledger.path, summary_chunk_tokens=25)
+    completions = _CountingCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    await run_daily_summaries(cfg=cfg, client=client, output_dir=tmp_path)
+    partial_calls = [p for p in completions.prompts if p.startswith(PARTIAL_PROMPT)]
+    assert len(partial_calls) == 3  # two entries per chunk
+    assert completions.prompts[-1].startswith(REDUCE_PROMPT)
+
+    completions.prompts.clear()
+    ledger.append({"start": 1731300010.0, "ts": 1731300010.0, "input": "y" * 40})
+    await run_daily_summaries(cfg=cfg, client=client, output_dir=tmp_path)
+    # Only the new (fourth) chunk is summarized again, then the reduce step.
+    assert len(completions.prompts) == 2
+
+
+class _VerboseCompletions(_CountingCompletions):
+    """Partial summaries that never shrink: every reply is longer than the budget."""
+
+    async def create(self, *, messages, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="z" * 400))]
+        )
+
+
+@pytest.mark.asyncio
+async def test_reduce_stays_within_budget_when_partials_do_not_shrink(tmp_path) -> None:
+    entries = [{"session_id": 1, "input": "x" * 80} for _ in range(8)]
+    cfg = GPTConfig(api_key="k", model="mock", summary_chunk_tokens=40)
+    completions = _VerboseCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    await summarize_day("2024-11-11", entries, cfg=cfg, client=client, output_dir=tmp_path)
+
+    final = completions.prompts[-1]
+    assert final.startswith(REDUCE_PROMPT)
+    body = final[len(REDUCE_PROMPT):]
+    assert estimate_tokens(body, completion_tokens=0) <= cfg.summary_chunk_tokens + 1
+    assert len(completions.prompts) < 30  # levels make progress and terminate
+    reduce_levels = [p for p in completions.prompts[:-1] if not p.startswith(PARTIAL_PROMPT)]
+    assert reduce_levels and all(p.startswith(MERGE_PROMPT) for p in reduce_levels)
@@ -72,3 +72,94 @@ def test_export_respects_category_map(tmp_path):
     export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
     data = output.read_text(encoding="utf-8")
     assert "Expenses:Household:Groceries" in data
+
+
+def _append_jsonl(path: Path, rows: list[dict]) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def test_incremental_export_appends_only_new_entries(tmp_path):
+    from beancount.loader import load_file
+
+    ledger = tmp_path / "ledger.jsonl"
+    _write_jsonl(ledger, [{"type": "expense", "category": "Food", "amount": 120, "start": 1731300000.0}])
+    output = tmp_path / "finance" / "ledger.beancount"
+    cfg = FinanceConfig.from_inputs()
+
+    first = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (first.mode, first.written) == ("full", 1)
+
+    _append_jsonl(ledger, [{"type": "income", "category": "Salary", "amount": 5000, "start": 1731386400.0}])
+    second = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (second.mode, second.total, second.written) == ("incremental", 1, 1)
+
+    third = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (third.mode, third.total) == ("incremental", 0)
+
+    accounts = (tmp_path / "finance" / "ledger.accounts.beancount").read_text(encoding="utf-8")
+    assert "open Income:Salary" in accounts
+    entries, errors, _ = load_file(str(output))
+    assert not errors
+    assert sum(1 for e in entries if type(e).__name__ == "Transaction") == 2
+
+    rebuilt = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg, full_rebuild=True)
+    assert (rebuilt.mode, rebuilt.written) == ("full", 2)
+
+
+def test_incremental_export_rebuilds_when_input_is_rewritten(tmp_path):
+    ledger = tmp_path / "ledger.jsonl"
+    rows = [{"type": "expense", "category": "Food", "amount": n, "start": 1731300000.0} for n in (1, 2, 3)]
+    _write_jsonl(ledger, rows)
+    output = tmp_path / "ledger.beancount"
+    cfg = FinanceConfig.from_inputs()
+    export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+
+    _write_jsonl(ledger, rows[:1])
+    stats = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (stats.mode, stats.written) == ("full", 1)
+
+
+def test_full_export_keeps_unterminated_last_line(tmp_path):
+    ledger = tmp_path / "ledger.jsonl"
+    _write_jsonl(ledger, [{"type": "expense", "category": "Food", "amount": 1, "start": 1731300000.0}])
+    with ledger.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"type": "expense", "category": "Food", "amount": 2, "start": 1731300000.0}))
+    output = tmp_path / "ledger.beancount"
+    cfg = FinanceConfig.from_inputs()
+
+    stats = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (stats.mode, stats.written) == ("full", 2)
+
+    # A half-written line is still deferred to the next incremental run.
+    with ledger.open("a", encoding="utf-8") as handle:
+        handle.write('\n{"type": "expense", "amount": 3, "sta')
+    partial = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (partial.mode, partial.total) == ("incremental", 0)
+    with ledger.open("a", encoding="utf-8") as handle:
+        handle.write('rt": 1731300000.0}\n')
+    completed = export_beancount(inputs=[str(ledger)], output=str(output), config=cfg)
+    assert (completed.mode, completed.written) == ("incremental", 1)
+
+
+def test_incremental_export_rebuilds_when_input_is_rewritten_in_place(tmp_path):
+    ledger = tmp_path / "ledger_2024-11-11.jsonl"
+    coffee = {"type": "expense", "category": "Food", "amount": 3, "description": "coffee", "start": 1731300000.0}
+    rent = {"type": "expense", "category": "Housing", "amount": 900, "description": "rent", "start": 1731300000.0}
+    tea = {"type": "expense", "category": "Food", "amount": 2, "description": "tea", "start": 1731300000.0}
+    _write_jsonl(ledger, [coffee])
+    inode = ledger.stat().st_ino
+    output = tmp_path / "ledger.beancount"
+    cfg = FinanceConfig.from_inputs()
+    export_beancount(inputs=[str(tmp_path / "ledger_*.jsonl")], output=str(output), config=cfg)
+
+    with ledger.open("w", encoding="utf-8") as handle:  # same inode, new content
+        for row in (rent, tea):
+            handle.write(json.dumps(row) + "\n")
+    assert ledger.stat().st_ino == inode
+    stats = export_beancount(inputs=[str(tmp_path / "ledger_*.jsonl")], output=str(output), config=cfg)
+
+    assert (stats.mode, stats.written) == ("full", 2)
+    text = output.read_text(encoding="utf-8")
+    assert "rent" in text and "tea" in text and "coffee" not in text
@@ -66,3 +66,26 @@ def test_finance_redirect(finance_client):
     resp = finance_client.get("/finance", headers=_auth(), follow_redirects=False)
     assert resp.status_code in (301, 302, 307)
     assert resp.headers["location"].startswith("http://example.com:5000")
+
+
+@pytest.mark.asyncio
+async def test_finance_cache_reloads_in_background_on_change(tmp_path) -> None:
+    from src.api.services.finance import FinanceLedgerCache
+
+    ledger = tmp_path / "ledger.beancount"
+    _write_beancount(ledger)
+    cache = FinanceLedgerCache(ledger)
+
+    rows = await cache.summaries("2024-11-10")
+    assert [(r.category, float(r.amount)) for r in rows] == [("Expenses:Food", 120.0)]
+    assert await cache.summaries("2024-01-01") == []
+
+    with open(ledger, "a", encoding="utf-8") as fh:
+        fh.write('\n2024-11-10 * "Bistro" "Dinner"\n  Expenses:Food  80 CZK\n  Assets:Cash:DayMind\n')
+
+    # The changed file is served from the old snapshot while the reload runs.
+    stale = await cache.summaries("2024-11-10")
+    assert float(stale[0].amount) == 120.0
+    await cache.reload()
+    fresh = await cache.summaries("2024-11-10")
+    assert float(fresh[0].amount) == 200.0
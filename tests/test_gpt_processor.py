@@ -63,3 +63,81 @@ async def test_process_transcripts_appends_ledger(tmp_path) -> None:
     assert data["gap"] == 0
     assert "Koupil" in data["input"]
     assert "notes" in json.loads(data["gpt_output"])
+
+
+class BatchCompletions:
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, *, messages, **kwargs):
+        prompt = messages[0]["content"]
+        self.calls.append(kwargs.get("response_format"))
+        if kwargs.get("response_format"):
+            # Answer every numbered segment except the last one.
+            count = prompt.count("\n[")
+            content = json.dumps(
+                {"segments": [{"index": i, "output": {"notes": [f"n{i}"]}} for i in range(1, count)]}
+            )
+        else:
+            content = json.dumps({"notes": ["single"]})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=50),
+        )
+
+
+@pytest.mark.asyncio
+async def test_process_transcripts_batches_sessions(tmp_path) -> None:
+    transcript_path = tmp_path / "transcripts.jsonl"
+    ledger_path = tmp_path / "ledger.jsonl"
+    segments = [(0.0, "a"), (2.0, "b"), (4.0, "c"), (200.0, "d")]
+    with open(transcript_path, "w", encoding="utf-8") as fh:
+        for start, text in segments:
+            fh.write(json.dumps({"text": text, "start": start, "end": start + 1}) + "\n")
+
+    cfg = GPTConfig(
+        api_key="test-key",
+        model="mock",
+        input_path=str(transcript_path),
+        ledger_path=str(ledger_path),
+        batch_mode="session",
+    )
+    completions = BatchCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    count = await process_transcripts(cfg=cfg, client=client, ledger=LedgerStore(str(ledger_path)))
+
+    assert count == 4
+    # One batch for session 1, a fallback call for the segment the model
+    # skipped, and a plain call for the single-segment session 2.
+    assert len(completions.calls) == 3
+    records = [json.loads(line) for line in open(ledger_path, encoding="utf-8")]
+    assert [r["input"] for r in records] == ["a", "b", "c", "d"]
+    assert [r["session_id"] for r in records] == [1, 1, 1, 2]
+    assert json.loads(records[0]["gpt_output"]) == {"notes": ["n1"]}
+    assert json.loads(records[2]["gpt_output"]) == {"notes": ["single"]}
+
+
+class DownCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        raise RuntimeError("upstream down")
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_request_is_not_retried_per_segment() -> None:
+    from src.gpt_postproc.processor import extract_batch
+
+    cfg = GPTConfig(api_key="test-key", model="mock", max_retries=1, retry_base_sec=0.0)
+    completions = DownCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    batch = [({"text": t, "start": 0.0}, 1, 0.0) for t in "abcd"]
+
+    records = await extract_batch(client, cfg, batch)
+
+    assert completions.calls == 1
+    assert [r["input"] for r in records] == ["a", "b", "c", "d"]
+    assert all(r["gpt_output"].startswith("[Error:") for r in records)
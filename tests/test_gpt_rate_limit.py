@@ -0,0 +1,136 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.gpt_postproc.config import GPTConfig
+from src.gpt_postproc.processor import extract_records
+from src.gpt_postproc.rate_limit import RateLimiter, TokenBucket, call_with_retry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_reports_refill_delay() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+    bucket.consume(60)
+    assert bucket.delay_for(1) == pytest.approx(1.0)
+    clock.now += 0.5
+    assert bucket.delay_for(1) == pytest.approx(0.5)
+    assert TokenBucket(0).delay_for(10**9) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_requests_per_minute() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_min=2, tokens_per_min=0, clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        await limiter.acquire(100)
+    # Two requests fit the burst; each further request waits 30s for a refill.
+    assert clock.now == pytest.approx(60.0)
+
+
+class RateLimited(Exception):
+    status_code = 429
+    response = SimpleNamespace(headers={"retry-after": "2"})
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_retries_429_then_succeeds() -> None:
+    clock = FakeClock()
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RateLimited("slow down")
+        return "ok"
+
+    result = await call_with_retry(flaky, max_retries=5, base_delay=1, max_delay=30, sleep=clock.sleep)
+    assert result == "ok"
+    assert len(calls) == 3
+    assert clock.now == pytest.approx(4.0)
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_does_not_retry_client_errors() -> None:
+    class BadRequest(Exception):
+        status_code = 400
+
+    async def broken():
+        raise BadRequest("nope")
+
+    with pytest.raises(BadRequest):
+        await call_with_retry(broken, max_retries=5, base_delay=0, max_delay=0)
+
+
+class SlowFirstCompletions:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, *, messages, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        text = messages[0]["content"]
+        await asyncio.sleep(0.05 if text.endswith("first") else 0.0)
+        self.active -= 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"notes": []})))],
+            usage=SimpleNamespace(total_tokens=10),
+        )
+
+
+@pytest.mark.asyncio
+async def test_extract_records_runs_concurrently_and_commits_in_order() -> None:
+    completions = SlowFirstCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    cfg = GPTConfig(api_key="test-key", model="mock", max_concurrency=3)
+    items = [({"text": name}, 1, 0.0) for name in ("first", "second", "third")]
+    committed = []
+
+    stats = await extract_records(client, cfg, items, committed.append)
+
+    assert [record["input"] for record in committed] == ["first", "second", "third"]
+    assert completions.peak == 3
+    assert stats.records == 3
+    assert stats.tokens == 30
+    assert stats.errors == 0
+
+
+class FlakyCompletions:
+    def __init__(self, failures):
+        self.failures = failures
+
+    async def create(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RateLimited("slow down")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"notes": []})))],
+            usage=SimpleNamespace(total_tokens=40),
+        )
+
+
+@pytest.mark.asyncio
+async def test_retried_attempts_do_not_leak_token_reservations(monkeypatch) -> None:
+    clock = FakeClock()
+    monkeypatch.setattr("src.gpt_postproc.rate_limit.random.uniform", lambda a, b: 0.0)
+    limiter = RateLimiter(requests_per_min=0, tokens_per_min=10_000, clock=clock, sleep=clock.sleep)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FlakyCompletions(failures=3)))
+    cfg = GPTConfig(api_key="test-key", model="mock", max_retries=5, retry_max_sec=0)
+
+    await extract_records(client, cfg, [({"text": "hello"}, 1, 0.0)], lambda record: None, limiter=limiter)
+
+    # Only the successful attempt's real usage is charged.
+    assert limiter.tokens.tokens == pytest.approx(10_000 - 40)
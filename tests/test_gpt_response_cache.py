@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.gpt_postproc.config import GPTConfig
+from src.gpt_postproc.daily_summary import summarize_day
+from src.gpt_postproc.processor import extract_records
+from src.gpt_postproc.response_cache import ReplayCacheMiss, ResponseCache, prompt_key
+
+
+class CountingCompletions:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(total_tokens=12),
+        )
+
+
+def _client(content):
+    return SimpleNamespace(chat=SimpleNamespace(completions=CountingCompletions(content)))
+
+
+def test_response_cache_ttl_and_size_eviction(tmp_path, monkeypatch) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_sec=10, max_entries=2)
+    now = [1000.0]
+    monkeypatch.setattr("src.gpt_postproc.response_cache.time.time", lambda: now[0])
+
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+        now[0] += 1
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+
+    now[0] += 11
+    assert cache.get("c") is None
+
+
+def test_prompt_key_covers_model_temperature_and_options() -> None:
+    base = prompt_key("gpt-4o-mini", 0.2, "hi")
+    assert base == prompt_key("gpt-4o-mini", 0.2, "hi")
+    assert base != prompt_key("gpt-4o-mini", 0.3, "hi")
+    assert base != prompt_key("gpt-4o", 0.2, "hi")
+    assert base != prompt_key("gpt-4o-mini", 0.2, "hi", response_format={"type": "json_object"})
+
+
+@pytest.mark.asyncio
+async def test_processor_reuses_cached_responses_and_replays_offline(tmp_path) -> None:
+    cache_path = str(tmp_path / "gpt_cache.sqlite3")
+    cfg = GPTConfig(api_key="k", model="mock", cache_mode="readwrite", cache_path=cache_path)
+    items = [({"text": "Koupil jsem kávu."}, 1, 0.0)]
+    client = _client(json.dumps({"notes": ["x"]}))
+
+    first = await extract_records(client, cfg, items, lambda record: None)
+    second = await extract_records(client, cfg, items, lambda record: None)
+    assert client.chat.completions.calls == 1
+    assert (first.cache_hits, second.cache_hits) == (0, 1)
+
+    replay = cfg.model_copy(update={"cache_mode": "replay"})
+    offline = _client("should not be used")
+    committed = []
+    await extract_records(offline, replay, items, committed.append)
+    assert offline.chat.completions.calls == 0
+    assert json.loads(committed[0]["gpt_output"]) == {"notes": ["x"]}
+
+
+@pytest.mark.asyncio
+async def test_summarize_day_uses_cache_and_replay_miss_raises(tmp_path) -> None:
+    cache_path = str(tmp_path / "gpt_cache.sqlite3")
+    cfg = GPTConfig(api_key="k", model="mock", cache_mode="readwrite", cache_path=cache_path)
+    entries = [{"session_id": 1, "input": "Přidej úkol.", "start": 1731300000.0}]
+    client = _client("[]---Souhrn")
+
+    await summarize_day("2024-11-11", entries, cfg=cfg, client=client, output_dir=tmp_path)
+    await summarize_day("2024-11-11", entries, cfg=cfg, client=client, output_dir=tmp_path)
+    assert client.chat.completions.calls == 1
+
+    replay = cfg.model_copy(update={"cache_mode": "replay"})
+    with pytest.raises(ReplayCacheMiss):
+        await summarize_day("2024-11-12", [{"input": "jiný den"}], cfg=replay, client=client, output_dir=tmp_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_mode", ["off", "session"])
+async def test_processor_replay_miss_aborts_instead_of_recording(tmp_path, batch_mode) -> None:
+    cfg = GPTConfig(
+        api_key="k",
+        model="mock",
+        cache_mode="replay",
+        cache_path=str(tmp_path / "gpt_cache.sqlite3"),
+        batch_mode=batch_mode,
+    )
+    items = [({"text": "Koupil jsem kávu."}, 1, 0.0), ({"text": "Zavolej mámě."}, 1, 1.0)]
+    client = _client("should not be used")
+    committed = []
+
+    with pytest.raises(ReplayCacheMiss):
+        await extract_records(client, cfg, items, committed.append)
+    assert committed == []
+    assert client.chat.completions.calls == 0
+
+
+def test_response_cache_evicts_in_batches(tmp_path, monkeypatch) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=20)
+    now = [1000.0]
+    monkeypatch.setattr("src.gpt_postproc.response_cache.time.time", lambda: now[0])
+    evictions = []
+    original = cache._evict_locked
+    monkeypatch.setattr(cache, "_evict_locked", lambda: evictions.append(1) or original())
+
+    for i in range(22):
+        cache.put(f"k{i}", str(i))
+        now[0] += 1
+    assert len(cache) == 22 and not evictions  # within the 10% slack
+
+    cache.put("k22", "22")
+    assert len(evictions) == 1
+    assert len(cache) == 20
+    assert cache.get("k2") is None and cache.get("k3") == "3"
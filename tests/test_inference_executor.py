@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.api.services.inference import InferenceExecutor, InferenceSaturatedError
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_saturated_and_keeps_loop_free() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=1, retry_after=3, name="test")
+    release = threading.Event()
+
+    def _blocking(value: int) -> int:
+        release.wait(timeout=5)
+        return value
+
+    running = asyncio.ensure_future(executor.run(_blocking, 1))
+    queued = asyncio.ensure_future(executor.run(_blocking, 2))
+    await asyncio.sleep(0.05)  # the loop stays responsive while the worker blocks
+
+    assert executor.in_flight == 1
+    assert executor.queue_depth == 1
+    with pytest.raises(InferenceSaturatedError) as err:
+        await executor.run(_blocking, 3)
+    assert err.value.retry_after == 3
+
+    release.set()
+    assert await running == 1
+    assert await queued == 2
+    assert executor.queue_depth == 0 and executor.in_flight == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_its_slot_until_the_job_ends() -> None:
+    executor = InferenceExecutor(workers=1, max_queue=0, name="test-cancel")
+    release = threading.Event()
+
+    waiter = asyncio.ensure_future(executor.run(release.wait, 5))
+    await asyncio.sleep(0.05)
+    waiter.cancel()  # e.g. the client disconnected
+    await asyncio.sleep(0.01)
+
+    assert executor.in_flight == 1
+    with pytest.raises(InferenceSaturatedError):
+        await executor.run(lambda: None)
+
+    release.set()
+    for _ in range(100):
+        if executor.in_flight == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert await executor.run(lambda: 7) == 7
+    executor.shutdown()
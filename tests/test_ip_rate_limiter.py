@@ -0,0 +1,30 @@
+import pytest
+
+from src.api.deps.security import _IPRateLimiter
+from src.api.metrics import IP_LIMITER_BLOCKED, IP_LIMITER_EVICTIONS
+
+
+@pytest.mark.asyncio
+async def test_ip_limiter_blocks_over_limit_and_counts_it() -> None:
+    limiter = _IPRateLimiter(2)
+    blocked_before = IP_LIMITER_BLOCKED._value.get()
+
+    results = [await limiter.allow("10.0.0.1") for _ in range(3)]
+
+    assert results == [True, True, False]
+    assert await limiter.allow("10.0.0.2")
+    assert IP_LIMITER_BLOCKED._value.get() == blocked_before + 1
+
+
+@pytest.mark.asyncio
+async def test_ip_limiter_memory_is_bounded_by_lru_eviction() -> None:
+    limiter = _IPRateLimiter(1, max_entries=3)
+    evictions_before = IP_LIMITER_EVICTIONS._value.get()
+
+    assert await limiter.allow("hot")
+    for i in range(10):
+        await limiter.allow(f"10.0.1.{i}")
+        assert not await limiter.allow("hot")  # recently seen, so never evicted
+
+    assert len(limiter) == 3
+    assert IP_LIMITER_EVICTIONS._value.get() == evictions_before + 8
@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 
 from src.gpt_postproc.ledger_store import LedgerStore
 
@@ -14,3 +15,47 @@ def test_ledger_append(tmp_path) -> None:
 
     assert "input" in data and "gpt_output" in data
     assert "ts" in data
+
+
+def test_day_index_tracks_appends_and_external_writes(tmp_path) -> None:
+    path = tmp_path / "ledger.jsonl"
+    day_one = datetime(2024, 11, 1, 12).timestamp()
+    day_two = datetime(2024, 11, 2, 12).timestamp()
+    store = LedgerStore(str(path))
+    store.append({"input": "a", "start": day_one})
+    store.append({"input": "b", "start": day_two})
+    store.append({"input": "c", "start": day_one + 60})
+
+    assert store.days() == ["2024-11-01", "2024-11-02"]
+    assert [e["input"] for e in store.entries_for_day("2024-11-01")] == ["a", "c"]
+    store.close()
+    assert (tmp_path / "ledger.jsonl.days.json").exists()
+
+    # Lines written by another process are picked up from the file tail.
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"input": "d", "start": day_two + 60}) + "\n")
+    fresh = LedgerStore(str(path))
+    assert [e["input"] for e in fresh.entries_for_day("2024-11-02")] == ["b", "d"]
+
+    # A rewritten (shorter) ledger forces a full rebuild.
+    path.write_text(json.dumps({"input": "e", "start": day_two}) + "\n", encoding="utf-8")
+    assert [e["input"] for e in fresh.entries_for_day("2024-11-02")] == ["e"]
+    assert fresh.entries_for_day("2024-11-01") == []
+
+
+def test_day_index_saves_in_batches_and_recovers_unsaved_tail(tmp_path) -> None:
+    path = tmp_path / "ledger.jsonl"
+    sidecar = tmp_path / "ledger.jsonl.days.json"
+    day = datetime(2024, 11, 1, 12).timestamp()
+    store = LedgerStore(str(path))
+    store.index.save_every = 3
+
+    store.append({"input": "a", "start": day})
+    store.append({"input": "b", "start": day})
+    assert not sidecar.exists()
+    store.append({"input": "c", "start": day})
+    assert json.loads(sidecar.read_text())["size"] == path.stat().st_size
+
+    store.append({"input": "d", "start": day})  # never saved, as after a crash
+    fresh = LedgerStore(str(path))
+    assert [e["input"] for e in fresh.entries_for_day("2024-11-01")] == ["a", "b", "c", "d"]
@@ -33,3 +33,106 @@ def test_redis_publisher(monkeypatch) -> None:
     assert recorded_payload == payload
     assert maxlen == 10000
     assert approximate is True
+
+
+class _FakePipeline:
+    def __init__(self) -> None:
+        self.queued = []
+
+    def xadd(self, stream, payload, maxlen=None, approximate=None):
+        self.queued.append((stream, payload))
+        return self
+
+    async def execute(self):
+        return [f"{idx}-0" for idx, _ in enumerate(self.queued)]
+
+
+class _FakePipelineClient:
+    def __init__(self) -> None:
+        self.pipelines = []
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        pipe = _FakePipeline()
+        self.pipelines.append(pipe)
+        return pipe
+
+
+def test_redis_publisher_publish_many_uses_one_pipeline() -> None:
+    client = _FakePipelineClient()
+    publisher = RedisPublisher("redis://example:6379/0", "daymind:transcripts", client=client)
+    ids = asyncio.run(publisher.publish_many([{"text": "a"}, {"text": "b"}]))
+
+    assert ids == ["0-0", "1-0"]
+    assert len(client.pipelines) == 1
+    assert [payload["text"] for _, payload in client.pipelines[0].queued] == ["a", "b"]
+
+
+class _FlakyPublisher:
+    def __init__(self) -> None:
+        self.down = True
+        self.batches = []
+
+    async def publish_many(self, payloads):
+        from redis.exceptions import ConnectionError as RedisConnectionError
+
+        if self.down:
+            raise RedisConnectionError("redis down")
+        self.batches.append([p["text"] for p in payloads])
+        return ["1-0"] * len(payloads)
+
+
+def test_batching_publisher_spills_and_replays(tmp_path) -> None:
+    from src.stt_core.redis_io import BatchingRedisPublisher
+
+    spill = tmp_path / "spill.jsonl"
+    inner = _FlakyPublisher()
+
+    async def _scenario():
+        batcher = BatchingRedisPublisher(
+            inner, max_batch=2, max_delay=0.01, max_retries=1, spill_path=str(spill)
+        )
+        batcher.start()
+        for idx in range(3):
+            batcher.submit({"text": f"s{idx}"})  # never awaits Redis
+        await asyncio.sleep(0.05)
+        assert batcher.pending == 0
+        assert spill.exists()
+
+        inner.down = False
+        batcher.submit({"text": "s3"})
+        await batcher.close()
+
+    asyncio.run(_scenario())
+    flushed = [text for batch in inner.batches for text in batch]
+    assert sorted(flushed) == ["s0", "s1", "s2", "s3"]
+    assert not spill.exists()
+
+
+
+def test_batching_publisher_replays_leftover_replay_file(tmp_path) -> None:
+    from src.stt_core.redis_io import BatchingRedisPublisher
+
+    spill = tmp_path / "spill.jsonl"
+    # Left by a run that crashed mid-replay, plus a newer spill.
+    (tmp_path / "spill.jsonl.replay").write_text('{"text": "old"}\n', encoding="utf-8")
+    spill.write_text('{"text": "new"}\n', encoding="utf-8")
+    inner = _FlakyPublisher()
+    inner.down = False
+
+    async def _scenario():
+        batcher = BatchingRedisPublisher(inner, max_batch=10, max_delay=0.01, spill_path=str(spill))
+        batcher.start()
+        batcher.submit({"text": "live"})
+        await batcher.close()
+
+    asyncio.run(_scenario())
+    flushed = [text for batch in inner.batches for text in batch]
+    assert flushed == ["live", "old", "new"]
+    assert not spill.exists() and not (tmp_path / "spill.jsonl.replay").exists()
+
+def test_encode_fields_serializes_nested_and_null_values() -> None:
+    from src.stt_core.redis_io import encode_fields
+
+    encoded = encode_fields({"text": "a", "confidence": None, "segments": [{"start": 1}]})
+    assert encoded == {"text": "a", "confidence": "", "segments": '[{"start": 1}]'}
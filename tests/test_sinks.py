@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from src.stt_core.sinks import Sink, SinkPipeline
+
+
+def test_slow_sink_does_not_delay_fast_sink(tmp_path) -> None:
+    fast_seen = []
+    slow_seen = []
+    release = asyncio.Event()
+
+    async def _fast(payload):
+        fast_seen.append(payload["text"])
+
+    async def _slow(payload):
+        await release.wait()
+        slow_seen.append(payload["text"])
+
+    async def _scenario():
+        pipeline = SinkPipeline(
+            [
+                Sink("fast", _fast, maxsize=10),
+                Sink("slow", _slow, maxsize=2, overflow="spill", spill_dir=str(tmp_path)),
+            ]
+        )
+        pipeline.start()
+        for idx in range(5):
+            await pipeline.submit({"text": f"s{idx}"})
+        await asyncio.sleep(0.01)
+        assert fast_seen == [f"s{idx}" for idx in range(5)]
+        release.set()
+        await pipeline.close()
+
+    asyncio.run(_scenario())
+    spilled = [json.loads(line)["text"] for line in (tmp_path / "slow.jsonl").read_text().splitlines()]
+    assert len(slow_seen) + len(spilled) == 5
+    assert spilled and spilled[-1] == "s4"
+
+
+def test_sync_sink_runs_off_loop_and_drop_oldest() -> None:
+    seen = []
+
+    async def _scenario():
+        sink = Sink("buffer", lambda payload: seen.append(payload["text"]), maxsize=1, overflow="drop_oldest")
+        for idx in range(3):  # worker not started yet, so the queue overflows
+            await sink.put({"text": f"s{idx}"}, 0.0)
+        sink.start()
+        await sink.close()
+
+    asyncio.run(_scenario())
+    assert seen == ["s2"]
+
+
+def test_spilled_segments_are_replayed_on_next_start(tmp_path) -> None:
+    seen = []
+
+    async def _handler(payload):
+        seen.append(payload["text"])
+
+    async def _scenario():
+        crashed = Sink("slow", _handler, maxsize=1, overflow="spill", spill_dir=str(tmp_path))
+        for idx in range(3):  # never started: s0 stays queued, s1 and s2 spill
+            await crashed.put({"text": f"s{idx}"}, 0.0)
+
+        restarted = Sink("slow", _handler, maxsize=1, overflow="spill", spill_dir=str(tmp_path))
+        restarted.start()
+        await restarted.put({"text": "s3"}, 0.0)
+        await restarted.close()
+
+    asyncio.run(_scenario())
+    assert seen == ["s1", "s2", "s3"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_failed_segments_are_spilled_and_retried(tmp_path) -> None:
+    from src.stt_core.metrics import SINK_OVERFLOW
+
+    seen = []
+    failing = {"s1"}
+
+    def _handler(payload):
+        if payload["text"] in failing:
+            raise OSError("disk full")
+        seen.append(payload["text"])
+
+    errors = SINK_OVERFLOW.labels(sink="buffer", policy="error")
+    before = errors._value.get()
+
+    async def _scenario():
+        sink = Sink("buffer", _handler, spill_dir=str(tmp_path))
+        sink.start()
+        for idx in range(3):
+            await sink.put({"text": f"s{idx}"}, 0.0)
+        await sink.close()
+        assert (tmp_path / "buffer.jsonl").exists()
+
+        failing.clear()
+        restarted = Sink("buffer", _handler, spill_dir=str(tmp_path))
+        restarted.start()
+        await restarted.close()
+
+    asyncio.run(_scenario())
+    assert seen == ["s0", "s2", "s1"]
+    assert errors._value.get() == before + 1
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,138 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ResponseError
+
+from src.gpt_postproc.config import GPTConfig
+from src.gpt_postproc.ledger_store import LedgerStore
+from src.gpt_postproc.stream_worker import run_stream_worker
+
+
+class DummyCompletions:
+    async def create(self, **kwargs):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"notes": []})))]
+        )
+
+
+class DummyClient:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=DummyCompletions())
+
+
+class FakeStreamRedis:
+    """Minimal consumer-group semantics: new entries, per-consumer pending, acks."""
+
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.delivered = 0
+        self.pending = {}
+        self.acked = []
+        self.groups = set()
+
+    async def xgroup_create(self, stream, group, id="$", mkstream=False):
+        if group in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups.add(group)
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        stream, cursor = next(iter(streams.items()))
+        if cursor == "0":
+            batch = [e for e in self.entries if self.pending.get(e[0]) == consumer][:count]
+        else:
+            batch = self.entries[self.delivered : self.delivered + count]
+            self.delivered += len(batch)
+            for entry_id, _ in batch:
+                self.pending[entry_id] = consumer
+        return [[stream, batch]] if batch else []
+
+    async def xautoclaim(self, *args, **kwargs):
+        return ["0-0", [], []]
+
+    async def xack(self, stream, group, *ids):
+        for entry_id in ids:
+            self.pending.pop(entry_id, None)
+            self.acked.append(entry_id)
+        return len(ids)
+
+
+def _cfg(tmp_path, **overrides):
+    return GPTConfig(
+        api_key="test-key",
+        model="mock",
+        ledger_path=str(tmp_path / "ledger.jsonl"),
+        consumer_name="worker-a",
+        stream_batch_size=2,
+        stream_block_ms=1,
+        **overrides,
+    )
+
+
+def _entry(idx, start):
+    return (
+        f"{idx}-0",
+        {"text": f"segment {idx}", "start": str(start), "end": str(start + 1), "lang": "en", "confidence": ""},
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_worker_processes_and_acks_batches(tmp_path) -> None:
+    redis = FakeStreamRedis([_entry(1, 0.0), _entry(2, 2.0), _entry(3, 100.0)])
+    cfg = _cfg(tmp_path)
+
+    count = await run_stream_worker(cfg=cfg, client=DummyClient(), redis=redis, max_polls=4)
+
+    assert count == 3
+    assert redis.acked == ["1-0", "2-0", "3-0"]
+    assert redis.pending == {}
+    records = [json.loads(line) for line in open(cfg.ledger_path, encoding="utf-8")]
+    assert [r["stream_id"] for r in records] == ["1-0", "2-0", "3-0"]
+    assert [r["session_id"] for r in records] == [1, 1, 2]
+    assert records[0]["start"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_stream_worker_replays_own_pending_entries_first(tmp_path) -> None:
+    redis = FakeStreamRedis([_entry(1, 0.0), _entry(2, 2.0)])
+    redis.groups.add("daymind:gpt")
+    # Simulate a crash after delivery but before the ack.
+    redis.pending["1-0"] = "worker-a"
+    redis.delivered = 1
+    cfg = _cfg(tmp_path, consumer_group="daymind:gpt")
+    ledger = LedgerStore(cfg.ledger_path)
+
+    count = await run_stream_worker(cfg=cfg, client=DummyClient(), redis=redis, ledger=ledger, max_polls=3)
+
+    assert count == 2
+    assert redis.acked == ["1-0", "2-0"]
+
+
+class BusyStreamRedis(FakeStreamRedis):
+    """A stream that always has new traffic, plus one entry stuck on a dead consumer."""
+
+    def __init__(self, entries, stale):
+        super().__init__(entries)
+        self.stale = stale
+        self.pending[stale[0]] = "worker-dead"
+        self.claims = 0
+
+    async def xautoclaim(self, stream, group, consumer, min_idle_time, start_id, count):
+        self.claims += 1
+        if self.pending.get(self.stale[0]) == "worker-dead":
+            self.pending[self.stale[0]] = consumer
+            return ["0-0", [self.stale], []]
+        return ["0-0", [], []]
+
+
+@pytest.mark.asyncio
+async def test_stream_worker_claims_stale_entries_while_busy(tmp_path) -> None:
+    redis = BusyStreamRedis([_entry(i, float(i)) for i in range(2, 12)], _entry(1, 0.0))
+    cfg = _cfg(tmp_path, stream_claim_interval_sec=0)
+
+    await run_stream_worker(cfg=cfg, client=DummyClient(), redis=redis, max_polls=4)
+
+    assert redis.claims >= 1
+    assert "1-0" in redis.acked
+    assert redis.delivered > 0
+
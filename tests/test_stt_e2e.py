@@ -35,6 +35,10 @@ async def test_full_pipeline(monkeypatch, tmp_path):
             self.data.append(payload)
             return "ok"
 
+        async def publish_many(self, payloads):
+            self.data.extend(payloads)
+            return ["ok"] * len(payloads)
+
     dummy_pub = DummyPublisher()
 
     cfg = STTConfig(
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from src.api.services.summary_jobs import SummaryJobs
+
+
+class FakeLockRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_generation() -> None:
+    jobs = SummaryJobs()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def caller():
+        jobs.start("2024-11-01", generate)
+        await jobs.wait("2024-11-01")
+
+    await asyncio.gather(*(caller() for _ in range(5)))
+    assert len(calls) == 1
+    assert jobs.status("2024-11-01")["status"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_reported_to_waiters_and_status() -> None:
+    jobs = SummaryJobs()
+
+    async def broken():
+        raise RuntimeError("openai down")
+
+    jobs.start("2024-11-01", broken)
+    with pytest.raises(RuntimeError):
+        await jobs.wait("2024-11-01")
+    await asyncio.sleep(0)
+    assert jobs.status("2024-11-01") == {"status": "failed", "detail": "openai down"}
+
+
+@pytest.mark.asyncio
+async def test_redis_lock_makes_other_workers_wait() -> None:
+    redis = FakeLockRedis()
+    worker_a = SummaryJobs(redis, poll_interval=0.001)
+    worker_b = SummaryJobs(redis, poll_interval=0.001)
+    calls = []
+    release = asyncio.Event()
+
+    async def generate():
+        calls.append(1)
+        await release.wait()
+
+    worker_a.start("2024-11-01", generate)
+    await asyncio.sleep(0)
+    worker_b.start("2024-11-01", generate)
+    waiting = asyncio.ensure_future(worker_b.wait("2024-11-01"))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+
+    release.set()
+    await worker_a.wait("2024-11-01")
+    await asyncio.wait_for(waiting, 1)
+    assert len(calls) == 1
+    assert redis.values == {}
+
+
+class DownRedis:
+    async def set(self, *args, **kwargs):
+        from redis.exceptions import ConnectionError as RedisConnectionError
+
+        raise RedisConnectionError("redis down")
+
+    exists = eval = set
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_local_single_flight() -> None:
+    jobs = SummaryJobs(DownRedis())
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def caller():
+        jobs.start("2024-11-01", generate)
+        await jobs.wait("2024-11-01")
+
+    await asyncio.gather(*(caller() for _ in range(3)))
+    await asyncio.sleep(0)
+    assert len(calls) == 1
+    assert jobs.status("2024-11-01")["status"] == "done"
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -47,3 +48,121 @@ def test_parse_speech_segments_gracefully_handles_invalid(tmp_path):
     assert service._parse_speech_segments("not-json") == []
     assert service._parse_speech_segments("123") == []
     assert service._parse_speech_segments(json.dumps([1, 2, 3])) == []
+
+
+def test_read_frames_decodes_only_requested_range(tmp_path):
+    import numpy as np
+    import soundfile as sf
+
+    from src.api.services.transcript_service import _read_frames
+
+    sr = 8000
+    left = np.linspace(-0.5, 0.5, sr, dtype="float32")
+    stereo = np.stack([left, left], axis=1)
+    path = tmp_path / "stereo.flac"
+    sf.write(str(path), stereo, sr, format="FLAC")
+
+    chunk = _read_frames(path, 2000, 3000)
+    assert chunk.ndim == 1
+    assert len(chunk) == 1000
+    assert chunk[0] == pytest.approx(left[2000], abs=1e-3)
+
+
+class _FakeTranscriptions:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self.uploads = []
+
+    async def create(self, **kwargs):
+        import asyncio
+        from types import SimpleNamespace
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        name, body, mime = kwargs["file"]
+        self.uploads.append((name, body.read(4), mime))
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return SimpleNamespace(text="ok", segments=[], language="cs")
+
+
+@pytest.mark.asyncio
+async def test_openai_array_path_is_in_memory_and_bounded(tmp_path):
+    import asyncio
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    settings = APISettings(
+        api_keys=["x"],
+        api_key_store_path=str(tmp_path / "keys.json"),
+        transcript_path=str(tmp_path / "transcripts.jsonl"),
+        ledger_path=str(tmp_path / "ledger.jsonl"),
+        summary_dir=str(tmp_path),
+        data_dir=str(tmp_path),
+        redis_url=None,
+        whisper_use_openai=True,
+        whisper_mock_transcriber=True,
+        openai_transcribe_concurrency=2,
+    )
+    transcriptions = _FakeTranscriptions()
+    client = SimpleNamespace(audio=SimpleNamespace(transcriptions=transcriptions))
+    service = TranscriptService(settings, openai_client=client)
+
+    audio = np.zeros(1600, dtype="float32")
+    results = await asyncio.gather(*(service._transcribe_array(audio, 16000) for _ in range(5)))
+
+    assert [r[0] for r in results] == ["ok"] * 5
+    assert transcriptions.peak == 2
+    assert all(name == "chunk.flac" and head == b"fLaC" for name, head, _ in transcriptions.uploads)
+    assert not (tmp_path / "tmp_array.wav").exists()
+
+
+@pytest.mark.asyncio
+async def test_gather_or_cancel_stops_siblings_on_first_failure():
+    import asyncio
+
+    from src.api.services.transcript_service import _gather_or_cancel
+
+    finished = []
+
+    async def _slow(i):
+        await asyncio.sleep(0.2)
+        finished.append(i)
+        return i
+
+    async def _fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("whisper down")
+
+    with pytest.raises(RuntimeError):
+        await _gather_or_cancel([_slow(1), _fail(), _slow(2)])
+    await asyncio.sleep(0.3)
+    assert finished == []
+    assert await _gather_or_cancel([_slow(3), _slow(4)]) == [3, 4]
+
+
+def test_transcription_cache_bounds_records_and_disk(tmp_path):
+    from src.api.services.transcription_cache import TranscriptionCache
+
+    disk = tmp_path / "cache"
+    cache = TranscriptionCache(8, disk, max_records=2, max_disk_entries=3)
+    result = ("", 0.0, 1.0, "cs", None)
+    cache.put("aa01", result)
+    for idx in range(5):  # the same silent chunk under many sessions
+        cache.remember_record("aa01", f"upload:{idx}", {"text": "", "n": idx})
+    assert cache.persisted_record("aa01", "upload:4") == {"text": "", "n": 4}
+    assert cache.persisted_record("aa01", "upload:0") is None
+    stored = json.loads((disk / "aa" / "aa01.json").read_text(encoding="utf-8"))
+    assert list(stored["records"]) == ["upload:3", "upload:4"]
+
+    for key in ("bb01", "cc01", "dd01"):
+        cache.put(key, result)
+    assert sorted(p.stem for p in disk.glob("*/*.json")) == ["bb01", "cc01", "dd01"]
+
+    for age, key in enumerate(("dd01", "cc01", "bb01")):
+        os.utime(disk / key[:2] / f"{key}.json", (1_700_000_000 - age, 1_700_000_000 - age))
+    reopened = TranscriptionCache(8, disk, max_disk_entries=2)
+    assert sorted(p.stem for p in disk.glob("*/*.json")) == ["cc01", "dd01"]
+    assert reopened.get("dd01") == result
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.api.services import whisper_engine
+from src.api.settings import APISettings
+
+
+class _FakeModel:
+    built = []
+
+    def __init__(self, name, **kwargs):
+        self.kwargs = kwargs
+        self.calls = 0
+        _FakeModel.built.append(self)
+
+    def transcribe(self, *args, **kwargs):
+        self.calls += 1
+        segments = iter([SimpleNamespace(text=" ahoj ", start=0.0, end=1.0)])
+        return segments, SimpleNamespace(language="cs", language_probability=0.9)
+
+
+def test_preload_warms_every_replica(monkeypatch, tmp_path):
+    _FakeModel.built = []
+    monkeypatch.setattr(whisper_engine, "WhisperModel", _FakeModel)
+    settings = APISettings(
+        data_dir=str(tmp_path),
+        whisper_mock_transcriber=False,
+        whisper_preload=True,
+        whisper_replicas=2,
+        whisper_cpu_threads=3,
+        whisper_inference_workers=4,
+    )
+    engine = whisper_engine.WhisperEngine(settings)
+    assert engine.executor.workers == 2  # one worker per replica
+    assert engine.status == "warming"
+    assert not engine.ready
+
+    engine.warmup()
+
+    assert engine.ready and engine.status == "ok"
+    assert len(_FakeModel.built) == 2
+    assert all(model.calls == 1 for model in _FakeModel.built)
+    assert _FakeModel.built[0].kwargs["cpu_threads"] == 3
+
+    text, _, end, lang, _ = engine.transcribe_audio(np.zeros(160, dtype=np.float32), 16000)
+    assert (text, end, lang) == ("ahoj", 1.0, "cs")
+    assert len(_FakeModel.built) == 2  # no lazy reload after warmup
+    engine.close()